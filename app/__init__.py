@@ -0,0 +1,92 @@
+""" Application factory for CampusConnect """
+# __init__.py
+# create_app builds a configured app from the classes in config.py and
+# registers the blueprints. Anything a worker may never need (Google OAuth,
+# the Purdue.io client, SMTP) is imported and set up on first use instead.
+# Under a pre-fork server run warm_up in the master (e.g. gunicorn --preload
+# wsgi:app) so that first-use work is done once and shared by every worker.
+
+import gc
+import os
+from pathlib import Path
+
+from flask import Flask
+from flask_cors import CORS
+
+from app.query_profiler import QueryProfiler
+from app.sessions import ServerSideSessionInterface, load_secret_key, make_session_store
+
+CORS_ORIGINS = ['http://127.0.0.1:5000/', 'https://seocampusconnect.pythonanywhere.com/']
+
+query_profiler = QueryProfiler()
+
+
+def create_app(config_name=None, test_config=None):
+    """Build the app with the settings of config[config_name] (default: FLASK_CONFIG),
+    updated with the test_config mapping if given"""
+    from config import config  # reads the environment, so import it no earlier than needed
+    app = Flask(__name__, template_folder='templates', static_folder='static')
+    app.config.from_object(config[config_name or os.getenv('FLASK_CONFIG', 'default')])
+    if test_config:
+        app.config.update(test_config)
+    if not app.config['SECRET_KEY']:
+        app.config['SECRET_KEY'] = load_secret_key(Path(app.instance_path) / 'secret_key')
+    if not app.config['PURDUE_API_CACHE_DIR']:
+        app.config['PURDUE_API_CACHE_DIR'] = str(Path(app.instance_path) / 'purdue_api_cache')
+
+    CORS(app, origins=CORS_ORIGINS)
+
+    # Session data lives server-side so any worker can serve any request
+    if app.config['SESSION_BACKEND'] != 'cookie':
+        app.session_interface = ServerSideSessionInterface(make_session_store(
+            app.config['SESSION_BACKEND'], app.instance_path, app.config['SESSION_STORE_URL']
+        ))
+
+    from app.database import db
+    from app.database.sqlite import init_sqlite
+    init_sqlite(app, db)  # db.init_app with the SQLite engine profile
+    query_profiler.init_app(app)
+
+    from app.notifications.emails import init_email
+    init_email(app)
+
+    from app.auth.routes import auth_bp
+    from app.dashboard.routes import dashboard_bp
+    from app.messages.routes import messages_bp
+    from app.planner.routes import planner_bp
+    from app.rooms.routes import rooms_bp
+    for blueprint in (auth_bp, dashboard_bp, messages_bp, planner_bp, rooms_bp):
+        app.register_blueprint(blueprint)
+
+    from app.cli import register_commands
+    register_commands(app)
+    return app
+
+
+def warm_up(app):
+    """Do the first-use work of a worker up front, before forking workers.
+
+    Imports the OAuth client and mailer, compiles the templates, loads the
+    course catalog and the matching index, then closes every database
+    connection so no connection is shared with forked workers. gc.freeze()
+    keeps the loaded objects out of collections, so workers don't copy their
+    pages by touching them.
+    """
+    from app.auth.utils import google_client
+    from app.courses import course_catalog
+    from app.dashboard.matching import get_match_index
+    from app.database import db
+    from app.database.sqlite import dispose_engines
+    from app.notifications.emails import get_email_outbox
+
+    with app.app_context():
+        google_client()
+        get_email_outbox()
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+        if db.inspect(db.engine).has_table('simple_course'):
+            len(course_catalog)
+            get_match_index()
+        db.session.remove()
+    dispose_engines(app, db)
+    gc.freeze()
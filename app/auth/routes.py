@@ -1,7 +1,8 @@
 from flask import Blueprint, render_template, redirect, url_for, session, flash
-from authlib.integrations.flask_client import OAuth
-from app.database.user import User
-from app import db
+
+from app.auth.utils import forget_current_user, google_client
+from app.database import db
+from app.database.models import SimpleUser
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -13,11 +14,56 @@ def index():
 
 @auth_bp.route('/login')
 def login():
-    # OAuth login logic here
-    pass
+    redirect_uri = url_for('auth.callback', _external=True)
+    return google_client().authorize_redirect(redirect_uri)
+
+@auth_bp.route('/callback')
+def callback():
+    try:
+        token = google_client().authorize_access_token()
+        user_info = token.get('userinfo')
+
+        if user_info:
+            user = SimpleUser.query.filter_by(email=user_info['email']).first()
+
+            if not user:
+                user = SimpleUser(
+                    name=user_info['name'],
+                    email=user_info['email'],
+                    profile_picture=user_info.get('picture', ''),
+                    preferences='quiet',
+                    profile_completed=False
+                )
+                db.session.add(user)
+                db.session.commit()
+
+            if hasattr(session, 'regenerate'):
+                session.regenerate()  # new session id on login
+            session.permanent = True
+            forget_current_user()
+            session['user'] = {
+                'id': user.id,
+                'email': user.email,
+                'name': user.name,
+                'profile_picture': user.profile_picture
+            }
+
+            if not user.profile_completed:
+                return redirect(url_for('dashboard.setup_profile'))
+
+            return redirect(url_for('dashboard.dashboard'))
+        else:
+            flash('Failed to get user information from Google.', 'error')
+            return redirect(url_for('auth.index'))
+
+    except Exception as e:
+        print(f"OAuth Error: {e}")
+        flash('Authentication failed. Please try again.', 'error')
+        return redirect(url_for('auth.index'))
 
 @auth_bp.route('/logout')
 def logout():
     session.pop('user', None)
-    flash('You have been logged out.', 'info')
-    return redirect(url_for('auth.index'))
\ No newline at end of file
+    forget_current_user()
+    flash('You have been logged out. Boiler Up!', 'info')
+    return redirect(url_for('auth.index'))
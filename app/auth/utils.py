@@ -1,14 +1,72 @@
-<<<<<<< HEAD
-# This is where we define utility functions for authentication
-=======
+""" Helpers for authentication: login checks, the current user and Google OAuth """
+# utils.py
+
+import time
 from functools import wraps
-from flask import session, redirect, url_for
+from types import SimpleNamespace
+
+from flask import current_app, g, redirect, session, url_for
+
+from app.database import db
+from app.database.models import SimpleUser
+from app.sessions import ServerSideSessionInterface
+
+OAUTH_EXTENSION = 'authlib.integrations.flask_client'
+GOOGLE_METADATA_URL = 'https://accounts.google.com/.well-known/openid-configuration'
 
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if 'user' not in session:
-            return redirect(url_for('auth.login'))
+            return redirect(url_for('auth.index'))
         return f(*args, **kwargs)
     return decorated_function
->>>>>>> e86c179ae670f259e3f9485453cc6bd9771385c7
+
+def google_client():
+    """Google OAuth client, registered on first login.
+
+    authlib (and requests behind it) is imported here rather than at startup,
+    and the provider metadata is only fetched by the first authorize call.
+    """
+    oauth = current_app.extensions.get(OAUTH_EXTENSION)
+    if oauth is None:
+        from authlib.integrations.flask_client import OAuth
+        oauth = OAuth(current_app._get_current_object())
+        oauth.register(
+            name='google',
+            client_id=current_app.config['GOOGLE_CLIENT_ID'],
+            client_secret=current_app.config['GOOGLE_CLIENT_SECRET'],
+            server_metadata_url=GOOGLE_METADATA_URL,
+            client_kwargs={'scope': 'openid email profile'}
+        )
+    return oauth.google
+
+# Profile of the logged-in user. With a server-side session store it is kept
+# in the session, so most requests never load the SimpleUser row. It is
+# reloaded after PROFILE_CACHE_TTL seconds, so an edit made on another
+# device shows up everywhere soon after.
+USER_PROFILE_FIELDS = ('id', 'name', 'email', 'profile_picture', 'major', 'year', 'preferences',
+                       'preferred_location', 'gpa', 'bio', 'profile_completed')
+
+def get_current_user():
+    """Get the logged-in user's profile, or None"""
+    if 'user' not in session:
+        return None
+    if 'current_user' not in g:
+        caching = isinstance(current_app.session_interface, ServerSideSessionInterface)
+        profile = session.get('profile') if caching else None
+        expired = time.time() - session.get('profile_loaded_at', 0) > current_app.config['PROFILE_CACHE_TTL']
+        if profile is None or expired or profile['id'] != session['user']['id']:
+            user = db.session.get(SimpleUser, session['user']['id'])
+            profile = {field: getattr(user, field) for field in USER_PROFILE_FIELDS} if user else None
+            if caching and profile:
+                session['profile'] = profile
+                session['profile_loaded_at'] = time.time()
+        g.current_user = SimpleNamespace(**profile) if profile else None
+    return g.current_user
+
+def forget_current_user():
+    """Drop the cached profile after the user's row changed"""
+    session.pop('profile', None)
+    session.pop('profile_loaded_at', None)
+    g.pop('current_user', None)
@@ -0,0 +1,277 @@
+""" Database bootstrap: schema versions, migrations and seed data """
+# bootstrap.py
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+from app.course_ingest import ingest_courses
+from app.course_search import create_search_index
+from app.courses import course_catalog
+from app.dashboard.matching import rebuild_all_matches
+from app.database import db
+from app.database.models import AppMetadata, PurdueLocation, SimpleCourse, SimpleUser, StudyRoom
+from app.planner.hours import rebuild_study_hours
+from app.purdue import PURDUE_DINING_HALLS, PURDUE_MAJORS, PURDUE_STUDY_LOCATIONS
+from app.rooms.occupancy import rebuild_room_occupancy
+
+DEMO_USERS = 20
+DEMO_SEED = 2025
+
+def generate_users(count, seed=0, demo=False, **options):
+    """Insert a seeded synthetic population; see app/dummy_data/population.py"""
+    from app.dummy_data.population import generate_population
+    stats = generate_population(
+        db, count, seed=seed,
+        majors=PURDUE_MAJORS,
+        rooms=db.session.query(StudyRoom.location_name, StudyRoom.room_number).order_by(StudyRoom.id).all(),
+        locations=[name for (name,) in db.session.query(PurdueLocation.name)],
+        demo=demo,
+        **options
+    )
+    rebuild_room_occupancy()
+    rebuild_study_hours()
+    return stats
+
+def create_demo_users():
+    """Create demo users"""
+    if SimpleUser.query.filter_by(is_demo_user=True).count() >= DEMO_USERS:
+        return
+    # Demo profiles and enrollments only: fake bookings would block real rooms
+    generate_users(DEMO_USERS, seed=DEMO_SEED, demo=True, now=datetime.utcnow(),
+                   messages_per_user=0, bookings_per_user=0, plans_per_user=0)
+
+# Schema and seed versioning
+# Bump SCHEMA_VERSION and add an entry to SCHEMA_MIGRATIONS when an existing
+# table changes; new tables are picked up by create_all. Bump SEED_VERSION when
+# the seed logic changes; edits to the seed data itself are detected by hash.
+SCHEMA_VERSION = 11
+SEED_VERSION = 5
+
+def add_column_if_missing(table, column, ddl):
+    """Migration step that adds a column unless it is already there"""
+    def step():
+        # Inspected through the migration's own connection: on a tuned file
+        # database it holds the only writer connection
+        if column not in {c['name'] for c in db.inspect(db.session.connection()).get_columns(table)}:
+            db.session.execute(db.text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    return step
+
+SCHEMA_MIGRATIONS = {
+    # version: [SQL statements or callables to upgrade from version - 1]
+    2: ['CREATE INDEX IF NOT EXISTS ix_room_booking_room_day '
+        'ON room_booking (location_name, room_number, booking_date, status)'],
+    3: ['CREATE INDEX IF NOT EXISTS ix_message_recipient_timestamp ON message (recipient_id, timestamp)',
+        'CREATE INDEX IF NOT EXISTS ix_message_sender_timestamp ON message (sender_id, timestamp)'],
+    # Conversations, read watermarks and unread counters backfilled from message.is_read
+    4: [add_column_if_missing('message', 'conversation_id', 'INTEGER'),
+        'CREATE INDEX IF NOT EXISTS ix_message_conversation ON message (conversation_id, id)',
+        'INSERT INTO conversation (user_low_id, user_high_id, last_message_id, last_message_at) '
+        'SELECT MIN(sender_id, recipient_id), MAX(sender_id, recipient_id), MAX(id), MAX(timestamp) '
+        'FROM message GROUP BY MIN(sender_id, recipient_id), MAX(sender_id, recipient_id)',
+        'UPDATE message SET conversation_id = (SELECT c.id FROM conversation c '
+        'WHERE c.user_low_id = MIN(message.sender_id, message.recipient_id) '
+        'AND c.user_high_id = MAX(message.sender_id, message.recipient_id))',
+        'INSERT INTO conversation_participant (conversation_id, user_id, last_read_message_id, unread_count) '
+        'SELECT p.conversation_id, p.user_id, '
+        'COALESCE((SELECT MIN(m.id) - 1 FROM message m WHERE m.conversation_id = p.conversation_id '
+        'AND m.recipient_id = p.user_id AND m.is_read = 0), p.last_message_id), '
+        '(SELECT COUNT(*) FROM message m WHERE m.conversation_id = p.conversation_id '
+        'AND m.recipient_id = p.user_id AND m.is_read = 0) '
+        'FROM (SELECT id AS conversation_id, user_low_id AS user_id, last_message_id FROM conversation '
+        'UNION SELECT id, user_high_id, last_message_id FROM conversation) p',
+        'INSERT INTO user_unread_count (user_id, unread_count) '
+        'SELECT user_id, SUM(unread_count) FROM conversation_participant GROUP BY user_id'],
+    # 5: materialized study matches, filled by init_db once every migration has run
+    # Full-text course search
+    6: [lambda: create_search_index(db)],
+    # Indexes for every route's lookups; duplicate enrollments are dropped
+    # before (user_id, course_id) becomes unique
+    7: ['DELETE FROM user_course_enrollment WHERE id NOT IN '
+        '(SELECT MIN(id) FROM user_course_enrollment GROUP BY user_id, course_id)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_user_course_enrollment ON user_course_enrollment (user_id, course_id)',
+        'CREATE INDEX IF NOT EXISTS ix_simple_user_major ON simple_user (major)',
+        'CREATE INDEX IF NOT EXISTS ix_conversation_participant_user_unread '
+        'ON conversation_participant (user_id, unread_count)',
+        'CREATE INDEX IF NOT EXISTS ix_study_plan_user_exam_date ON study_plan (user_id, exam_date)',
+        'CREATE INDEX IF NOT EXISTS ix_room_booking_day_status ON room_booking (booking_date, status)',
+        'CREATE INDEX IF NOT EXISTS ix_room_booking_user_day ON room_booking (user_id, booking_date, start_time)',
+        'CREATE INDEX IF NOT EXISTS ix_purdue_location_type ON purdue_location (location_type)'],
+    # Study hours move to an append-only log; each plan's hours so far become its first entry
+    8: ['INSERT INTO study_hours_log (plan_id, user_id, course_id, hours, logged_at) '
+        'SELECT id, user_id, course_id, hours_completed, COALESCE(created_at, CURRENT_TIMESTAMP) '
+        'FROM study_plan WHERE hours_completed > 0',
+        lambda: rebuild_study_hours()],
+    # Classmates of a course, for refreshing matches after a profile change
+    9: ['CREATE INDEX IF NOT EXISTS ix_user_course_enrollment_course ON user_course_enrollment (course_id, user_id)'],
+    # Profile versions, so every worker's match index can catch up on edits made elsewhere
+    10: [add_column_if_missing('simple_user', 'profile_version', 'INTEGER NOT NULL DEFAULT 0'),
+         'CREATE INDEX IF NOT EXISTS ix_simple_user_profile_version ON simple_user (profile_version)'],
+    # Stored sessions of a date range, taken into account by the live schedule
+    11: ['CREATE INDEX IF NOT EXISTS ix_scheduled_study_session_day ON scheduled_study_session (day)'],
+}
+COURSES_FILE = Path(__file__).resolve().parent.parent / 'purdue_courses.json'
+
+def get_app_metadata(key):
+    row = db.session.get(AppMetadata, key)
+    return row.value if row else None
+
+def set_app_metadata(key, value):
+    row = db.session.get(AppMetadata, key)
+    if row:
+        row.value = value
+        row.updated_at = datetime.utcnow()
+    else:
+        db.session.add(AppMetadata(key=key, value=value))
+
+def seed_fingerprint():
+    """Hash of everything the seed step reads, so unchanged data can be skipped"""
+    digest = hashlib.sha256()
+    digest.update(str(SEED_VERSION).encode())
+    digest.update(json.dumps([PURDUE_DINING_HALLS, PURDUE_STUDY_LOCATIONS, PURDUE_MAJORS]).encode())
+    if COURSES_FILE.exists():
+        with COURSES_FILE.open('rb') as courses:
+            for block in iter(lambda: courses.read(1 << 16), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def migrate_schema():
+    """Create missing tables and apply pending migrations"""
+    existing_tables = db.inspect(db.engine).get_table_names()
+    db.create_all()
+    current = int(get_app_metadata('schema_version') or 0)
+    if current >= SCHEMA_VERSION:
+        return False
+    
+    if not existing_tables:
+        # Fresh database: create_all already built the latest schema
+        print(f"Created schema version {SCHEMA_VERSION}")
+    else:
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            for step in SCHEMA_MIGRATIONS.get(version, []):
+                if callable(step):
+                    step()
+                else:
+                    db.session.execute(db.text(step))
+            print(f"Applied schema migration {version}")
+    set_app_metadata('schema_version', str(SCHEMA_VERSION))
+    db.session.commit()
+    return True
+
+ROOM_CAPACITIES = [4, 6, 8, 12]  # cycled over the rooms of each library
+
+def seed_locations():
+    """Add any Purdue locations, and the group study rooms of the libraries, that are not in the database yet"""
+    existing = {name for (name,) in db.session.query(PurdueLocation.name).all()}
+    
+    for dining in PURDUE_DINING_HALLS:
+        if dining["name"] in existing:
+            continue
+        location = PurdueLocation(
+            name=dining["name"],
+            location_type="dining",
+            building=dining["building"],
+            hours="7:00 AM - 10:00 PM",
+            amenities="Dining, WiFi, Study Space"
+        )
+        db.session.add(location)
+    
+    for study in PURDUE_STUDY_LOCATIONS:
+        if study["name"] in existing:
+            continue
+        location = PurdueLocation(
+            name=study["name"],
+            location_type="library",
+            building=study["building"],
+            capacity=study["capacity"],
+            amenities="WiFi, Study Space, Group Rooms"
+        )
+        db.session.add(location)
+    
+    # About one bookable room per 20 seats, at most 8 per library
+    existing_rooms = set(db.session.query(StudyRoom.location_name, StudyRoom.room_number).all())
+    for study in PURDUE_STUDY_LOCATIONS:
+        for i in range(1, min(study["capacity"] // 20, 8) + 1):
+            room_number = f'Room {i:03d}'
+            if (study["name"], room_number) not in existing_rooms:
+                db.session.add(StudyRoom(
+                    location_name=study["name"],
+                    room_number=room_number,
+                    capacity=ROOM_CAPACITIES[(i - 1) % len(ROOM_CAPACITIES)]
+                ))
+    
+    db.session.commit()
+
+def seed_courses():
+    """Add Purdue courses that are not in the database yet"""
+    # Add courses from Purdue API
+    if COURSES_FILE.exists():
+        print("Loading Purdue courses...")
+        with open(COURSES_FILE, 'r') as file:
+            stats = ingest_courses(db, SimpleCourse, file)
+        print(f"Course ingest: {stats}")
+    else:
+        print(f"{COURSES_FILE.name} not found, using fallback courses only")
+    
+    added_courses = {(subject, number) for subject, number in db.session.query(SimpleCourse.course_subject, SimpleCourse.course_number)}
+    
+    # Add fallback courses
+    fallback_courses = [
+        ("CS180", "Problem Solving And Object-Oriented Programming", "CS"),
+        ("CS240", "Programming in C", "CS"),
+        ("CS251", "Data Structures and Algorithms", "CS"),
+        ("MA161", "Plane Analytic Geometry And Calculus I", "MA"),
+        ("PHYS172", "Modern Mechanics", "PHYS"),
+        ("CHEM115", "General Chemistry", "CHEM"),
+        ("ENGL106", "First-Year Composition", "ENGL"),
+        ("ECON251", "Microeconomics", "ECON"),
+    ]
+    
+    for number, name, subject in fallback_courses:
+        if (subject, number) not in added_courses:
+            course = SimpleCourse(
+                course_number=number,
+                course_name=name,
+                course_subject=subject,
+                credits=3
+            )
+            db.session.add(course)
+            added_courses.add((subject, number))
+    
+    db.session.commit()
+
+def init_db(reset=False):
+    """Bootstrap the database once: migrate the schema and seed reference data.
+    
+    Safe to run repeatedly; work is skipped when the schema version and seed
+    fingerprint recorded in app_metadata are already current. reset=True drops
+    every table first (local development only). Needs an app context.
+    """
+    if reset:
+        db.drop_all()
+    
+    migrated = migrate_schema()
+    
+    fingerprint = seed_fingerprint()
+    if get_app_metadata('seed_fingerprint') == fingerprint:
+        if migrated:
+            # Matches are built from the latest schema, e.g. simple_user.profile_version of migration 10
+            rebuild_all_matches()
+        else:
+            print("Database is up to date, nothing to do.")
+        return False
+    
+    seed_locations()
+    seed_courses()
+    create_demo_users()
+    set_app_metadata('seed_fingerprint', fingerprint)
+    db.session.commit()
+    course_catalog.invalidate()
+    rebuild_all_matches()
+    rebuild_room_occupancy()
+    
+    print("Purdue database initialized!")
+    print(f"Created: {SimpleCourse.query.count()} courses, {PurdueLocation.query.count()} locations, {SimpleUser.query.filter_by(is_demo_user=True).count()} demo users")
+    print("Room booking system ready!")
+    return True
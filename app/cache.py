@@ -0,0 +1,45 @@
+""" Small in-process caches shared by every request in a worker """
+# cache.py
+
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def get_or_set(self, key, factory):
+        """Return the cached value, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,127 @@
+""" flask CLI commands: database bootstrap, catalog sync, load-test data and workers """
+# cli.py
+
+import json
+import os
+import time
+
+import click
+from flask.cli import with_appcontext
+
+from app.bootstrap import COURSES_FILE, generate_users, init_db
+from app.course_ingest import ingest_courses
+from app.courses import course_catalog
+from app.dashboard.matching import rebuild_all_matches
+from app.database import db
+from app.database.models import SimpleCourse
+from app.notifications.emails import get_email_worker
+from app.planner.hours import rebuild_study_hours
+from app.planner.scheduler import schedule_all_users
+from app.purdue import PurdueAPI
+from app.rooms.routes import invalidate_room_availability
+
+@click.command('init-db')
+@with_appcontext
+@click.option('--reset', is_flag=True, help='Drop all tables before bootstrapping (destroys data).')
+def init_db_command(reset):
+    """Create, migrate and seed the database."""
+    init_db(reset=reset)
+
+@click.command('ingest-courses')
+@with_appcontext
+@click.argument('path', type=click.Path(exists=True, dir_okay=False), required=False)
+def ingest_courses_command(path):
+    """Stream a Purdue.io course catalog (default: purdue_courses.json) into the database."""
+    with open(path or COURSES_FILE, 'r') as file:
+        stats = ingest_courses(db, SimpleCourse, file)
+    db.session.commit()
+    course_catalog.invalidate()
+    print(f"Course ingest: {stats}")
+
+@click.command('sync-courses')
+@with_appcontext
+def sync_courses_command():
+    """Refresh purdue_courses.json from Purdue.io and ingest any new courses."""
+    client = PurdueAPI.client()
+    courses = PurdueAPI.get_courses()
+    if courses is None:
+        raise click.ClickException('Could not fetch the course catalog')
+    print(f"Purdue.io: {client.stats}")
+    if client.stats['downloaded'] == 0 and COURSES_FILE.exists():
+        print("Course catalog unchanged")
+        return
+    
+    tmp_path = COURSES_FILE.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as file:
+        json.dump({'value': courses}, file)
+    os.replace(tmp_path, COURSES_FILE)
+    with open(COURSES_FILE, 'r') as file:
+        stats = ingest_courses(db, SimpleCourse, file)
+    db.session.commit()
+    course_catalog.invalidate()
+    print(f"Course ingest: {stats}")
+
+@click.command('generate-users')
+@with_appcontext
+@click.option('--users', default=10000, show_default=True, help='Number of users to create.')
+@click.option('--seed', default=0, show_default=True, help='Random seed; the same seed gives the same data.')
+@click.option('--messages', default=2.0, show_default=True, help='Messages per user.')
+@click.option('--bookings', default=0.3, show_default=True, help='Room bookings per user.')
+@click.option('--plans', default=0.5, show_default=True, help='Share of users with study plans.')
+@click.option('--skip-matches', is_flag=True, help='Do not rebuild study matches afterwards.')
+def generate_users_command(users, seed, messages, bookings, plans, skip_matches):
+    """Fill the database with a synthetic population for load testing."""
+    stats = generate_users(users, seed=seed, messages_per_user=messages,
+                           bookings_per_user=bookings, plans_per_user=plans)
+    print(f"Generated {stats}")
+    invalidate_room_availability()
+    if not skip_matches:
+        started = time.perf_counter()
+        rebuild_all_matches()
+        print(f"Rebuilt matches in {time.perf_counter() - started:.2f}s")
+
+@click.command('rebuild-matches')
+@with_appcontext
+def rebuild_matches_command():
+    """Recompute the stored study matches of every user."""
+    started = time.perf_counter()
+    count = rebuild_all_matches()
+    print(f"Rebuilt matches for {count} users in {time.perf_counter() - started:.2f}s")
+
+@click.command('rebuild-study-hours')
+@with_appcontext
+def rebuild_study_hours_command():
+    """Recompute the per-plan and per-course study hour rollups from the log."""
+    started = time.perf_counter()
+    count = rebuild_study_hours()
+    print(f"Rebuilt study hours of {count} plans in {time.perf_counter() - started:.2f}s")
+
+@click.command('schedule-study-plans')
+@with_appcontext
+@click.option('--workers', default=0, help='Worker processes; defaults to one per CPU.')
+def schedule_study_plans_command(workers):
+    """Recompute every student's suggested exam-prep sessions (run nightly)."""
+    started = time.perf_counter()
+    users, sessions = schedule_all_users(workers=workers or None)
+    print(f"Scheduled {sessions} sessions for {users} users in {time.perf_counter() - started:.2f}s")
+
+@click.command('mail-worker')
+@with_appcontext
+def mail_worker_command():
+    """Run the email outbox worker in the foreground."""
+    worker = get_email_worker()
+    worker.start()
+    print(f"Email worker running with {worker.threads} threads, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        worker.stop()
+
+COMMANDS = [init_db_command, ingest_courses_command, sync_courses_command, generate_users_command,
+            rebuild_matches_command, rebuild_study_hours_command, schedule_study_plans_command,
+            mail_worker_command]
+
+def register_commands(app):
+    for command in COMMANDS:
+        app.cli.add_command(command)
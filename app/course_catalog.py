@@ -0,0 +1,52 @@
+""" In-process copy of the course catalog keyed by course id """
+# course_catalog.py
+# The catalog is small and only changes on reseed, so every worker keeps
+# one read-only snapshot instead of querying SimpleCourse per enrollment.
+
+import threading
+import time
+from collections import namedtuple
+
+# Descriptions are left out: no cached consumer needs them, and with the full
+# catalog they would be most of every worker's copy
+CourseInfo = namedtuple('CourseInfo', 'id course_number course_name course_subject credits')
+
+
+class CourseCatalog:
+    """Lazily loaded, read-only course lookup table"""
+
+    def __init__(self, loader, ttl=600):
+        # loader() returns rows of (id, course_number, course_name, course_subject, credits)
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._by_id = None
+        self._loaded_at = 0
+
+    def _courses(self):
+        by_id = self._by_id
+        if by_id is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return by_id
+        with self._lock:
+            if self._by_id is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._by_id = {row[0]: CourseInfo(*row) for row in self.loader()}
+                self._loaded_at = time.monotonic()
+            return self._by_id
+
+    def get(self, course_id):
+        return self._courses().get(course_id)
+
+    def get_many(self, course_ids):
+        """Courses for the given ids in the same order, skipping unknown ids"""
+        courses = self._courses()
+        return [courses[course_id] for course_id in course_ids if course_id in courses]
+
+    def all(self):
+        return list(self._courses().values())
+
+    def __len__(self):
+        return len(self._courses())
+
+    def invalidate(self):
+        with self._lock:
+            self._by_id = None
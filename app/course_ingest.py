@@ -0,0 +1,170 @@
+""" Streaming ingest of the Purdue.io OData course catalog """
+# course_ingest.py
+# Reads the top-level "value" array of an OData response one object at a
+# time, so memory stays flat no matter how large purdue_courses.json is, and
+# writes new courses in executemany batches inside a single transaction.
+
+import json
+import time
+
+from sqlalchemy import insert
+
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 1000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Buffered reader that hands out complete JSON values from a text stream"""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer never holds more than
+        # the value being decoded plus one chunk
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of input"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in course catalog at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Probably cut off at the chunk boundary; read more and retry
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                if self._fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_odata_values(fp, chunk_size=CHUNK_SIZE):
+    """Yield each element of the top-level "value" array of an OData document"""
+    reader = _Reader(fp, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'value':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == ',':
+                        reader.pos += 1
+                        continue
+                    reader.expect(']')
+                    break
+        else:
+            reader.value()  # skip @odata.context and friends
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect('}')
+        return
+
+
+def course_row(course_data):
+    """Map one Purdue.io course to SimpleCourse columns, or None if unusable"""
+    if not isinstance(course_data, dict):
+        return None
+    course_number = course_data.get('Number', 'UNKNOWN')
+    if not course_number or course_number == 'UNKNOWN':
+        return None
+    subject_info = course_data.get('Subject', {})
+    subject_abbrev = subject_info.get('Abbreviation', 'UNK') if isinstance(subject_info, dict) else 'UNK'
+    try:
+        credits = int(course_data.get('CreditHours', 3) or 3)
+    except (TypeError, ValueError):
+        credits = 3
+    return {
+        'course_number': str(course_number)[:20],
+        'course_name': (course_data.get('Title') or 'Unknown Course')[:200],
+        'course_subject': subject_abbrev[:100],
+        'credits': credits,
+        'description': course_data['Description'][:500] if course_data.get('Description') else '',
+    }
+
+
+class IngestStats:
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.read} courses read, {self.inserted} inserted, {self.skipped} skipped "
+                f"in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+def ingest_courses(db, model, fp, batch_size=BATCH_SIZE, limit=None):
+    """Stream courses from fp into model, skipping (subject, number) pairs already present.
+
+    Everything is written in one transaction; the caller commits.
+    """
+    stats = IngestStats()
+    started = time.perf_counter()
+    seen = {(subject, number) for subject, number in db.session.query(model.course_subject, model.course_number)}
+
+    batch = []
+    for course_data in iter_odata_values(fp):
+        if limit is not None and stats.read >= limit:
+            break
+        stats.read += 1
+        row = course_row(course_data)
+        if row is None or (row['course_subject'], row['course_number']) in seen:
+            stats.skipped += 1
+            continue
+        seen.add((row['course_subject'], row['course_number']))
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(insert(model), batch)
+            stats.inserted += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(model), batch)
+        stats.inserted += len(batch)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
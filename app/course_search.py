@@ -0,0 +1,116 @@
+""" Typeahead course search backed by an SQLite FTS5 index """
+# course_search.py
+# course_search is an external-content FTS5 table over simple_course: it
+# stores only the inverted index and reads the text back from simple_course.
+# Triggers keep it in sync with every insert, update and delete, including
+# the executemany batches of the catalog ingest. Other databases fall back
+# to LIKE matching.
+
+import re
+
+from sqlalchemy import DDL, event, text
+
+FTS_TABLE = 'course_search'
+MAX_RESULTS = 50
+MIN_QUERY_LENGTH = 2  # one-letter prefixes match most of the catalog
+# bm25 weights for course_number, course_name, course_subject, description
+RANK_WEIGHTS = (10.0, 4.0, 8.0, 1.0)
+
+CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        course_number, course_name, course_subject, description,
+        content='simple_course', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS simple_course_search_insert AFTER INSERT ON simple_course BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, course_number, course_name, course_subject, description)
+        VALUES (new.id, new.course_number, new.course_name, new.course_subject, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS simple_course_search_delete AFTER DELETE ON simple_course BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, course_number, course_name, course_subject, description)
+        VALUES ('delete', old.id, old.course_number, old.course_name, old.course_subject, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS simple_course_search_update AFTER UPDATE ON simple_course BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, course_number, course_name, course_subject, description)
+        VALUES ('delete', old.id, old.course_number, old.course_name, old.course_subject, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, course_number, course_name, course_subject, description)
+        VALUES (new.id, new.course_number, new.course_name, new.course_subject, new.description);
+    END""",
+]
+DROP_STATEMENTS = [
+    'DROP TRIGGER IF EXISTS simple_course_search_insert',
+    'DROP TRIGGER IF EXISTS simple_course_search_delete',
+    'DROP TRIGGER IF EXISTS simple_course_search_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def register_search_index(course_table):
+    """Create and drop the FTS index together with course_table on SQLite"""
+    for statement in CREATE_STATEMENTS:
+        event.listen(course_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in DROP_STATEMENTS:
+        event.listen(course_table, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def uses_fts(db):
+    return db.engine.dialect.name == 'sqlite'
+
+
+def create_search_index(db):
+    """Create the index on an existing database and fill it from simple_course"""
+    if not uses_fts(db):
+        return
+    for statement in CREATE_STATEMENTS:
+        db.session.execute(text(statement))
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def search_terms(query):
+    """Words and numbers typed by the user; 'CS180' becomes ['cs', '180']"""
+    return re.findall(r'[^\W\d_]+|\d+', (query or '').lower())
+
+
+def match_expression(terms):
+    """FTS5 query matching every term as a prefix.
+
+    A word followed by a number also matches the two joined, since a course
+    number such as 'CS180' is indexed as the single token 'cs180'.
+    """
+    parts = []
+    i = 0
+    while i < len(terms):
+        term = terms[i]
+        if i + 1 < len(terms) and term.isalpha() and terms[i + 1].isdigit():
+            parts.append(f'("{term}"* "{terms[i + 1]}"* OR "{term}{terms[i + 1]}"*)')
+            i += 2
+        else:
+            parts.append(f'"{term}"*')
+            i += 1
+    return ' '.join(parts)
+
+
+def search_courses(db, model, query, limit=20):
+    """Courses matching every term of query as a prefix, best match first.
+
+    Returns rows of (id, course_number, course_name, course_subject, credits).
+    """
+    terms = search_terms(query)
+    if sum(len(term) for term in terms) < MIN_QUERY_LENGTH:
+        return []
+    limit = max(1, min(limit, MAX_RESULTS))
+
+    if uses_fts(db):
+        weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+        return db.session.execute(text(
+            f"SELECT c.id, c.course_number, c.course_name, c.course_subject, c.credits "
+            f"FROM {FTS_TABLE} JOIN simple_course c ON c.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}), c.course_subject, c.course_number LIMIT :limit"
+        ), {'match': match_expression(terms), 'limit': limit}).all()
+
+    columns = (model.course_number, model.course_name, model.course_subject)
+    filters = [db.or_(*(column.ilike(f'%{term}%') for column in columns)) for term in terms]
+    return db.session.query(
+        model.id, model.course_number, model.course_name, model.course_subject, model.credits
+    ).filter(*filters).order_by(model.course_subject, model.course_number).limit(limit).all()
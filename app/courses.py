@@ -0,0 +1,26 @@
+""" Course lookups shared by the profile, dashboard and planner pages """
+# courses.py
+
+from app.course_catalog import CourseCatalog
+from app.database import db
+from app.database.models import SimpleCourse, UserCourseEnrollment
+
+course_catalog = CourseCatalog(lambda: db.session.query(
+    SimpleCourse.id, SimpleCourse.course_number, SimpleCourse.course_name,
+    SimpleCourse.course_subject, SimpleCourse.credits
+).order_by(SimpleCourse.id).all())
+
+def get_course_details(course_id):
+    """A cached course as a dict, with its description read from the database"""
+    course = course_catalog.get(course_id)
+    if course is None:
+        return None
+    description = db.session.query(SimpleCourse.description).filter_by(id=course_id).scalar()
+    return dict(course._asdict(), description=description or '')
+
+def get_user_courses(user_id):
+    """Get courses for a user"""
+    course_ids = [course_id for (course_id,) in db.session.query(UserCourseEnrollment.course_id).filter_by(
+        user_id=user_id
+    ).order_by(UserCourseEnrollment.id).all()]
+    return course_catalog.get_many(course_ids)
@@ -0,0 +1,156 @@
+""" In-memory study partner matching index """
+# match_engine.py
+# Loads every enrollment once into a course -> users posting list (the columns
+# of a sparse user x course matrix) so a user's matches can be scored in a
+# single pass instead of one query per candidate. At larger scale an optional
+# MinHash/LSH index (minhash.py) narrows the candidates before exact scoring.
+
+import heapq
+import time
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+SAME_MAJOR_BONUS = 25
+SAME_LOCATION_BONUS = 15
+
+
+class MatchIndex:
+    """Sparse user x course index used to score study partners"""
+
+    def __init__(self, users, enrollments, lsh=None):
+        # users: iterable of (user_id, preferences, major, preferred_location)
+        # enrollments: iterable of (user_id, course_id)
+        # lsh: optional MinHashLSH used for candidate generation
+        self.profiles = {}
+        self.by_major = defaultdict(list)
+        for user_id, preferences, major, location in users:
+            self.profiles[user_id] = (preferences, major, location)
+        for user_id in sorted(self.profiles):
+            self.by_major[self.profiles[user_id][1]].append(user_id)
+
+        self.user_courses = defaultdict(set)
+        self.postings = defaultdict(set)
+        for user_id, course_id in enrollments:
+            self.user_courses[user_id].add(course_id)
+            self.postings[course_id].add(user_id)
+
+        self.lsh = lsh
+        if lsh is not None:
+            for user_id, course_ids in self.user_courses.items():
+                lsh.add(user_id, course_ids)
+
+        self.built_at = time.monotonic()
+        self.profile_version = 0  # highest profile version applied, see matching.py
+
+    def courses_for(self, user_id):
+        return self.user_courses.get(user_id, set())
+
+    def update_user(self, user_id, preferences, major, location, course_ids):
+        """Apply one user's profile and enrollment change in place"""
+        old_profile = self.profiles.get(user_id)
+        if old_profile is not None and old_profile[1] in self.by_major:
+            members = self.by_major[old_profile[1]]
+            i = bisect_left(members, user_id)
+            if i < len(members) and members[i] == user_id:
+                members.pop(i)
+        self.profiles[user_id] = (preferences, major, location)
+        insort(self.by_major[major], user_id)
+
+        new_courses = set(course_ids)
+        old_courses = self.user_courses.get(user_id, set())
+        for course_id in old_courses - new_courses:
+            self.postings[course_id].discard(user_id)
+        for course_id in new_courses - old_courses:
+            self.postings[course_id].add(user_id)
+        self.user_courses[user_id] = new_courses
+        if self.lsh is not None:
+            self.lsh.remove(user_id, old_courses)
+            self.lsh.add(user_id, new_courses)
+
+    def users_sharing(self, course_ids):
+        """Every user enrolled in at least one of course_ids"""
+        users = set()
+        for course_id in course_ids:
+            users |= self.postings.get(course_id, set())
+        return users
+
+    def _score(self, profile, user_courses, candidate_id, shared):
+        candidate = self.profiles.get(candidate_id)
+        if candidate is None or candidate[0] != profile[0]:
+            return None
+        same_major = candidate[1] == profile[1]
+        same_location = candidate[2] == profile[2]
+        compatibility = (shared / max(len(user_courses), 1)) * 100
+        if same_major:
+            compatibility += SAME_MAJOR_BONUS
+        if same_location:
+            compatibility += SAME_LOCATION_BONUS
+        return {
+            'user_id': candidate_id,
+            'common_course_ids': user_courses & self.user_courses[candidate_id],
+            'compatibility': min(compatibility, 100),
+            'same_major': same_major,
+            'same_location': same_location
+        }
+
+    def score_candidates(self, user_id):
+        """Score every user sharing a course and study preference with user_id"""
+        profile = self.profiles.get(user_id)
+        if profile is None or profile[0] is None:
+            return []
+        user_courses = self.courses_for(user_id)
+
+        if self.lsh is not None:
+            scored = []
+            for candidate_id in self.lsh.candidates(user_id, user_courses):
+                shared = len(user_courses & self.courses_for(candidate_id))
+                match = self._score(profile, user_courses, candidate_id, shared) if shared else None
+                if match is not None:
+                    scored.append(match)
+            return scored
+
+        # One pass over the postings of the user's courses gives the overlap
+        # with every candidate at once
+        overlap = Counter()
+        for course_id in user_courses:
+            overlap.update(self.postings[course_id])
+        overlap.pop(user_id, None)
+
+        scored = []
+        for candidate_id, shared in overlap.items():
+            match = self._score(profile, user_courses, candidate_id, shared)
+            if match is not None:
+                scored.append(match)
+        return scored
+
+    def score_pair(self, user_id, candidate_id):
+        """Score of candidate_id as a partner for user_id, or None if not a candidate"""
+        profile = self.profiles.get(user_id)
+        if profile is None or profile[0] is None or user_id == candidate_id:
+            return None
+        user_courses = self.courses_for(user_id)
+        shared = len(user_courses & self.courses_for(candidate_id))
+        if not shared:
+            return None
+        return self._score(profile, user_courses, candidate_id, shared)
+
+    def top_matches(self, user_id, k=8):
+        """Top-k course matches for user_id, best first (exact unless LSH is enabled)"""
+        scored = self.score_candidates(user_id)
+        return heapq.nlargest(k, scored, key=lambda m: (m['compatibility'], -m['user_id']))
+
+    def same_major_users(self, user_id, exclude=(), limit=None):
+        """Users in the same major as user_id, in id order"""
+        profile = self.profiles.get(user_id)
+        if profile is None or profile[1] is None:
+            return []
+        excluded = set(exclude)
+        excluded.add(user_id)
+        result = []
+        for candidate_id in self.by_major.get(profile[1], []):
+            if candidate_id in excluded:
+                continue
+            result.append(candidate_id)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
@@ -0,0 +1,132 @@
+""" Study partner matching backed by the in-memory index and the study_match table """
+# matching.py
+
+import random
+import time
+from collections import defaultdict
+
+from flask import current_app
+from sqlalchemy.orm import aliased
+
+from app.courses import course_catalog
+from app.dashboard.match_engine import MatchIndex
+from app.dashboard.minhash import MinHashLSH
+from app.database import db
+from app.database.match import rebuild_matches, refresh_after_profile_change
+from app.database.models import SimpleUser, StudyMatch, UserCourseEnrollment
+
+# Study partner matching index, loaded once per worker. Every profile change
+# takes the next profile_version while it holds the database write lock, so
+# versions are committed in order and a worker's index catches up on edits
+# made by other workers by loading the users with a higher version. The TTL
+# picks up bulk loads, which don't set versions.
+MATCH_INDEX_TTL = 300  # seconds
+_match_index = None
+
+def get_match_index():
+    """Get the in-memory matching index, loading all enrollments in one pass"""
+    global _match_index
+    if _match_index is None or time.monotonic() - _match_index.built_at > MATCH_INDEX_TTL:
+        users = db.session.query(
+            SimpleUser.id, SimpleUser.preferences, SimpleUser.major, SimpleUser.preferred_location,
+            SimpleUser.profile_version
+        ).all()
+        enrollments = db.session.query(UserCourseEnrollment.user_id, UserCourseEnrollment.course_id).all()
+        index = MatchIndex([user[:4] for user in users], enrollments, lsh=make_match_lsh(len(users)))
+        index.profile_version = max((user.profile_version for user in users), default=0)
+        _match_index = index
+    return _match_index
+
+def get_current_match_index():
+    """The matching index with every committed (and this session's) profile change applied"""
+    index = _match_index
+    if index is None or time.monotonic() - index.built_at > MATCH_INDEX_TTL:
+        return get_match_index()
+
+    profiles, courses = {}, defaultdict(set)
+    for user_id, preferences, major, location, version, course_id in db.session.query(
+        SimpleUser.id, SimpleUser.preferences, SimpleUser.major, SimpleUser.preferred_location,
+        SimpleUser.profile_version, UserCourseEnrollment.course_id
+    ).outerjoin(UserCourseEnrollment, UserCourseEnrollment.user_id == SimpleUser.id).filter(
+        SimpleUser.profile_version > index.profile_version
+    ):
+        profiles[user_id] = (preferences, major, location, version)
+        if course_id is not None:
+            courses[user_id].add(course_id)
+    for user_id, (preferences, major, location, version) in profiles.items():
+        index.update_user(user_id, preferences, major, location, courses[user_id])
+        index.profile_version = max(index.profile_version, version)
+    return index
+
+def make_match_lsh(user_count):
+    """MinHash/LSH candidate index for large populations, None to score exactly"""
+    if user_count < current_app.config['MATCH_LSH_MIN_USERS']:
+        return None
+    return MinHashLSH(bands=current_app.config['MATCH_LSH_BANDS'], rows=current_app.config['MATCH_LSH_ROWS'])
+
+def invalidate_match_index():
+    """Drop the matching index so the next lookup rebuilds it"""
+    global _match_index
+    _match_index = None
+
+def rebuild_all_matches():
+    """Recompute the stored matches of every user"""
+    invalidate_match_index()
+    count = rebuild_matches(db, StudyMatch, get_match_index())
+    db.session.commit()
+    return count
+
+def mark_profile_changed(user):
+    """Give user the next profile version, set in the same UPDATE as the profile fields"""
+    versions = aliased(SimpleUser)
+    user.profile_version = db.select(db.func.coalesce(db.func.max(versions.profile_version), 0) + 1).scalar_subquery()
+
+def update_matches_for_user(user, old_course_ids):
+    """Refresh stored matches after a mark_profile_changed user's profile or courses changed; the caller commits"""
+    # Loading the index flushes the change, so the user's new version and courses come with it
+    index = get_current_match_index()
+    return refresh_after_profile_change(db, StudyMatch, UserCourseEnrollment, index, user.id, old_course_ids)
+
+def find_study_matches(user_id):
+    """Find study partners"""
+    current_user = db.session.get(SimpleUser, user_id)
+    if not current_user:
+        return []
+    
+    # Precomputed top partners, best first, with the partner rows joined in
+    stored = db.session.query(StudyMatch, SimpleUser).join(
+        SimpleUser, SimpleUser.id == StudyMatch.partner_id
+    ).filter(StudyMatch.user_id == user_id).order_by(
+        StudyMatch.compatibility.desc(), StudyMatch.partner_id
+    ).limit(8).all()
+    
+    matches = []
+    for match, partner in stored:
+        course_ids = [int(c) for c in match.common_course_ids.split(',') if c] if match.common_course_ids else []
+        matches.append({
+            'user': partner,
+            'common_courses': [c.course_name for c in course_catalog.get_many(course_ids)],
+            'compatibility': match.compatibility,
+            'same_major': match.same_major,
+            'same_location': match.same_location
+        })
+    
+    # Add backup matches
+    if len(matches) < 6:
+        backup_matches = SimpleUser.query.filter(
+            SimpleUser.id != user_id,
+            SimpleUser.major == current_user.major,
+            SimpleUser.id.notin_([m['user'].id for m in matches])
+        ).order_by(SimpleUser.id).limit(8 - len(matches)).all()
+        
+        for match in backup_matches:
+            matches.append({
+                'user': match,
+                'common_courses': ["Similar interests"],
+                'compatibility': random.randint(60, 85),
+                'same_major': True,
+                'same_location': match.preferred_location == current_user.preferred_location
+            })
+    
+    matches.sort(key=lambda x: x['compatibility'], reverse=True)
+    return matches[:8]
@@ -0,0 +1,83 @@
+""" MinHash signatures and LSH buckets for approximate study partner candidates """
+# minhash.py
+# Scanning the postings of popular intro courses touches most of the user
+# base, so exact candidate generation is O(N) per user. Here every user's
+# course set gets a MinHash signature, cut into bands; users whose band
+# values collide in at least one band become candidates for exact scoring.
+#
+# Two users with Jaccard similarity J collide with probability
+# 1 - (1 - J**rows) ** bands. More bands (or fewer rows) raise recall at the
+# cost of larger candidate sets.
+
+import random
+
+MERSENNE_PRIME = (1 << 61) - 1
+DEFAULT_BANDS = 32
+DEFAULT_ROWS = 2
+
+
+class MinHashLSH:
+    """Banded MinHash index over user course sets"""
+
+    def __init__(self, bands=DEFAULT_BANDS, rows=DEFAULT_ROWS, seed=1):
+        if bands < 1 or rows < 1:
+            raise ValueError('bands and rows must be positive')
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME))
+                             for _ in range(bands * rows)]
+        self._course_hashes = {}
+        self.buckets = {}  # hash of (band, band values) -> user ids
+
+    def _course_hash(self, course_id):
+        hashes = self._course_hashes.get(course_id)
+        if hashes is None:
+            x = hash(course_id)
+            hashes = tuple((a * x + b) % MERSENNE_PRIME for a, b in self.permutations)
+            self._course_hashes[course_id] = hashes
+        return hashes
+
+    def signature(self, course_ids):
+        """Minimum of every hash function over the course set"""
+        vectors = [self._course_hash(course_id) for course_id in course_ids]
+        if len(vectors) == 1:
+            return vectors[0]
+        return tuple(map(min, *vectors))
+
+    def band_keys(self, course_ids):
+        if not course_ids:
+            return []
+        signature = self.signature(course_ids)
+        rows = self.rows
+        return [hash((band,) + signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, user_id, course_ids):
+        for key in self.band_keys(course_ids):
+            members = self.buckets.get(key)
+            if members is None:
+                self.buckets[key] = [user_id]
+            elif user_id not in members:
+                members.append(user_id)
+
+    def remove(self, user_id, course_ids):
+        """Take user_id out of the buckets of the course set it was added with"""
+        for key in self.band_keys(course_ids):
+            members = self.buckets.get(key)
+            if members and user_id in members:
+                members.remove(user_id)
+                if not members:
+                    del self.buckets[key]
+
+    def candidates(self, user_id, course_ids):
+        """Users colliding with course_ids in at least one band"""
+        found = set()
+        for key in self.band_keys(course_ids):
+            found.update(self.buckets.get(key, ()))
+        found.discard(user_id)
+        return found
+
+
+def collision_probability(jaccard, bands, rows):
+    """Chance that two sets with this Jaccard similarity become candidates"""
+    return 1 - (1 - jaccard ** rows) ** bands
@@ -1,23 +1,154 @@
-<<<<<<< HEAD
-# This is where we register dashboard routes
-# Ex: /dashboard redirects to the dashboard home page
-=======
-from flask import Blueprint, render_template, session, redirect, url_for
-from app.database.user import User
-from app.dashboard.matcher import find_study_matches
+import time
+from datetime import datetime
+
+from flask import Blueprint, render_template, session, redirect, url_for, request, flash, jsonify
+
+from app.auth.utils import forget_current_user, get_current_user
+from app.course_search import search_courses
+from app.courses import get_course_details, get_user_courses
+from app.dashboard.matching import find_study_matches, mark_profile_changed, update_matches_for_user
+from app.dashboard.sections import dashboard_sections, run_sections
+from app.database import db
+from app.database.messages import get_unread_count
+from app.database.models import PurdueLocation, SimpleCourse, SimpleUser, UserCourseEnrollment
+from app.planner.hours import plans_with_progress
+from app.purdue import PURDUE_MAJORS
+from app.query_profiler import query_budget
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+@dashboard_bp.route('/setup_profile', methods=['GET', 'POST'])
+@query_budget(10)  # 9, or 10 when a cold worker loads the whole match index
+def setup_profile():
+    if 'user' not in session:
+        return redirect(url_for('auth.index'))
+    
+    if request.method == 'POST':
+        user_id = session['user']['id']
+        user = SimpleUser.query.get(user_id)
+        
+        user.major = request.form.get('major')
+        user.year = request.form.get('year')
+        user.preferences = request.form.get('preferences')
+        user.preferred_location = request.form.get('preferred_location')
+        user.gpa = float(request.form.get('gpa')) if request.form.get('gpa') else None
+        user.bio = request.form.get('bio')
+        user.profile_completed = True
+        mark_profile_changed(user)
+        
+        # Clear existing courses and add new ones
+        old_course_ids = [course_id for (course_id,) in db.session.query(UserCourseEnrollment.course_id).filter_by(user_id=user.id)]
+        UserCourseEnrollment.query.filter_by(user_id=user.id).delete()
+        
+        # Each course once; enrollments are unique per (user, course)
+        selected_courses = list(dict.fromkeys(int(course_id) for course_id in request.form.getlist('courses') if course_id))
+        if selected_courses:
+            db.session.execute(db.insert(UserCourseEnrollment), [
+                {'user_id': user.id, 'course_id': course_id} for course_id in selected_courses
+            ])
+        
+        update_matches_for_user(user, old_course_ids)
+        db.session.commit()
+        forget_current_user()
+        flash('Profile updated successfully! Finding your study matches...', 'success')
+        return redirect(url_for('dashboard.dashboard'))
+    
+    majors = PURDUE_MAJORS
+    courses = get_user_courses(session['user']['id'])  # pre-selected; others are found via course search
+    locations = PurdueLocation.query.all()
+    
+    return render_template('setup_profile.html', majors=majors, courses=courses, locations=locations)
+
+@dashboard_bp.route('/api/courses/search')
+@query_budget(1)
+def course_search():
+    """Typeahead course search for the profile form"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    courses = search_courses(db, SimpleCourse, request.args.get('q', ''), request.args.get('limit', 20, type=int))
+    return jsonify({'success': True, 'courses': [{
+        'id': course_id,
+        'course_number': number,
+        'course_name': name,
+        'course_subject': subject,
+        'credits': credits
+    } for course_id, number, name, subject, credits in courses]})
+
+@dashboard_bp.route('/api/courses/<int:course_id>')
+@query_budget(2)
+def course_details(course_id):
+    """One course with its description"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    course = get_course_details(course_id)
+    if course is None:
+        return jsonify({'success': False, 'error': 'Course not found'}), 404
+    return jsonify({'success': True, 'course': course})
+
 @dashboard_bp.route('/dashboard')
+@query_budget(8)
 def dashboard():
     if 'user' not in session:
-        return redirect(url_for('auth.login'))
+        return redirect(url_for('auth.index'))
     
     user_id = session['user']['id']
-    user = User.query.get(user_id)
+    user = get_current_user()
+    if user is None:
+        session.pop('user', None)
+        return redirect(url_for('auth.index'))
+    
+    if not user.profile_completed:
+        return redirect(url_for('dashboard.setup_profile'))
     
-    # Get study matches
     matches = find_study_matches(user_id)
+    user.courses = get_user_courses(user_id)  # Add courses for template
+    unread_messages = get_unread_count(user_id)
+    upcoming_exams = plans_with_progress(user_id, after=datetime.now(), limit=3)
+    
+    return render_template('dashboard.html', user=user, matches=matches, unread_messages=unread_messages, upcoming_exams=upcoming_exams)
+
+@dashboard_bp.route('/api/dashboard')
+@query_budget(8)
+def dashboard_api():
+    """The dashboard as JSON; its sections load concurrently and report their timings"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    started = time.perf_counter()
+    user = get_current_user()
+    if user is None:
+        return jsonify({'success': False, 'error': 'User not found'})
+    
+    sections, timings = run_sections(dashboard_sections(user.id))
+    timings['total'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    response = jsonify({'success': True, 'user': vars(user), **sections, 'timings_ms': timings})
+    response.headers['Server-Timing'] = ', '.join(f'{name};dur={ms}' for name, ms in timings.items())
+    return response
+
+@dashboard_bp.route('/get_user_profile/<int:user_id>')
+@query_budget(3)
+def get_user_profile(user_id):
+    if 'user' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    user = SimpleUser.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    user_courses = get_user_courses(user_id)
     
-    return render_template('dashboard.html', user=user, matches=matches)
->>>>>>> e86c179ae670f259e3f9485453cc6bd9771385c7
+    return jsonify({
+        'id': user.id,
+        'name': user.name,
+        'email': user.email,
+        'major': user.major,
+        'year': user.year,
+        'preferences': user.preferences,
+        'preferred_location': user.preferred_location,
+        'gpa': user.gpa,
+        'bio': user.bio,
+        'courses': [{'course_number': c.course_number, 'course_name': c.course_name} for c in user_courses]
+    })
@@ -0,0 +1,112 @@
+""" Dashboard payload for /api/dashboard, its sections loaded concurrently """
+# sections.py
+# The sections of the dashboard are independent reads, so they run at the
+# same time on a bounded thread pool, created per app on first use. Each
+# section runs in its own copy of the request context: the copy pushes its
+# own app context, so Flask-SQLAlchemy gives it its own session, reads of a
+# GET still go to the reader pool, and its SQL statements are added to the
+# request's query count and budget. Sections return plain JSON data, never
+# ORM objects bound to their session. An in-memory SQLite database is one
+# shared connection, so there (and with DASHBOARD_WORKERS=1) the sections
+# run one after another.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import copy_current_request_context, current_app, g
+from sqlalchemy.engine import make_url
+
+from app.courses import get_user_courses
+from app.dashboard.matching import find_study_matches
+from app.database.messages import get_unread_count
+from app.database.sqlite import is_sqlite_file
+from app.planner.hours import plans_with_progress
+
+EXTENSION = 'dashboard_sections'
+_executor_lock = threading.Lock()
+
+
+def get_executor(app):
+    """The app's section thread pool, created on first use"""
+    executor = app.extensions.get(EXTENSION)
+    if executor is None:
+        with _executor_lock:
+            executor = app.extensions.get(EXTENSION)
+            if executor is None:
+                executor = app.extensions[EXTENSION] = ThreadPoolExecutor(
+                    max_workers=app.config['DASHBOARD_WORKERS'], thread_name_prefix='dashboard'
+                )
+    return executor
+
+
+def runs_concurrently(app):
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    in_memory = make_url(uri).get_backend_name() == 'sqlite' and not is_sqlite_file(uri)
+    return app.config['DASHBOARD_WORKERS'] > 1 and not in_memory
+
+
+def _timed(section):
+    g.query_log = []  # handed back to the request by run_sections
+    started = time.perf_counter()
+    result = section()
+    return result, (time.perf_counter() - started) * 1000, g.pop('query_log')
+
+
+def run_sections(sections):
+    """Run the {name: callable} sections; returns ({name: result}, {name: milliseconds})"""
+    app = current_app._get_current_object()
+    if runs_concurrently(app):
+        executor = get_executor(app)
+        futures = {name: executor.submit(copy_current_request_context(_timed), section)
+                   for name, section in sections.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+    else:
+        query_log = g.pop('query_log', None)
+        outcomes = {name: _timed(section) for name, section in sections.items()}
+        if query_log is not None:
+            g.query_log = query_log
+
+    results, timings = {}, {}
+    for name, (result, elapsed, statements) in outcomes.items():
+        results[name] = result
+        timings[name] = round(elapsed, 2)
+        if 'query_log' in g:
+            g.query_log.extend(statements)
+    return results, timings
+
+
+def match_data(match):
+    partner = match['user']
+    return {
+        'user': {'id': partner.id, 'name': partner.name, 'major': partner.major, 'year': partner.year,
+                 'profile_picture': partner.profile_picture},
+        'common_courses': match['common_courses'],
+        'compatibility': match['compatibility'],
+        'same_major': match['same_major'],
+        'same_location': match['same_location'],
+    }
+
+
+def exam_data(plan):
+    return {
+        'id': plan.id,
+        'course_id': plan.course_id,
+        'exam_name': plan.exam_name,
+        'exam_date': plan.exam_date.isoformat(),
+        'prep_hours_needed': plan.prep_hours_needed,
+        'hours_logged': plan.hours_logged,
+        'progress_percent': plan.progress,
+    }
+
+
+def dashboard_sections(user_id):
+    """The independent sections of a user's dashboard"""
+    return {
+        'matches': lambda: [match_data(match) for match in find_study_matches(user_id)],
+        'courses': lambda: [course._asdict() for course in get_user_courses(user_id)],
+        'unread_messages': lambda: get_unread_count(user_id),
+        'upcoming_exams': lambda: [exam_data(plan) for plan in
+                                   plans_with_progress(user_id, after=datetime.now(), limit=3)],
+    }
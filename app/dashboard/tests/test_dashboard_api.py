@@ -0,0 +1,87 @@
+"""Tests for the /api/dashboard aggregate endpoint."""
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from app import create_app
+from app.bootstrap import generate_users, seed_locations
+from app.courses import course_catalog
+from app.dashboard.matching import invalidate_match_index, rebuild_all_matches
+from app.database import db
+from app.database.models import SimpleCourse
+from app.database.sqlite import dispose_engines
+
+app = create_app('testing')
+
+SECTIONS = ['matches', 'courses', 'unread_messages', 'upcoming_exams']
+
+
+def seed():
+    db.create_all()
+    seed_locations()
+    db.session.execute(db.insert(SimpleCourse), [
+        {'course_number': f'{100 + i}', 'course_name': f'Course {i}', 'course_subject': 'CS'} for i in range(20)
+    ])
+    db.session.commit()
+    generate_users(40, seed=5, plans_per_user=1.0, now=datetime.now())
+    rebuild_all_matches()
+
+
+class DashboardApiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = None
+        self.app = app
+
+    def start(self):
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        seed()
+        self.client = self.app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        invalidate_match_index()
+        course_catalog.invalidate()
+        if self.db_dir:
+            dispose_engines(self.app, db)
+            shutil.rmtree(self.db_dir, ignore_errors=True)
+
+    def test_payload_and_timings(self):
+        self.start()
+        response = self.client.get('/api/dashboard')
+        body = response.get_json()
+        self.assertTrue(body['success'])
+        self.assertEqual(body['user']['id'], 1)
+        self.assertTrue(body['matches'] and body['courses'])
+        self.assertEqual(set(body['timings_ms']), set(SECTIONS) | {'total'})
+        self.assertIn('upcoming_exams;dur=', response.headers['Server-Timing'])
+
+    def test_concurrent_sections_match_sequential_ones(self):
+        """Test that sections run on the pool give the same payload and SQL count."""
+        self.db_dir = tempfile.mkdtemp()
+        self.app = create_app('testing', {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(self.db_dir, 'test.db')}",
+            'QUERY_STATS_HEADERS': True,
+        })
+        self.start()
+
+        def fetch():
+            response = self.client.get('/api/dashboard')
+            body = response.get_json()
+            return {name: body[name] for name in SECTIONS}, response.headers['X-DB-Query-Count']
+
+        fetch()  # loads the course catalog once
+        concurrent = fetch()
+        self.app.config['DASHBOARD_WORKERS'] = 1
+        self.assertEqual(fetch(), concurrent)
+        self.assertGreater(int(concurrent[1]), len(SECTIONS))
+
+
+if __name__ == '__main__':
+    unittest.main()
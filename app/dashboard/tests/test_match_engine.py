@@ -0,0 +1,61 @@
+"""Unit tests for the study partner matching index."""
+import unittest
+
+from app.dashboard.match_engine import MatchIndex
+
+
+class MatchIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        users = [
+            (1, 'quiet', 'Computer Science', 'Hicks Undergraduate Library'),
+            (2, 'quiet', 'Computer Science', 'Hicks Undergraduate Library'),
+            (3, 'quiet', 'Mathematics', 'MATH Library'),
+            (4, 'collaborative', 'Computer Science', 'Hicks Undergraduate Library'),
+            (5, 'quiet', 'Computer Science', 'MATH Library'),
+            (6, 'quiet', 'Physics', 'MATH Library'),
+        ]
+        enrollments = [
+            (1, 10), (1, 11), (1, 12), (1, 13),
+            (2, 10), (2, 11),
+            (3, 10), (3, 11), (3, 12), (3, 13),
+            (4, 10), (4, 11), (4, 12), (4, 13),
+            (5, 99),
+            (6, 13),
+        ]
+        self.index = MatchIndex(users, enrollments)
+
+    def test_only_shared_courses_and_same_preferences(self):
+        """Test that candidates must share a course and a study preference."""
+        ids = [m['user_id'] for m in self.index.score_candidates(1)]
+        self.assertCountEqual(ids, [2, 3, 6])
+
+    def test_scoring_terms(self):
+        """Test overlap percentage plus major and location bonuses."""
+        scores = {m['user_id']: m for m in self.index.score_candidates(1)}
+        # 2/4 courses + 25 major + 15 location
+        self.assertEqual(scores[2]['compatibility'], 90)
+        self.assertTrue(scores[2]['same_major'])
+        self.assertTrue(scores[2]['same_location'])
+        # 4/4 courses, capped at 100
+        self.assertEqual(scores[3]['compatibility'], 100)
+        self.assertEqual(scores[6]['compatibility'], 25)
+        self.assertEqual(scores[2]['common_course_ids'], {10, 11})
+
+    def test_top_matches_are_exact_and_ordered(self):
+        """Test that top-k returns the best scores first."""
+        top = self.index.top_matches(1, k=2)
+        self.assertEqual([m['user_id'] for m in top], [3, 2])
+
+    def test_same_major_users(self):
+        """Test backup candidates from the same major."""
+        self.assertEqual(self.index.same_major_users(1, exclude=[2]), [4, 5])
+        self.assertEqual(self.index.same_major_users(1, limit=1), [2])
+
+    def test_unknown_user(self):
+        """Test that an unknown user has no matches."""
+        self.assertEqual(self.index.top_matches(42), [])
+        self.assertEqual(self.index.same_major_users(42), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tests for MinHash/LSH candidate generation."""
+import random
+import unittest
+
+from app.dashboard.match_engine import MatchIndex
+from app.dashboard.minhash import MinHashLSH, collision_probability
+
+
+class MinHashLSHTestCase(unittest.TestCase):
+    def test_signature_estimates_jaccard(self):
+        lsh = MinHashLSH(bands=128, rows=2)
+        a, b = set(range(0, 60)), set(range(30, 90))  # Jaccard 1/3
+        sig_a, sig_b = lsh.signature(a), lsh.signature(b)
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+        self.assertAlmostEqual(estimate, 1 / 3, delta=0.1)
+
+    def test_candidates_follow_updates(self):
+        lsh = MinHashLSH(bands=8, rows=2)
+        lsh.add(1, {10, 11, 12})
+        lsh.add(2, {10, 11, 12})
+        lsh.add(3, {50, 51})
+        self.assertEqual(lsh.candidates(1, {10, 11, 12}), {2})
+        self.assertEqual(lsh.candidates(3, {50, 51}), set())
+
+        lsh.remove(2, {10, 11, 12})
+        lsh.add(2, {50, 51})
+        self.assertEqual(lsh.candidates(1, {10, 11, 12}), set())
+        self.assertEqual(lsh.candidates(3, {50, 51}), {2})
+
+    def test_collision_probability(self):
+        self.assertEqual(collision_probability(1.0, 16, 2), 1.0)
+        self.assertLess(collision_probability(0.1, 16, 2), collision_probability(0.1, 32, 2))
+        self.assertLess(collision_probability(0.1, 16, 3), collision_probability(0.1, 16, 2))
+
+
+class LSHMatchIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.users = [(u, rng.choice(['quiet', 'collaborative']), rng.choice(['CS', 'MA']), 'Hicks') for u in range(1, 301)]
+        self.enrollments = [(u, c) for u in range(1, 301) for c in rng.sample(range(40), rng.randint(2, 5))]
+
+    def test_high_band_count_recovers_exact_matches(self):
+        """Test that with many single-row bands LSH finds (nearly) every exact match."""
+        exact = MatchIndex(self.users, self.enrollments)
+        approx = MatchIndex(self.users, self.enrollments, lsh=MinHashLSH(bands=64, rows=1))
+        found = wanted = 0
+        for user_id in range(1, 301):
+            expected = {m['user_id'] for m in exact.top_matches(user_id, 10)}
+            found += len(expected & {m['user_id'] for m in approx.top_matches(user_id, 10)})
+            wanted += len(expected)
+        self.assertGreater(found / wanted, 0.95)
+
+    def test_updates_match_fresh_index(self):
+        """Test that updating a user gives the same matches as rebuilding the index."""
+        index = MatchIndex(self.users, self.enrollments, lsh=MinHashLSH())
+        index.update_user(7, 'quiet', 'CS', 'Hicks', [1, 2, 3])
+        users = [(7, 'quiet', 'CS', 'Hicks') if u[0] == 7 else u for u in self.users]
+        enrollments = [e for e in self.enrollments if e[0] != 7] + [(7, 1), (7, 2), (7, 3)]
+        fresh = MatchIndex(users, enrollments, lsh=MinHashLSH())
+        for user_id in range(1, 301):
+            self.assertEqual(index.top_matches(user_id, 10), fresh.top_matches(user_id, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,4 +3,11 @@
 
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from app.database.sqlite import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# The first schema (campus.py, course.py, studysession.py, user.py and
+# helpers.py) is no longer used by the app. Its models live on a separate
+# instance, so importing them never adds tables to the app's metadata.
+legacy_db = SQLAlchemy()
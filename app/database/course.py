@@ -1,4 +1,4 @@
-from . import db
+from . import legacy_db as db
 
 class Course(db.Model):
     id = db.Column(db.Integer, primary_key=True)
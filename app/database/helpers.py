@@ -1,7 +1,9 @@
 """ This module contains helper functions for database operations. """
 # helpers.py
 
-from app.database import db
+from sqlalchemy.orm import joinedload
+
+from app.database import legacy_db as db
 from app.database.user import User
 from app.database.course import Course
 from app.database.studysession import StudySession
@@ -52,7 +54,8 @@ def remove_user_from_course(user_id, course_id):
 
 def get_user_courses(user_id):
     """Get all courses a user is enrolled in."""
-    user = db.session.get(User, user_id)
+    # Load the user and their courses in one query instead of a lazy load
+    user = db.session.get(User, user_id, options=[joinedload(User.courses)])
 
     # Check if user exists
     if not user:
@@ -1,2 +1,101 @@
-# Contains database models and queries related to study groups
-# Ex: StudyGroup model, queries for creating and fetching study groups
\ No newline at end of file
+""" Materialized study matches: each user's top partners, kept up to date incrementally """
+# match.py
+# The dashboard reads a user's partners straight from the match table. Rows
+# are rewritten only for users whose top list can change after someone edits
+# their profile or enrollments; scoring comes from the in-memory MatchIndex.
+# Functions take the db and the models so they work with the app's models.
+
+from sqlalchemy import bindparam, func, insert, select
+
+TOP_N = 10
+REFRESH_CHUNK = 500
+
+
+def match_rows(index, user_id, top_n=TOP_N):
+    """Rows for the match table holding user_id's current top partners"""
+    rows = []
+    for match in index.top_matches(user_id, k=top_n):
+        rows.append({
+            'user_id': user_id,
+            'partner_id': match['user_id'],
+            'compatibility': match['compatibility'],
+            'common_course_ids': ','.join(str(c) for c in sorted(match['common_course_ids'])[:3]),
+            'shared_courses': len(match['common_course_ids']),
+            'same_major': match['same_major'],
+            'same_location': match['same_location'],
+        })
+    return rows
+
+
+def store_matches(db, model, index, user_ids, top_n=TOP_N):
+    """Replace the stored matches of user_ids in two statements; the caller commits"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return 0
+    # One DELETE keyed by user, run for every id, keeps the statement count
+    # and its parameters the same however many lists change
+    table = model.__table__
+    db.session.execute(table.delete().where(table.c.user_id == bindparam('stale_user_id')),
+                       [{'stale_user_id': user_id} for user_id in user_ids])
+    rows = [row for user_id in user_ids for row in match_rows(index, user_id, top_n)]
+    if rows:
+        db.session.execute(insert(model), rows)
+    return len(user_ids)
+
+
+def rebuild_matches(db, model, index, top_n=TOP_N):
+    """Recompute the match table for every user in the index"""
+    db.session.query(model).delete(synchronize_session=False)
+    user_ids = sorted(index.profiles)
+    for start in range(0, len(user_ids), REFRESH_CHUNK):
+        rows = [row for user_id in user_ids[start:start + REFRESH_CHUNK] for row in match_rows(index, user_id, top_n)]
+        if rows:
+            db.session.execute(insert(model), rows)
+    return len(user_ids)
+
+
+def users_needing_refresh(db, model, enrollment_model, index, changed_user_id, old_course_ids, top_n=TOP_N):
+    """Users whose stored top list can change after changed_user_id's profile changed.
+
+    Only users sharing a course (before or after the change) can be affected.
+    Of those, a list needs rewriting if it contains the changed user, or if the
+    user's new score is good enough to enter it.
+    """
+    course_ids = set(old_course_ids) | index.courses_for(changed_user_id)
+    neighbours = index.users_sharing(course_ids)
+    neighbours.discard(changed_user_id)
+    affected = {changed_user_id}
+    if not neighbours:
+        return affected
+
+    # Neighbours are selected through the enrollments of the user's courses,
+    # so this is one query with a parameter per course, not per neighbour
+    sharing = select(enrollment_model.user_id).where(enrollment_model.course_id.in_(sorted(course_ids)))
+    summaries = {}
+    for user_id, count, lowest, contains in db.session.query(
+        model.user_id,
+        func.count(model.partner_id),
+        func.min(model.compatibility),
+        func.max(model.partner_id == changed_user_id)
+    ).filter(model.user_id.in_(sharing)).group_by(model.user_id):
+        summaries[user_id] = (count, lowest, bool(contains))
+
+    for user_id in neighbours:
+        count, lowest, contains = summaries.get(user_id, (0, None, False))
+        if contains:
+            affected.add(user_id)
+            continue
+        match = index.score_pair(user_id, changed_user_id)
+        if match is not None and (count < top_n or match['compatibility'] >= lowest):
+            affected.add(user_id)
+    return affected
+
+
+def refresh_after_profile_change(db, model, enrollment_model, index, user_id, old_course_ids, top_n=TOP_N):
+    """Rewrite only the match lists affected by user_id's change; the caller commits
+
+    Runs three statements however many neighbours the user has.
+    """
+    affected = users_needing_refresh(db, model, enrollment_model, index, user_id, old_course_ids, top_n)
+    store_matches(db, model, index, affected, top_n)
+    return affected
@@ -0,0 +1,130 @@
+""" Conversations, read watermarks and paged message boxes """
+# messages.py
+
+from datetime import datetime
+
+from app.database import db
+from app.database.models import Conversation, ConversationParticipant, Message, SimpleUser, UserUnreadCount
+
+# Conversations and read state
+# Each pair of users shares one Conversation. Every participant keeps a read
+# watermark (last message id seen) plus a per-thread unread counter, and
+# UserUnreadCount holds the total for the badge, so reading the badge and
+# marking messages read never touch individual Message rows.
+def get_or_create_conversation(user_a, user_b):
+    low, high = sorted((user_a, user_b))
+    conversation = Conversation.query.filter_by(user_low_id=low, user_high_id=high).first()
+    if not conversation:
+        conversation = Conversation(user_low_id=low, user_high_id=high, last_message_id=0)
+        db.session.add(conversation)
+        db.session.flush()
+        for participant_id in {low, high}:
+            db.session.add(ConversationParticipant(
+                conversation_id=conversation.id, user_id=participant_id, last_read_message_id=0, unread_count=0
+            ))
+    return conversation
+
+def adjust_unread_count(user_id, delta):
+    """Atomically add delta to a user's unread total"""
+    updated = UserUnreadCount.query.filter_by(user_id=user_id).update(
+        {'unread_count': UserUnreadCount.unread_count + delta}, synchronize_session=False
+    )
+    if not updated:
+        db.session.add(UserUnreadCount(user_id=user_id, unread_count=max(delta, 0)))
+
+def post_message(sender_id, recipient_id, subject, content, message_type='general'):
+    """Add a message to the pair's conversation and bump the recipient's unread counters"""
+    conversation = get_or_create_conversation(sender_id, recipient_id)
+    message = Message(
+        sender_id=sender_id,
+        recipient_id=recipient_id,
+        subject=subject,
+        content=content,
+        message_type=message_type,
+        conversation_id=conversation.id
+    )
+    db.session.add(message)
+    db.session.flush()
+    
+    conversation.last_message_id = message.id
+    conversation.last_message_at = message.timestamp
+    ConversationParticipant.query.filter_by(conversation_id=conversation.id, user_id=recipient_id).update(
+        {'unread_count': ConversationParticipant.unread_count + 1}, synchronize_session=False
+    )
+    adjust_unread_count(recipient_id, 1)
+    return message
+
+def get_unread_count(user_id):
+    counter = db.session.get(UserUnreadCount, user_id)
+    return counter.unread_count if counter else 0
+
+def mark_conversation_read(user_id, conversation_id):
+    """Move the user's watermark to the newest message in one conversation"""
+    participant = db.session.get(ConversationParticipant, (conversation_id, user_id))
+    if not participant:
+        return False
+    conversation = db.session.get(Conversation, conversation_id)
+    if participant.unread_count:
+        adjust_unread_count(user_id, -participant.unread_count)
+    participant.unread_count = 0
+    participant.last_read_message_id = conversation.last_message_id
+    return True
+
+def mark_all_conversations_read(user_id):
+    """Mark every conversation read; only threads with unread messages are written"""
+    latest = db.session.query(Conversation.last_message_id).filter(
+        Conversation.id == ConversationParticipant.conversation_id
+    ).scalar_subquery()
+    ConversationParticipant.query.filter(
+        ConversationParticipant.user_id == user_id,
+        ConversationParticipant.unread_count > 0
+    ).update({'unread_count': 0, 'last_read_message_id': latest}, synchronize_session=False)
+    UserUnreadCount.query.filter_by(user_id=user_id).update({'unread_count': 0}, synchronize_session=False)
+
+MESSAGES_PAGE_SIZE = 25
+
+def encode_message_cursor(message):
+    return f"{message.timestamp.isoformat()}_{message.id}"
+
+def decode_message_cursor(cursor):
+    """Parse a 'timestamp_id' cursor, or None if missing or malformed"""
+    try:
+        timestamp, message_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(timestamp), int(message_id)
+    except (AttributeError, ValueError):
+        return None
+
+def get_message_page(user_id, box, cursor=None, limit=MESSAGES_PAGE_SIZE):
+    """One page of a user's inbox or outbox, newest first, with the other party attached.
+    
+    Uses keyset pagination on (timestamp, id) so every page is a single
+    indexed range scan. Returns (messages, next_cursor).
+    """
+    if box == 'inbox':
+        own_column, other_column, attribute = Message.recipient_id, Message.sender_id, 'sender'
+    else:
+        own_column, other_column, attribute = Message.sender_id, Message.recipient_id, 'recipient'
+    
+    query = db.session.query(Message, SimpleUser, ConversationParticipant.last_read_message_id).outerjoin(
+        SimpleUser, SimpleUser.id == other_column
+    ).outerjoin(
+        ConversationParticipant,
+        (ConversationParticipant.conversation_id == Message.conversation_id) & (ConversationParticipant.user_id == user_id)
+    ).filter(own_column == user_id)
+    
+    position = decode_message_cursor(cursor)
+    if position:
+        timestamp, message_id = position
+        query = query.filter(
+            (Message.timestamp < timestamp) | ((Message.timestamp == timestamp) & (Message.id < message_id))
+        )
+    
+    rows = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit + 1).all()
+    
+    page = []
+    for message, other_user, watermark in rows[:limit]:
+        setattr(message, attribute, other_user)
+        message.unread = box == 'inbox' and message.id > (watermark or 0)
+        page.append(message)
+    next_cursor = encode_message_cursor(page[-1]) if len(rows) > limit else None
+    return page, next_cursor
@@ -0,0 +1,232 @@
+""" Database models of the app """
+# models.py
+
+from datetime import datetime
+
+from app.course_search import register_search_index
+from app.database import db
+
+# Simple Database Models (No complex foreign keys)
+class SimpleUser(db.Model):
+    __tablename__ = 'simple_user'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    profile_picture = db.Column(db.String(200))
+    major = db.Column(db.String(100))
+    year = db.Column(db.String(20))
+    preferences = db.Column(db.String(50))  # 'quiet', 'collaborative', 'discussion'
+    preferred_location = db.Column(db.String(200))  # Store location name as string
+    gpa = db.Column(db.Float)
+    bio = db.Column(db.Text)
+    profile_completed = db.Column(db.Boolean, default=False)
+    is_demo_user = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Order of the last profile or course change, see app/dashboard/matching.py
+    profile_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    __table_args__ = (
+        db.Index('ix_simple_user_major', 'major'),  # same-major backup matches
+        db.Index('ix_simple_user_profile_version', 'profile_version'),
+    )
+
+class SimpleCourse(db.Model):
+    __tablename__ = 'simple_course'
+    id = db.Column(db.Integer, primary_key=True)
+    course_number = db.Column(db.String(20), nullable=False)
+    course_name = db.Column(db.String(200), nullable=False)
+    course_subject = db.Column(db.String(100), nullable=False)
+    credits = db.Column(db.Integer, default=3)
+    description = db.Column(db.Text)
+
+register_search_index(SimpleCourse.__table__)  # FTS5 typeahead index, kept in sync by triggers
+
+class UserCourseEnrollment(db.Model):
+    __tablename__ = 'user_course_enrollment'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)  # No foreign key constraint
+    course_id = db.Column(db.Integer, nullable=False)  # No foreign key constraint
+    grade_goal = db.Column(db.String(5))
+    __table_args__ = (
+        db.Index('uq_user_course_enrollment', 'user_id', 'course_id', unique=True),
+        db.Index('ix_user_course_enrollment_course', 'course_id', 'user_id'),  # classmates of a course
+    )
+
+class Message(db.Model):
+    __tablename__ = 'message'
+    id = db.Column(db.Integer, primary_key=True)
+    sender_id = db.Column(db.Integer, nullable=False)
+    recipient_id = db.Column(db.Integer, nullable=False)
+    subject = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    is_read = db.Column(db.Boolean, default=False)  # Legacy; read state lives in ConversationParticipant
+    message_type = db.Column(db.String(50), default='general')
+    conversation_id = db.Column(db.Integer)
+    __table_args__ = (
+        db.Index('ix_message_recipient_timestamp', 'recipient_id', 'timestamp'),
+        db.Index('ix_message_sender_timestamp', 'sender_id', 'timestamp'),
+        db.Index('ix_message_conversation', 'conversation_id', 'id'),
+    )
+
+class Conversation(db.Model):
+    __tablename__ = 'conversation'
+    id = db.Column(db.Integer, primary_key=True)
+    user_low_id = db.Column(db.Integer, nullable=False)  # smaller of the two user ids
+    user_high_id = db.Column(db.Integer, nullable=False)
+    last_message_id = db.Column(db.Integer, default=0)
+    last_message_at = db.Column(db.DateTime)
+    __table_args__ = (db.UniqueConstraint('user_low_id', 'user_high_id', name='uq_conversation_users'),)
+
+class ConversationParticipant(db.Model):
+    __tablename__ = 'conversation_participant'
+    conversation_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    last_read_message_id = db.Column(db.Integer, default=0)  # read watermark
+    unread_count = db.Column(db.Integer, default=0)
+    __table_args__ = (db.Index('ix_conversation_participant_user_unread', 'user_id', 'unread_count'),)
+
+class UserUnreadCount(db.Model):
+    __tablename__ = 'user_unread_count'
+    user_id = db.Column(db.Integer, primary_key=True)
+    unread_count = db.Column(db.Integer, default=0)
+
+class StudyPlan(db.Model):
+    __tablename__ = 'study_plan'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    course_id = db.Column(db.Integer, nullable=False)
+    exam_name = db.Column(db.String(200), nullable=False)
+    exam_date = db.Column(db.DateTime, nullable=False)
+    prep_hours_needed = db.Column(db.Integer, default=20)
+    hours_completed = db.Column(db.Integer, default=0)  # Legacy; logged hours live in study_hours_log
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index('ix_study_plan_user_exam_date', 'user_id', 'exam_date'),)
+
+class StudyHoursLog(db.Model):
+    """One logged study session; rows are only ever inserted, see app/planner/hours.py"""
+    __tablename__ = 'study_hours_log'
+    id = db.Column(db.Integer, primary_key=True)
+    plan_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    course_id = db.Column(db.Integer, nullable=False)
+    hours = db.Column(db.Float, nullable=False)
+    logged_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('ix_study_hours_log_plan', 'plan_id'),
+        db.Index('ix_study_hours_log_user_logged', 'user_id', 'logged_at'),
+    )
+
+class StudyPlanHours(db.Model):
+    """Rollup of study_hours_log per plan"""
+    __tablename__ = 'study_plan_hours'
+    plan_id = db.Column(db.Integer, primary_key=True)
+    hours = db.Column(db.Float, nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+    last_logged_at = db.Column(db.DateTime)
+
+class CourseStudyHours(db.Model):
+    """Rollup of study_hours_log per user and course"""
+    __tablename__ = 'course_study_hours'
+    user_id = db.Column(db.Integer, primary_key=True)
+    course_id = db.Column(db.Integer, primary_key=True)
+    hours = db.Column(db.Float, nullable=False, default=0)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+    last_logged_at = db.Column(db.DateTime)
+
+class ScheduledStudySession(db.Model):
+    """Suggested exam-prep session from the nightly run of app/planner/scheduler.py"""
+    __tablename__ = 'scheduled_study_session'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    plan_id = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    location_name = db.Column(db.String(200), nullable=False)
+    room_number = db.Column(db.String(50), nullable=False)
+    __table_args__ = (
+        db.Index('ix_scheduled_study_session_user_day', 'user_id', 'day', 'start_time'),
+        db.Index('ix_scheduled_study_session_day', 'day'),
+    )
+
+class RoomBooking(db.Model):
+    __tablename__ = 'room_booking'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    location_name = db.Column(db.String(200), nullable=False)
+    room_number = db.Column(db.String(50), nullable=False)
+    booking_date = db.Column(db.Date, nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
+    purpose = db.Column(db.String(200))
+    group_size = db.Column(db.Integer, default=1)
+    status = db.Column(db.String(20), default='active')  # active, cancelled
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('ix_room_booking_room_day', 'location_name', 'room_number', 'booking_date', 'status'),
+        db.Index('ix_room_booking_day_status', 'booking_date', 'status'),  # today's bookings, all rooms
+        db.Index('ix_room_booking_user_day', 'user_id', 'booking_date', 'start_time'),
+    )
+
+class StudyRoom(db.Model):
+    __tablename__ = 'study_room'
+    id = db.Column(db.Integer, primary_key=True)
+    location_name = db.Column(db.String(200), nullable=False)
+    room_number = db.Column(db.String(50), nullable=False)
+    capacity = db.Column(db.Integer, nullable=False)
+    __table_args__ = (
+        db.Index('uq_study_room_location_number', 'location_name', 'room_number', unique=True),
+        db.Index('ix_study_room_capacity', 'capacity'),  # free rooms for a group size
+    )
+
+class RoomOccupancy(db.Model):
+    """Booked 15-minute slots of one room on one day; see app/rooms/occupancy.py"""
+    __tablename__ = 'room_occupancy'
+    day = db.Column(db.Date, primary_key=True)
+    room_id = db.Column(db.Integer, primary_key=True)
+    slots_am = db.Column(db.BigInteger, nullable=False, default=0)  # bit i: 00:00 + 15 * i minutes
+    slots_pm = db.Column(db.BigInteger, nullable=False, default=0)  # bit i: 12:00 + 15 * i minutes
+
+class StudyMatch(db.Model):
+    __tablename__ = 'study_match'
+    user_id = db.Column(db.Integer, primary_key=True)
+    partner_id = db.Column(db.Integer, primary_key=True)
+    compatibility = db.Column(db.Float, nullable=False)
+    common_course_ids = db.Column(db.String(100))  # up to 3 shared course ids, comma separated
+    shared_courses = db.Column(db.Integer, default=0)
+    same_major = db.Column(db.Boolean, default=False)
+    same_location = db.Column(db.Boolean, default=False)
+    __table_args__ = (db.Index('ix_study_match_user_score', 'user_id', 'compatibility'),)
+
+class EmailOutbox(db.Model):
+    __tablename__ = 'email_outbox'
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(300), nullable=False)
+    body_html = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, default=0)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32))
+    claimed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    __table_args__ = (db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),)
+
+class AppMetadata(db.Model):
+    __tablename__ = 'app_metadata'
+    key = db.Column(db.String(50), primary_key=True)  # 'schema_version', 'seed_fingerprint'
+    value = db.Column(db.String(200))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class PurdueLocation(db.Model):
+    __tablename__ = 'purdue_location'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    location_type = db.Column(db.String(50), nullable=False)
+    building = db.Column(db.String(100))
+    hours = db.Column(db.String(200))
+    amenities = db.Column(db.Text)
+    capacity = db.Column(db.Integer)
+    __table_args__ = (db.Index('ix_purdue_location_type', 'location_type'),)
@@ -0,0 +1,140 @@
+""" SQLite engine profiles: pragmas, transaction mode and reader/writer pools """
+# sqlite.py
+# SQLite allows one writer at a time. With the default rollback journal a
+# writer also locks out readers, and a transaction that starts by reading and
+# then writes fails at once with "database is locked" if another connection
+# got the write lock first, whatever the busy timeout. The 'tuned' profile
+# switches the database to WAL, so readers never wait for the writer, and on
+# a database file:
+#   * writes get a pool of their own (one connection by default), so threads
+#     of a worker queue for it in Python instead of retrying the file lock,
+#   * writer transactions start with BEGIN IMMEDIATE, taking the write lock up
+#     front; other processes then wait for it through busy_timeout,
+#   * reads of GET requests go to a separate read-only pool and run in
+#     parallel with the writer.
+# Everything else (POST requests, CLI commands, background workers) reads and
+# writes through the writer, so a read-modify-write never sees a stale row.
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+READER_EXTENSION = 'sqlite_reader'
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+SQLITE_PROFILES = {
+    'off': {},  # the driver's defaults and a single pool
+    'tuned': {
+        'busy_timeout': 5000,  # ms; first, so the pragmas below wait for a lock too
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',  # WAL stays consistent; a power cut may lose the last commits
+        'cache_size': -16000,  # negative: KiB per connection
+        'mmap_size': 128 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def is_sqlite_file(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:') \
+        and 'mode=memory' not in str(url)
+
+
+def sqlite_pragmas(config):
+    """Pragmas of the configured profile, updated with SQLITE_PRAGMAS"""
+    pragmas = dict(SQLITE_PROFILES[config['SQLITE_PROFILE']])
+    pragmas.update(config.get('SQLITE_PRAGMAS') or {})
+    return pragmas
+
+
+def init_sqlite(app, db):
+    """Initialize db for app, with the SQLite profile applied to its engines.
+
+    Engine options are read when db.init_app creates the engine, so the
+    writer pool is configured first and the connection listeners attached after.
+
+    Config:
+        SQLITE_PROFILE            a key of SQLITE_PROFILES (default 'tuned')
+        SQLITE_PRAGMAS            pragmas overriding the profile's
+        SQLITE_WRITER_POOL_SIZE   writer connections per process (default 1)
+        SQLITE_READER_POOL_SIZE   reader connections per process; 0 reads through the writer
+    """
+    app.config.setdefault('SQLITE_PROFILE', 'tuned')
+    app.config.setdefault('SQLITE_WRITER_POOL_SIZE', 1)
+    app.config.setdefault('SQLITE_READER_POOL_SIZE', 8)
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if make_url(uri).get_backend_name() != 'sqlite':
+        db.init_app(app)
+        return
+
+    split = app.config['SQLITE_PROFILE'] != 'off' and is_sqlite_file(uri)
+    if split:
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        options.setdefault('pool_size', app.config['SQLITE_WRITER_POOL_SIZE'])
+        options.setdefault('max_overflow', 0)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    db.init_app(app)
+
+    pragmas = sqlite_pragmas(app.config)
+    with app.app_context():
+        writer = db.engine
+    tune_engine(writer, pragmas, 'BEGIN IMMEDIATE' if split else None)
+    if split and app.config['SQLITE_READER_POOL_SIZE']:
+        # Same file as the writer, whose URL Flask-SQLAlchemy made absolute
+        reader = create_engine(writer.url, pool_size=app.config['SQLITE_READER_POOL_SIZE'])
+        tune_engine(reader, dict(pragmas, query_only='ON'), 'BEGIN')
+        app.extensions[READER_EXTENSION] = reader
+
+
+def dispose_engines(app, db):
+    """Close the pooled connections of every engine of app, e.g. before forking"""
+    with app.app_context():
+        db.engine.dispose()
+    if READER_EXTENSION in app.extensions:
+        app.extensions[READER_EXTENSION].dispose()
+
+
+def tune_engine(engine, pragmas, begin=None):
+    """Set pragmas on every new connection of engine; begin replaces the
+    driver's implicit BEGIN, which it only issues before the first write"""
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        if begin:
+            dbapi_connection.isolation_level = None  # we issue BEGIN ourselves
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    if begin:
+        @event.listens_for(engine, 'begin')
+        def begin_transaction(conn):
+            # Sent to the driver directly: like the COMMIT that ends it, it is
+            # not counted as a query
+            conn.connection.driver_connection.execute(begin)
+
+
+class RoutingSession(Session):
+    """Session sending the reads of GET requests to the reader pool.
+
+    Once a transaction has written, its reads stay on the writer until it
+    ends, so a request always sees its own changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        reader = current_app.extensions.get(READER_EXTENSION)
+        if reader is None or bind is not None:
+            return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if (not self._flushing and not self.info.get('writing') and clause is not None and clause.is_select
+                and has_request_context() and request.method in READ_METHODS):
+            return reader
+        self.info['writing'] = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _end_writing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('writing', None)
@@ -2,7 +2,7 @@
 # studysession.py
 # Ex: StudySession model, queries for creating and fetching study groups
 
-from . import db
+from . import legacy_db as db
 
 # Session participants table:
 # - many-to-many relationship between users and study sessions
@@ -0,0 +1,70 @@
+"""Tests for the one-time database bootstrap in app/bootstrap.py."""
+import unittest
+
+from app import create_app, purdue
+from app.bootstrap import SCHEMA_VERSION, get_app_metadata, init_db, seed_fingerprint, set_app_metadata
+from app.database import db
+from app.database.models import (
+    Message, PurdueLocation, RoomBooking, SimpleCourse, SimpleUser, StudyMatch, StudyPlan
+)
+
+app = create_app('testing')
+
+
+class BootstrapTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.drop_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_first_run_seeds_and_records_versions(self):
+        """Test that the first bootstrap creates and seeds the database."""
+        self.assertTrue(init_db())
+        self.assertEqual(get_app_metadata('schema_version'), str(SCHEMA_VERSION))
+        self.assertEqual(get_app_metadata('seed_fingerprint'), seed_fingerprint())
+        self.assertEqual(PurdueLocation.query.count(), len(purdue.PURDUE_DINING_HALLS) + len(purdue.PURDUE_STUDY_LOCATIONS))
+        self.assertGreater(SimpleCourse.query.count(), 0)
+        # Demo users come with enrollments but no activity
+        self.assertEqual(SimpleUser.query.filter_by(is_demo_user=True).count(), 20)
+        self.assertEqual((RoomBooking.query.count(), Message.query.count(), StudyPlan.query.count()), (0, 0, 0))
+
+    def test_second_run_is_a_no_op(self):
+        """Test that bootstrapping again keeps existing data untouched."""
+        init_db()
+        user = SimpleUser(name='Real Student', email='student@purdue.edu')
+        db.session.add(user)
+        db.session.commit()
+        counts = (SimpleCourse.query.count(), PurdueLocation.query.count(), SimpleUser.query.count())
+
+        self.assertFalse(init_db())
+        self.assertEqual(counts, (SimpleCourse.query.count(), PurdueLocation.query.count(), SimpleUser.query.count()))
+        self.assertIsNotNone(SimpleUser.query.filter_by(email='student@purdue.edu').first())
+
+    def test_upgrade_from_version_4_rebuilds_matches(self):
+        """Test that matches are rebuilt after the migration adding the columns they read."""
+        init_db()
+        StudyMatch.query.delete()
+        db.session.execute(db.text('DROP INDEX ix_simple_user_profile_version'))
+        db.session.execute(db.text('ALTER TABLE simple_user DROP COLUMN profile_version'))
+        set_app_metadata('schema_version', '4')
+        db.session.commit()
+
+        self.assertFalse(init_db())
+        self.assertEqual(get_app_metadata('schema_version'), str(SCHEMA_VERSION))
+        self.assertIn('profile_version', {c['name'] for c in db.inspect(db.engine).get_columns('simple_user')})
+        self.assertGreater(StudyMatch.query.count(), 0)
+
+    def test_index_does_not_touch_database(self):
+        """Test that the landing page renders without bootstrapping."""
+        response = app.test_client().get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(db.inspect(db.engine).has_table('app_metadata'))
+
+
+if __name__ == '__main__':
+    unittest.main()
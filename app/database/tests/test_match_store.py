@@ -0,0 +1,153 @@
+"""Tests for the materialized study match table."""
+import random
+import unittest
+
+from app import create_app
+from app.courses import course_catalog
+from app.dashboard.match_engine import MatchIndex
+from app.dashboard import matching
+from app.dashboard.matching import (
+    find_study_matches, get_match_index, invalidate_match_index, mark_profile_changed, rebuild_all_matches,
+    update_matches_for_user
+)
+from app.dashboard.minhash import MinHashLSH
+from app.database import db
+from app.database.match import REFRESH_CHUNK, match_rows
+from app.database.models import SimpleCourse, SimpleUser, StudyMatch, UserCourseEnrollment
+
+app = create_app('testing')
+
+
+class MatchStoreTestCase(unittest.TestCase):
+    lsh_min_users = app.config['MATCH_LSH_MIN_USERS']
+
+    def setUp(self):
+        self.saved_min_users = app.config['MATCH_LSH_MIN_USERS']
+        app.config['MATCH_LSH_MIN_USERS'] = self.lsh_min_users
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        course_catalog.invalidate()
+
+        self.rng = random.Random(7)
+        for course_id in range(1, 13):
+            db.session.add(SimpleCourse(id=course_id, course_number=f'CS{course_id}', course_name=f'Course {course_id}', course_subject='CS'))
+        for user_id in range(1, 61):
+            db.session.add(SimpleUser(id=user_id, name=f'Student {user_id}', email=f's{user_id}@purdue.edu', **self.random_profile()))
+            for course_id in self.random_courses():
+                db.session.add(UserCourseEnrollment(user_id=user_id, course_id=course_id))
+        db.session.commit()
+        rebuild_all_matches()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        app.config['MATCH_LSH_MIN_USERS'] = self.saved_min_users
+
+    def random_profile(self):
+        return {
+            'preferences': self.rng.choice(['quiet', 'collaborative']),
+            'major': self.rng.choice(['Computer Science', 'Mathematics', 'Physics']),
+            'preferred_location': self.rng.choice(['Hicks Undergraduate Library', 'WALC']),
+            'profile_completed': True,
+        }
+
+    def random_courses(self):
+        return self.rng.sample(range(1, 13), self.rng.randint(1, 4))
+
+    def stored_table(self):
+        return sorted((m.user_id, m.partner_id, round(m.compatibility, 6)) for m in StudyMatch.query.all())
+
+    def expected_table(self):
+        users = db.session.query(SimpleUser.id, SimpleUser.preferences, SimpleUser.major, SimpleUser.preferred_location).all()
+        enrollments = db.session.query(UserCourseEnrollment.user_id, UserCourseEnrollment.course_id).all()
+        index = MatchIndex(users, enrollments, lsh=self.make_lsh())
+        return sorted((r['user_id'], r['partner_id'], round(r['compatibility'], 6))
+                      for user_id in index.profiles for r in match_rows(index, user_id))
+
+    def make_lsh(self):
+        return None
+
+    def test_rebuild_matches_full_computation(self):
+        self.assertEqual(self.stored_table(), self.expected_table())
+
+    def test_incremental_updates_match_full_rebuild(self):
+        """Test that refreshing only affected users keeps the table exact."""
+        for _ in range(25):
+            self.assertLess(len(self.edit_profile(self.rng.randint(1, 60))), 60)
+        self.assertEqual(self.stored_table(), self.expected_table())
+
+    def test_index_catches_up_on_other_workers_edits(self):
+        """Test that a worker's index applies profile edits committed through another worker's index."""
+        stale = get_match_index()
+        for user_id in (2, 3, 4):
+            invalidate_match_index()  # another worker, with an index of its own
+            self.edit_profile(user_id)
+        matching._match_index = stale
+        self.edit_profile(5)
+        for user_id in (2, 3, 4):
+            enrolled = {c for (c,) in db.session.query(UserCourseEnrollment.course_id).filter_by(user_id=user_id)}
+            self.assertEqual(stale.courses_for(user_id), enrolled)
+        self.assertEqual(self.stored_table(), self.expected_table())
+
+    def edit_profile(self, user_id):
+        user = db.session.get(SimpleUser, user_id)
+        old_course_ids = [c for (c,) in db.session.query(UserCourseEnrollment.course_id).filter_by(user_id=user.id)]
+        for key, value in self.random_profile().items():
+            setattr(user, key, value)
+        mark_profile_changed(user)
+        UserCourseEnrollment.query.filter_by(user_id=user.id).delete()
+        for course_id in self.random_courses():
+            db.session.add(UserCourseEnrollment(user_id=user.id, course_id=course_id))
+        affected = update_matches_for_user(user, old_course_ids)
+        db.session.commit()
+        return affected
+
+    def test_dashboard_reads_stored_matches(self):
+        """Test that find_study_matches returns the stored partners."""
+        stored = StudyMatch.query.filter_by(user_id=1).order_by(
+            StudyMatch.compatibility.desc(), StudyMatch.partner_id
+        ).limit(8).all()
+        matches = find_study_matches(1)
+        by_partner = {m['user'].id: m for m in matches}
+        for row in stored:
+            self.assertEqual(by_partner[row.partner_id]['compatibility'], row.compatibility)
+            self.assertTrue(all(name.startswith('Course') for name in by_partner[row.partner_id]['common_courses']))
+        self.assertLessEqual(len(matches), 8)
+
+    def test_profile_edit_runs_constant_statements(self):
+        """Test that setup_profile stays within its budget with more than a chunk of classmates."""
+        db.session.execute(db.insert(SimpleUser), [
+            {'id': user_id, 'name': f'Student {user_id}', 'email': f's{user_id}@purdue.edu', **self.random_profile()}
+            for user_id in range(100, 100 + REFRESH_CHUNK + 50)
+        ])
+        db.session.execute(db.insert(UserCourseEnrollment), [
+            {'user_id': user_id, 'course_id': 1} for user_id in range(100, 100 + REFRESH_CHUNK + 50)
+        ])
+        db.session.commit()
+        rebuild_all_matches()
+
+        app.config['QUERY_STATS_HEADERS'] = True
+        self.addCleanup(app.config.update, QUERY_STATS_HEADERS=False)
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student 1'}
+        counts = []
+        for major, courses in (('Physics', ['1', '2']), ('Mathematics', ['3']), ('Physics', ['1', '4', '5'])):
+            response = client.post('/setup_profile', data={'major': major, 'preferences': 'quiet',
+                                                          'preferred_location': 'WALC', 'courses': courses})
+            self.assertEqual(response.status_code, 302)
+            counts.append(int(response.headers['X-DB-Query-Count']))
+        self.assertEqual(len(set(counts)), 1, counts)
+        self.assertEqual(self.stored_table(), self.expected_table())
+
+class LSHMatchStoreTestCase(MatchStoreTestCase):
+    """The same guarantees with MinHash/LSH candidate generation switched on"""
+    lsh_min_users = 0
+
+    def make_lsh(self):
+        return MinHashLSH(bands=app.config['MATCH_LSH_BANDS'], rows=app.config['MATCH_LSH_ROWS'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Tests for paginated inbox and outbox queries."""
+import unittest
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.bootstrap import migrate_schema, set_app_metadata
+from app.database import db
+from app.database.messages import (
+    get_message_page, get_unread_count, post_message, mark_conversation_read, mark_all_conversations_read
+)
+from app.database.models import Conversation, Message, SimpleUser
+
+app = create_app('testing')
+
+
+class MessagePagesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        for i in range(1, 4):
+            db.session.add(SimpleUser(id=i, name=f'Student {i}', email=f'student{i}@purdue.edu'))
+        base = datetime(2026, 10, 1, 12, 0)
+        for i in range(60):
+            # Pairs of messages share a timestamp to exercise the id tie-break
+            db.session.add(Message(sender_id=2 + i % 2, recipient_id=1, subject=f'Hi {i}',
+                                   content='Study?', timestamp=base + timedelta(minutes=i // 2)))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_pages_cover_inbox_once_in_order(self):
+        """Test that walking the cursors returns every message exactly once, newest first."""
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = get_message_page(1, 'inbox', cursor, limit=25)
+            seen.extend(page)
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 60)
+        self.assertEqual(len({m.id for m in seen}), 60)
+        keys = [(m.timestamp, m.id) for m in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_other_party_is_attached(self):
+        """Test that senders come back with the messages."""
+        page, _ = get_message_page(1, 'inbox', limit=5)
+        self.assertTrue(all(m.sender.name.startswith('Student') for m in page))
+        page, cursor = get_message_page(2, 'outbox', limit=30)
+        self.assertEqual(len(page), 30)
+        self.assertIsNone(cursor)
+        self.assertTrue(all(m.recipient.id == 1 for m in page))
+
+    def test_bad_cursor_starts_from_newest(self):
+        page, _ = get_message_page(1, 'inbox', 'not-a-cursor', limit=1)
+        self.assertEqual(page[0].subject, 'Hi 59')
+
+    def test_messages_page_renders(self):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1}
+        response = client.get('/messages')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Older messages', response.data)
+
+
+class ConversationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_messages_between_a_pair_share_a_conversation(self):
+        """Test that both directions land in one thread."""
+        first = post_message(1, 2, 'Hi', 'CS251 tonight?')
+        second = post_message(2, 1, 'Re: Hi', 'Sure')
+        post_message(1, 3, 'Hi', 'MA161?')
+        db.session.commit()
+        self.assertEqual(first.conversation_id, second.conversation_id)
+        self.assertEqual(Conversation.query.count(), 2)
+
+    def test_unread_counter_is_maintained(self):
+        """Test the badge count without counting message rows."""
+        for _ in range(3):
+            post_message(2, 1, 'Hi', 'Study?')
+        post_message(3, 1, 'Hi', 'Study?')
+        db.session.commit()
+        self.assertEqual(get_unread_count(1), 4)
+        self.assertEqual(get_unread_count(2), 0)
+
+        conversation = Conversation.query.filter_by(user_low_id=1, user_high_id=2).one()
+        self.assertTrue(mark_conversation_read(1, conversation.id))
+        db.session.commit()
+        self.assertEqual(get_unread_count(1), 1)
+
+        page, _ = get_message_page(1, 'inbox')
+        self.assertEqual([m.unread for m in page], [True, False, False, False])
+
+        mark_all_conversations_read(1)
+        db.session.commit()
+        self.assertEqual(get_unread_count(1), 0)
+        page, _ = get_message_page(1, 'inbox')
+        self.assertFalse(any(m.unread for m in page))
+
+        post_message(2, 1, 'Hi', 'Still on?')
+        db.session.commit()
+        self.assertEqual(get_unread_count(1), 1)
+
+    def test_migration_backfills_legacy_messages(self):
+        """Test that upgrading turns is_read flags into watermarks and counters."""
+        db.session.add_all([
+            Message(sender_id=2, recipient_id=1, subject='a', content='a', is_read=True),
+            Message(sender_id=1, recipient_id=2, subject='b', content='b', is_read=False),
+            Message(sender_id=2, recipient_id=1, subject='c', content='c', is_read=False),
+            Message(sender_id=3, recipient_id=1, subject='d', content='d', is_read=False),
+        ])
+        set_app_metadata('schema_version', '3')
+        db.session.commit()
+
+        self.assertTrue(migrate_schema())
+        self.assertEqual(Conversation.query.count(), 2)
+        self.assertEqual(Message.query.filter(Message.conversation_id.is_(None)).count(), 0)
+        self.assertEqual(get_unread_count(1), 2)
+        self.assertEqual(get_unread_count(2), 1)
+        page, _ = get_message_page(1, 'inbox')
+        self.assertEqual(sorted(m.subject for m in page if m.unread), ['c', 'd'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Tests that every route's lookups are served by an index."""
+import re
+import unittest
+
+from sqlalchemy import event
+
+from app import create_app
+from app.bootstrap import SCHEMA_VERSION, get_app_metadata, generate_users, migrate_schema, seed_locations, set_app_metadata
+from app.courses import course_catalog
+from app.dashboard.matching import invalidate_match_index, rebuild_all_matches
+from app.database import db
+from app.database.models import SimpleCourse, SimpleUser, UserCourseEnrollment
+from app.rooms.routes import invalidate_room_availability
+
+app = create_app('testing')
+
+LIBRARY = 'Hicks Undergraduate Library'
+PROFILE = {'major': 'Computer Science', 'year': 'Junior', 'preferences': 'quiet',
+           'preferred_location': LIBRARY, 'gpa': '3.5', 'bio': 'Testing', 'courses': ['1', '2', '2']}
+ROUTES = [
+    ('get', '/dashboard', {}),
+    ('get', '/api/dashboard', {}),
+    ('get', '/setup_profile', {}),
+    ('post', '/setup_profile', {'data': PROFILE}),
+    ('get', '/api/courses/search?q=cs', {}),
+    ('get', '/api/courses/1', {}),
+    ('get', '/get_user_profile/2', {}),
+    ('post', '/send_message', {'json': {'recipient_id': 2, 'content': 'Study at Hicks?'}}),
+    ('get', '/messages', {}),
+    ('post', '/conversations/1/read', {}),
+    ('post', '/create_study_plan', {'json': {'course_id': 1, 'exam_name': 'Midterm', 'exam_date': '2031-03-01'}}),
+    ('get', '/study_planner', {}),
+    ('post', '/log_study_hours', {'json': {'plan_id': 1, 'hours': 2}}),
+    ('post', '/book_room', {'json': {'location_name': LIBRARY, 'room_number': 'Room 001', 'booking_date': '2031-03-01',
+                                     'start_time': '10:00', 'end_time': '11:00', 'group_size': 2}}),
+    ('post', '/book_room/recurring', {'json': {'location_name': LIBRARY, 'room_number': 'Room 002',
+                                               'booking_date': '2031-03-01', 'repeat': 'weekly', 'count': 3,
+                                               'start_time': '10:00', 'end_time': '11:00', 'group_size': 2}}),
+    ('get', '/find_study_rooms', {}),
+    ('get', '/api/rooms/free?date=2031-03-01&start=10:30&end=12:00&group_size=6', {}),
+    ('get', '/my_bookings', {}),
+    ('post', '/cancel_booking/1', {}),
+]
+
+
+class QueryPlanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        seed_locations()
+        db.session.execute(db.insert(SimpleCourse), [
+            {'course_number': f'{100 + i}', 'course_name': f'Course {i}', 'course_subject': 'CS'} for i in range(20)
+        ])
+        db.session.commit()
+        generate_users(50, seed=3, bookings_per_user=1.0, plans_per_user=1.0)
+        # A student with no stored matches falls back to same-major partners
+        db.session.add(SimpleUser(id=1000, name='New Student', email='new@purdue.edu', major='Computer Science',
+                                  profile_completed=True))
+        db.session.commit()
+        rebuild_all_matches()
+        course_catalog.invalidate()
+        invalidate_room_availability()
+
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self.record)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self.record)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        invalidate_match_index()
+        course_catalog.invalidate()
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.match(r'\s*(SELECT|UPDATE|DELETE)\b.*\bWHERE\b', statement, re.S):
+            self.statements.append((statement, parameters))
+
+    def full_scans(self, statement, parameters):
+        plan = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        # Constant rows and subqueries are not tables; FTS5 lookups show up as virtual table scans
+        return [row[-1] for row in plan if row[-1].startswith('SCAN ')
+                and not re.match(r'SCAN (CONSTANT ROW|\(subquery|\w+ VIRTUAL TABLE)', row[-1])]
+
+    def test_route_lookups_use_indexes(self):
+        """Test that no filtered query of any route scans a whole table."""
+        for user_id in (1, 1000):
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['user'] = {'id': user_id, 'name': 'Student'}
+            for method, path, kwargs in ROUTES:
+                del self.statements[:]
+                response = getattr(client, method)(path, **kwargs)
+                self.assertLess(response.status_code, 400, path)
+                scans = [(self.full_scans(statement, parameters), ' '.join(statement.split()))
+                         for statement, parameters in self.statements]
+                with self.subTest(user_id=user_id, path=path):
+                    self.assertEqual([scan for scan in scans if scan[0]], [])
+
+    def test_enrollments_are_unique(self):
+        db.session.add(UserCourseEnrollment(user_id=1, course_id=1))
+        db.session.add(UserCourseEnrollment(user_id=1, course_id=1))
+        with self.assertRaises(Exception):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_migration_drops_duplicate_enrollments(self):
+        """Test that upgrading an existing database dedupes enrollments before indexing them."""
+        db.session.execute(db.text('DROP INDEX uq_user_course_enrollment'))
+        db.session.execute(db.text('DROP INDEX ix_study_plan_user_exam_date'))
+        db.session.execute(db.text('INSERT INTO user_course_enrollment (user_id, course_id) '
+                                   'SELECT user_id, course_id FROM user_course_enrollment'))
+        set_app_metadata('schema_version', '6')
+        db.session.commit()
+        pairs = db.session.query(UserCourseEnrollment.user_id, UserCourseEnrollment.course_id).distinct().count()
+
+        self.assertTrue(migrate_schema())
+        self.assertEqual(get_app_metadata('schema_version'), str(SCHEMA_VERSION))
+        self.assertEqual(UserCourseEnrollment.query.count(), pairs)
+        indexes = {index['name'] for index in db.inspect(db.engine).get_indexes('user_course_enrollment')}
+        self.assertIn('uq_user_course_enrollment', indexes)
+        self.assertIn('ix_study_plan_user_exam_date',
+                      {index['name'] for index in db.inspect(db.engine).get_indexes('study_plan')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for the SQLite engine profiles and reader/writer routing."""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+
+from app import create_app
+from app.bootstrap import SCHEMA_VERSION, get_app_metadata, migrate_schema, set_app_metadata
+from app.database import db
+from app.database.models import StudyHoursLog, StudyPlan, StudyPlanHours
+from app.database.sqlite import READER_EXTENSION, dispose_engines
+
+
+class SQLiteProfileTestCase(unittest.TestCase):
+    def make_app(self, **config):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        app = create_app('testing', dict(config, SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp, 'app.db')}"))
+        self.addCleanup(dispose_engines, app, db)
+        with app.app_context():
+            db.create_all()
+        return app
+
+    def pragma(self, connection, name):
+        return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+    def test_tuned_profile_sets_pragmas(self):
+        app = self.make_app()
+        with app.app_context():
+            with db.engine.connect() as conn:
+                self.assertEqual(self.pragma(conn, 'journal_mode'), 'wal')
+                self.assertEqual(self.pragma(conn, 'synchronous'), 1)  # NORMAL
+                self.assertEqual(self.pragma(conn, 'busy_timeout'), 5000)
+                self.assertEqual(self.pragma(conn, 'query_only'), 0)
+            self.assertEqual(db.engine.pool.size(), 1)
+        with app.extensions[READER_EXTENSION].connect() as conn:
+            self.assertEqual(self.pragma(conn, 'query_only'), 1)
+
+    def test_off_profile_keeps_driver_defaults(self):
+        app = self.make_app(SQLITE_PROFILE='off')
+        self.assertNotIn(READER_EXTENSION, app.extensions)
+        with app.app_context(), db.engine.connect() as conn:
+            self.assertEqual(self.pragma(conn, 'journal_mode'), 'delete')
+
+    def test_upgrade_runs_on_the_single_writer(self):
+        """Test that migrations adding columns don't wait for a second writer connection."""
+        app = self.make_app(SQLALCHEMY_ENGINE_OPTIONS={'pool_timeout': 1})
+        with app.app_context():
+            # A database at schema version 3, before messages had conversations
+            db.session.execute(db.text('DROP INDEX ix_message_conversation'))
+            db.session.execute(db.text('ALTER TABLE message DROP COLUMN conversation_id'))
+            db.session.execute(db.text('DROP INDEX ix_simple_user_profile_version'))
+            db.session.execute(db.text('ALTER TABLE simple_user DROP COLUMN profile_version'))
+            set_app_metadata('schema_version', '3')
+            db.session.commit()
+
+            self.assertTrue(migrate_schema())
+            self.assertEqual(get_app_metadata('schema_version'), str(SCHEMA_VERSION))
+            self.assertIn('conversation_id', {c['name'] for c in db.inspect(db.session.connection()).get_columns('message')})
+
+    def test_reads_of_get_requests_use_the_reader(self):
+        app = self.make_app()
+        reader = app.extensions[READER_EXTENSION]
+        query = db.select(StudyPlan)
+        with app.test_request_context('/study_planner'):
+            self.assertIs(db.session.get_bind(clause=query), reader)
+            db.session.add(StudyPlan(user_id=1, course_id=1, exam_name='Midterm', exam_date=date(2031, 3, 1)))
+            db.session.flush()
+            # After a write the transaction reads its own changes from the writer
+            self.assertIs(db.session.get_bind(clause=query), db.engine)
+            db.session.commit()
+            self.assertIs(db.session.get_bind(clause=query), reader)
+            self.assertEqual(db.session.scalars(query).one().exam_name, 'Midterm')
+        with app.test_request_context('/log_study_hours', method='POST'):
+            self.assertIs(db.session.get_bind(clause=query), db.engine)
+
+    def test_concurrent_writers_neither_fail_nor_lose_updates(self):
+        app = self.make_app()
+        with app.app_context():
+            db.session.add(StudyPlan(user_id=1, course_id=1, exam_name='Final', exam_date=date(2031, 5, 1)))
+            db.session.commit()
+        errors = []
+
+        def log_hours():
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['user'] = {'id': 1}
+            for _ in range(10):
+                body = client.post('/log_study_hours', json={'plan_id': 1, 'hours': 1}).get_json()
+                if not body['success']:
+                    errors.append(body['error'])
+
+        threads = [threading.Thread(target=log_hours) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        with app.app_context():
+            self.assertEqual(db.session.get(StudyPlanHours, 1).hours, 80)
+            self.assertEqual(StudyHoursLog.query.count(), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,4 @@
-from . import db
+from . import legacy_db as db
 from datetime import datetime
 
 class User(db.Model):
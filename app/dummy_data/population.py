@@ -0,0 +1,335 @@
+""" Seeded synthetic population for demos, load tests and benchmarks """
+# population.py
+# Generates users, enrollments, conversations, room bookings, study plans and
+# their logged hours from one random.Random(seed), so the same seed on the
+# same starting database always produces the same rows. Rows are written with
+# executemany inserts in chunks of users, which keeps memory flat from a few
+# demo users up to ~1M.
+#
+# Enrollments follow a Zipf-like curve over the catalog: low-numbered intro
+# courses are the most popular and upper-level courses form a long tail.
+
+import random
+import re
+import time
+from bisect import bisect
+from datetime import datetime, time as dtime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import func, insert, select
+
+from app.dummy_data.dummy_data import DEMO_NAMES
+
+CHUNK_USERS = 10000
+BATCH_SIZE = 5000
+ZIPF_EXPONENT = 1.1
+MAJOR_COURSE_SHARE = 0.5  # fraction of a user's courses drawn from their major's subjects
+
+YEARS = ['Freshman', 'Sophomore', 'Junior', 'Senior']
+PREFERENCES = ['quiet', 'collaborative', 'discussion']
+GRADE_GOALS = ['A', 'A-', 'B+', 'B']
+COURSE_LOADS = ([3, 4, 5, 6], [2, 4, 3, 1])  # courses per user and their weights
+FIRST_NAMES = sorted({name.split()[0] for name in DEMO_NAMES})
+LAST_NAMES = sorted({name.split()[-1] for name in DEMO_NAMES})
+MESSAGE_SUBJECTS = ['Study session?', 'Homework question', 'Exam prep', 'Notes from lecture', 'Group project']
+MESSAGE_BODIES = [
+    'Want to meet at the library before the exam?',
+    'Did you get the last problem on the homework?',
+    'I can share my notes from today if you missed it.',
+    'Are you free this weekend to go over the practice exam?',
+]
+BOOKING_PURPOSES = ['Group study', 'Exam review', 'Project meeting', 'Quiet study']
+DAY_START, DAY_SLOTS = 8, 28  # bookable half-hours from 8:00 to 22:00
+
+# Subject abbreviations that count as "in major" for enrollment sampling
+MAJOR_SUBJECTS = {
+    'Computer Science': ['CS'], 'Electrical Engineering': ['ECE'], 'Mechanical Engineering': ['ME'],
+    'Civil Engineering': ['CE'], 'Chemical Engineering': ['CHE'], 'Aerospace Engineering': ['AAE'],
+    'Industrial Engineering': ['IE'], 'Biomedical Engineering': ['BME'], 'Mathematics': ['MA'],
+    'Statistics': ['STAT'], 'Physics': ['PHYS'], 'Chemistry': ['CHM'], 'Biology': ['BIOL'],
+    'Biochemistry': ['BCHM'], 'Management': ['MGMT'], 'Economics': ['ECON'], 'Accounting': ['MGMT'],
+    'Finance': ['MGMT'], 'Marketing': ['MGMT'], 'Supply Chain Management': ['MGMT'],
+    'Psychology': ['PSY'], 'Communication': ['COM'], 'English': ['ENGL'], 'History': ['HIST'],
+    'Political Science': ['POL'], 'Sociology': ['SOC'],
+}
+
+
+class PopulationStats:
+    def __init__(self):
+        self.counts = {}
+        self.seconds = 0.0
+
+    def add(self, table, rows):
+        self.counts[table] = self.counts.get(table, 0) + rows
+
+    def __str__(self):
+        rows = ', '.join(f"{count} {table}" for table, count in self.counts.items())
+        return f"{rows} in {self.seconds:.2f}s"
+
+
+def course_level(course_number):
+    """Numeric level of a course number ('10100' -> 10100, 'CS180' -> 180)"""
+    match = re.search(r'\d+', course_number or '')
+    return int(match.group()) if match else 99999
+
+
+class CourseSampler:
+    """Draws courses with Zipf popularity, optionally restricted to some subjects"""
+
+    def __init__(self, courses, exponent=ZIPF_EXPONENT):
+        # courses: iterable of (id, subject, course_number)
+        ranked = sorted(courses, key=lambda c: (course_level(c[2]), c[0]))
+        self.ids = [course_id for course_id, _, _ in ranked]
+        self.weights = [1 / (rank + 1) ** exponent for rank in range(len(ranked))]
+        self.cumulative = list(accumulate(self.weights))
+        self.by_subject = {}
+        for (course_id, subject, _), weight in zip(ranked, self.weights):
+            ids, weights = self.by_subject.setdefault(subject, ([], []))
+            ids.append(course_id)
+            weights.append(weight)
+        self.subject_cumulative = {subject: (ids, list(accumulate(weights)))
+                                   for subject, (ids, weights) in self.by_subject.items()}
+
+    @staticmethod
+    def _draw(rng, ids, cumulative):
+        return ids[bisect(cumulative, rng.random() * cumulative[-1])]
+
+    def sample(self, rng, count, subjects=()):
+        """Up to count distinct course ids, about half from subjects when given"""
+        pools = [self.subject_cumulative[s] for s in subjects if s in self.subject_cumulative]
+        chosen = []
+        for _ in range(count * 4):  # bounded retries for duplicates
+            if len(chosen) >= min(count, len(self.ids)):
+                break
+            if pools and rng.random() < MAJOR_COURSE_SHARE:
+                course_id = self._draw(rng, *rng.choice(pools))
+            else:
+                course_id = self._draw(rng, self.ids, self.cumulative)
+            if course_id not in chosen:
+                chosen.append(course_id)
+        return chosen
+
+
+def _next_id(db, table):
+    return (db.session.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _insert(db, table, rows, stats):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(table), rows[start:start + BATCH_SIZE])
+    stats.add(table.name, len(rows))
+
+
+def generate_population(db, users, seed=0, majors=(), rooms=(), locations=(), demo=False,
+                        messages_per_user=2.0, bookings_per_user=0.3, plans_per_user=0.5,
+                        now=None, chunk_users=CHUNK_USERS):
+    """Insert a synthetic population of users and their activity.
+
+    majors     major names to assign
+    rooms      (location_name, room_number) pairs that can be booked
+    locations  preferred study location names
+    demo       mark the users as demo users
+
+    Courses must already be seeded. Each chunk of users is committed
+    separately; study matches are not computed here.
+    """
+    tables = db.metadata.tables
+    user_table, enrollment_table = tables['simple_user'], tables['user_course_enrollment']
+    message_table, conversation_table = tables['message'], tables['conversation']
+    participant_table, unread_table = tables['conversation_participant'], tables['user_unread_count']
+    booking_table, plan_table = tables['room_booking'], tables['study_plan']
+    hours_table = tables['study_hours_log']
+
+    started = time.perf_counter()
+    stats = PopulationStats()
+    rng = random.Random(seed)
+    now = now or datetime(2025, 1, 15, 12, 0)
+    majors = list(majors) or ['Undeclared']
+    locations = list(locations) or [None]
+    sampler = CourseSampler(db.session.execute(select(
+        tables['simple_course'].c.id, tables['simple_course'].c.course_subject, tables['simple_course'].c.course_number
+    )).all())
+
+    next_user = _next_id(db, user_table)
+    next_enrollment = _next_id(db, enrollment_table)
+    next_message = _next_id(db, message_table)
+    next_conversation = _next_id(db, conversation_table)
+    next_booking = _next_id(db, booking_table)
+    next_plan = _next_id(db, plan_table)
+
+    # Room occupancy as a bitmask of half-hour slots per (room, day), shared
+    # across chunks so bookings never overlap
+    occupancy = {}
+    booking_days = [now.date() + timedelta(days=offset) for offset in range(-7, 14)]
+    existing = db.session.execute(select(
+        booking_table.c.location_name, booking_table.c.room_number, booking_table.c.booking_date,
+        booking_table.c.start_time, booking_table.c.end_time
+    ).where(booking_table.c.booking_date.between(booking_days[0], booking_days[-1]),
+            booking_table.c.status == 'active'))
+    for location_name, room_number, day, start_time, end_time in existing:
+        first = max((start_time.hour * 60 + start_time.minute - DAY_START * 60) // 30, 0)
+        last = min(-(-(end_time.hour * 60 + end_time.minute - DAY_START * 60) // 30), DAY_SLOTS)
+        if last > first:
+            key = (location_name, room_number, day)
+            occupancy[key] = occupancy.get(key, 0) | (((1 << (last - first)) - 1) << first)
+
+    for chunk_start in range(0, users, chunk_users):
+        chunk_size = min(chunk_users, users - chunk_start)
+        user_ids = list(range(next_user, next_user + chunk_size))
+        next_user += chunk_size
+
+        user_rows, enrollment_rows, courses_of = [], [], {}
+        postings = {}
+        for user_id in user_ids:
+            major = rng.choice(majors)
+            user_rows.append({
+                'id': user_id,
+                'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                'email': f"{'demo' if demo else 'user'}{user_id}@purdue.edu",
+                'major': major,
+                'year': rng.choice(YEARS),
+                'preferences': rng.choice(PREFERENCES),
+                'preferred_location': rng.choice(locations),
+                'gpa': round(rng.uniform(2.5, 4.0), 2),
+                'bio': f"Purdue Boilermaker studying {major}. Looking for study partners!",
+                'profile_completed': True,
+                'is_demo_user': demo,
+                'created_at': now - timedelta(days=rng.randint(0, 365)),
+            })
+            course_ids = sampler.sample(rng, rng.choices(*COURSE_LOADS)[0], MAJOR_SUBJECTS.get(major, ()))
+            courses_of[user_id] = course_ids
+            for course_id in course_ids:
+                postings.setdefault(course_id, []).append(user_id)
+                enrollment_rows.append({
+                    'id': next_enrollment,
+                    'user_id': user_id,
+                    'course_id': course_id,
+                    'grade_goal': rng.choice(GRADE_GOALS),
+                })
+                next_enrollment += 1
+
+        # Messages mostly go to classmates from the same chunk
+        conversations = {}
+        message_rows = []
+        message_count = int(chunk_size * messages_per_user)
+        for i in range(message_count if chunk_size > 1 else 0):
+            sender_id = rng.choice(user_ids)
+            classmates = postings.get(rng.choice(courses_of[sender_id]), ()) if courses_of[sender_id] else ()
+            recipient_id = rng.choice(classmates) if len(classmates) > 1 else rng.choice(user_ids)
+            if recipient_id == sender_id:
+                continue
+            pair = (min(sender_id, recipient_id), max(sender_id, recipient_id))
+            if pair not in conversations:
+                conversations[pair] = {'id': next_conversation, 'messages': []}
+                next_conversation += 1
+            conversation = conversations[pair]
+            message = {
+                'id': next_message,
+                'sender_id': sender_id,
+                'recipient_id': recipient_id,
+                'subject': rng.choice(MESSAGE_SUBJECTS),
+                'content': rng.choice(MESSAGE_BODIES),
+                'timestamp': now - timedelta(minutes=(message_count - i) * 7),
+                'is_read': False,
+                'message_type': 'general',
+                'conversation_id': conversation['id'],
+            }
+            next_message += 1
+            conversation['messages'].append(message)
+            message_rows.append(message)
+
+        conversation_rows, participant_rows, unread = [], [], {}
+        for (low_id, high_id), conversation in conversations.items():
+            messages = conversation['messages']
+            conversation_rows.append({
+                'id': conversation['id'],
+                'user_low_id': low_id,
+                'user_high_id': high_id,
+                'last_message_id': messages[-1]['id'],
+                'last_message_at': messages[-1]['timestamp'],
+            })
+            for user_id in (low_id, high_id):
+                # Most users have read everything; the rest stopped somewhere
+                watermark = messages[-1]['id'] if rng.random() < 0.7 else rng.choice(messages)['id'] - 1
+                unread_count = sum(1 for m in messages if m['recipient_id'] == user_id and m['id'] > watermark)
+                for m in messages:
+                    if m['recipient_id'] == user_id and m['id'] <= watermark:
+                        m['is_read'] = True
+                participant_rows.append({
+                    'conversation_id': conversation['id'],
+                    'user_id': user_id,
+                    'last_read_message_id': watermark,
+                    'unread_count': unread_count,
+                })
+                if unread_count:
+                    unread[user_id] = unread.get(user_id, 0) + unread_count
+        unread_rows = [{'user_id': user_id, 'unread_count': count} for user_id, count in unread.items()]
+
+        booking_rows = []
+        for _ in range(int(chunk_size * bookings_per_user) if rooms else 0):
+            location_name, room_number = rng.choice(rooms)
+            day = rng.choice(booking_days)
+            length = rng.randint(1, 4)
+            start = rng.randrange(0, DAY_SLOTS - length + 1)
+            mask = ((1 << length) - 1) << start
+            key = (location_name, room_number, day)
+            if occupancy.get(key, 0) & mask:
+                continue  # slot taken; skipping keeps the output deterministic
+            occupancy[key] = occupancy.get(key, 0) | mask
+            start_minutes = DAY_START * 60 + start * 30
+            end_minutes = start_minutes + length * 30
+            booking_rows.append({
+                'id': next_booking,
+                'user_id': rng.choice(user_ids),
+                'location_name': location_name,
+                'room_number': room_number,
+                'booking_date': day,
+                'start_time': dtime(start_minutes // 60, start_minutes % 60),
+                'end_time': dtime(end_minutes // 60, end_minutes % 60),
+                'purpose': rng.choice(BOOKING_PURPOSES),
+                'group_size': rng.randint(1, 6),
+                'status': 'active' if rng.random() < 0.9 else 'cancelled',
+                'created_at': now,
+            })
+            next_booking += 1
+
+        plan_rows = []
+        hours_rows = []
+        for user_id in user_ids:
+            if not courses_of[user_id] or rng.random() >= plans_per_user:
+                continue
+            for course_id in rng.sample(courses_of[user_id], min(rng.randint(1, 2), len(courses_of[user_id]))):
+                prep_hours = rng.randint(10, 40)
+                plan_rows.append({
+                    'id': next_plan,
+                    'user_id': user_id,
+                    'course_id': course_id,
+                    'exam_name': rng.choice(['Midterm 1', 'Midterm 2', 'Final Exam']),
+                    'exam_date': now + timedelta(days=rng.randint(5, 60)),
+                    'prep_hours_needed': prep_hours,
+                    'created_at': now,
+                })
+                hours_done = rng.randint(0, prep_hours)
+                if hours_done:
+                    hours_rows.append({
+                        'plan_id': next_plan,
+                        'user_id': user_id,
+                        'course_id': course_id,
+                        'hours': hours_done,
+                        'logged_at': now,
+                    })
+                next_plan += 1
+
+        _insert(db, user_table, user_rows, stats)
+        _insert(db, enrollment_table, enrollment_rows, stats)
+        _insert(db, conversation_table, conversation_rows, stats)
+        _insert(db, message_table, message_rows, stats)
+        _insert(db, participant_table, participant_rows, stats)
+        _insert(db, unread_table, unread_rows, stats)
+        _insert(db, booking_table, booking_rows, stats)
+        _insert(db, plan_table, plan_rows, stats)
+        _insert(db, hours_table, hours_rows, stats)
+        db.session.commit()
+
+    stats.seconds = time.perf_counter() - started
+    return stats
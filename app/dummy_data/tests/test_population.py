@@ -0,0 +1,83 @@
+"""Tests for the seeded synthetic population generator."""
+import unittest
+from collections import Counter
+
+from app import create_app
+from app.dummy_data.population import generate_population
+from app.database import db
+from app.database.models import (
+    ConversationParticipant, Message, RoomBooking, SimpleCourse, SimpleUser, UserCourseEnrollment, UserUnreadCount
+)
+
+app = create_app('testing')
+
+
+class PopulationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.seed_courses()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def seed_courses(self):
+        for i, subject in enumerate(['CS', 'MA', 'PHYS'] * 20, start=1):
+            db.session.add(SimpleCourse(id=i, course_number=f'{i}00', course_name=f'Course {i}', course_subject=subject))
+        db.session.commit()
+
+    def generate(self, seed=3):
+        return generate_population(
+            db, 500, seed=seed, majors=['Computer Science', 'Mathematics'],
+            rooms=[('Hicks', 'Room 001'), ('Hicks', 'Room 002')], locations=['Hicks'], chunk_users=200
+        )
+
+    def snapshot(self):
+        return [
+            [tuple(row) for row in db.session.execute(db.select(*model.__table__.columns).order_by(*model.__table__.primary_key))]
+            for model in (SimpleUser, UserCourseEnrollment, Message, RoomBooking)
+        ]
+
+    def test_same_seed_gives_same_rows(self):
+        self.generate()
+        first = self.snapshot()
+        db.drop_all()
+        db.create_all()
+        self.seed_courses()
+        self.generate()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_population_is_consistent(self):
+        stats = self.generate()
+        self.assertEqual(stats.counts['simple_user'], 500)
+        self.assertEqual(SimpleUser.query.count(), 500)
+
+        # Intro courses are far more popular than the long tail
+        popularity = Counter(course_id for (course_id,) in db.session.query(UserCourseEnrollment.course_id))
+        self.assertGreater(popularity[1], 5 * popularity.get(60, 1))
+
+        # Unread counters agree with the read watermarks
+        for participant in ConversationParticipant.query.all():
+            unread = Message.query.filter(
+                Message.conversation_id == participant.conversation_id,
+                Message.recipient_id == participant.user_id,
+                Message.id > participant.last_read_message_id
+            ).count()
+            self.assertEqual(participant.unread_count, unread)
+        total_unread = db.session.query(db.func.sum(UserUnreadCount.unread_count)).scalar()
+        self.assertEqual(total_unread, db.session.query(db.func.sum(ConversationParticipant.unread_count)).scalar())
+
+        # No room is booked twice at the same time
+        bookings = RoomBooking.query.filter_by(status='active').all()
+        self.assertTrue(bookings)
+        for a in bookings:
+            for b in bookings:
+                if a.id < b.id and (a.room_number, a.booking_date) == (b.room_number, b.booking_date):
+                    self.assertFalse(a.start_time < b.end_time and b.start_time < a.end_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
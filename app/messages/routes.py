@@ -0,0 +1,70 @@
+from flask import Blueprint, render_template, session, redirect, url_for, request, jsonify
+
+from app.auth.utils import get_current_user
+from app.database import db
+from app.database.messages import (
+    get_message_page, get_unread_count, mark_all_conversations_read, mark_conversation_read, post_message
+)
+from app.database.models import SimpleUser
+from app.notifications.emails import send_email_notification
+from app.query_profiler import query_budget
+
+messages_bp = Blueprint('messages', __name__)
+
+@messages_bp.route('/messages')
+@query_budget(4)
+def messages():
+    if 'user' not in session:
+        return redirect(url_for('auth.index'))
+    
+    user_id = session['user']['id']
+    received_messages, next_received = get_message_page(user_id, 'inbox', request.args.get('received_before'))
+    sent_messages, next_sent = get_message_page(user_id, 'outbox', request.args.get('sent_before'))
+    
+    # Render before committing, since the commit expires the loaded messages
+    page = render_template('messages.html', received_messages=received_messages, sent_messages=sent_messages,
+                           next_received=next_received, next_sent=next_sent)
+    mark_all_conversations_read(user_id)
+    db.session.commit()
+    return page
+
+@messages_bp.route('/conversations/<int:conversation_id>/read', methods=['POST'])
+def read_conversation(conversation_id):
+    """Mark one conversation as read"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    if not mark_conversation_read(session['user']['id'], conversation_id):
+        return jsonify({'success': False, 'error': 'Conversation not found'})
+    db.session.commit()
+    return jsonify({'success': True, 'unread_messages': get_unread_count(session['user']['id'])})
+
+@messages_bp.route('/send_message', methods=['POST'])
+@query_budget(11)  # with EMAIL_USER set, which adds the outbox INSERT
+def send_message():
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    try:
+        data = request.get_json()
+        sender_id = session['user']['id']
+        recipient_id = data.get('recipient_id')
+        subject = data.get('subject', 'Study Partner Message')
+        content = data.get('content')
+        
+        post_message(sender_id, recipient_id, subject, content, data.get('message_type', 'general'))
+        
+        # Send email notification
+        recipient = SimpleUser.query.get(recipient_id)
+        sender = get_current_user()
+        
+        if recipient and sender:
+            email_content = f"You have a new message from {sender.name}: {content}"
+            send_email_notification(recipient.email, subject, email_content)
+        
+        db.session.commit()
+        return jsonify({'success': True, 'message': 'Message sent successfully!'})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
@@ -0,0 +1,102 @@
+""" Email notifications for the app: outbox queue, background worker and metrics """
+# emails.py
+# The outbox, SMTP pool and worker are created on first use per app, so
+# worker processes that never send mail never import smtplib.
+
+from flask import current_app, jsonify
+
+from app.database import db
+from app.database.models import EmailOutbox
+from app.query_profiler import metrics_allowed
+
+EXTENSION = 'email_outbox'
+
+
+def init_email(app):
+    app.extensions[EXTENSION] = {}
+    app.add_url_rule('/metrics/email', 'email_queue_metrics', email_queue_metrics)
+
+
+def _state(app=None):
+    app = app or current_app._get_current_object()
+    state = app.extensions[EXTENSION]
+    if 'outbox' not in state:
+        from app.notifications.mailer import MailMetrics, OutboxStore
+        state['metrics'] = MailMetrics()
+        state['outbox'] = OutboxStore(app, db, EmailOutbox)
+    return app, state
+
+
+def get_email_outbox(app=None):
+    """Get the app's email outbox queue"""
+    return _state(app)[1]['outbox']
+
+
+def get_email_worker(app=None):
+    """Get the app's email worker, creating it on first use"""
+    app, state = _state(app)
+    if 'worker' not in state:
+        from app.notifications.mailer import OutboxWorker, SMTPConnectionPool
+        pool = SMTPConnectionPool(
+            app.config['EMAIL_SMTP_HOST'],
+            app.config['EMAIL_SMTP_PORT'],
+            username=app.config['EMAIL_USER'],
+            password=app.config['EMAIL_PASSWORD'],
+            use_tls=app.config['EMAIL_USE_TLS'],
+            size=app.config['EMAIL_WORKER_THREADS'],
+            metrics=state['metrics']
+        )
+        state['worker'] = OutboxWorker(state['outbox'], pool, app.config['EMAIL_USER'],
+                                       threads=app.config['EMAIL_WORKER_THREADS'])
+    return state['worker']
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def wake_email_worker(db_session):
+    """Start sending as soon as queued emails are committed"""
+    if db_session.info.pop('email_queued', False) and current_app.config['EMAIL_WORKER_AUTOSTART']:
+        worker = get_email_worker()
+        worker.start()
+        worker.notify()
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def discard_email_wakeup(db_session):
+    db_session.info.pop('email_queued', None)
+
+
+def send_email_notification(to_email, subject, message):
+    """Queue an email notification; it is sent once the caller commits"""
+    try:
+        if not current_app.config['EMAIL_USER']:
+            return False
+
+        html_body = f"""
+        <html><body style="font-family: Arial, sans-serif;">
+            <div style="background: #CEB888; padding: 20px; text-align: center;">
+                <h1 style="color: white;">CampusConnect Purdue</h1>
+            </div>
+            <div style="padding: 20px;">
+                <h2>{subject}</h2>
+                <p>{message}</p>
+                <a href="http://localhost:5000/" style="background: #CEB888; color: white; padding: 10px 20px; text-decoration: none;">
+                    View on CampusConnect
+                </a>
+            </div>
+        </body></html>
+        """
+
+        get_email_outbox().enqueue(to_email, f"CampusConnect Purdue: {subject}", html_body)
+        db.session.info['email_queued'] = True
+        return True
+    except Exception as e:
+        print(f"Email error: {e}")
+        return False
+
+
+def email_queue_metrics():
+    """Email queue depth and delivery latency"""
+    if not metrics_allowed():
+        return jsonify({'error': 'Forbidden'}), 403
+    _, state = _state()
+    return jsonify({'queue': state['outbox'].queue_depth(), 'worker': state['metrics'].snapshot()})
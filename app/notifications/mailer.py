@@ -0,0 +1,311 @@
+""" Outbound email queue: durable outbox store, pooled SMTP connections and worker threads """
+# mailer.py
+# Request handlers only insert a row into the outbox table. Worker threads
+# claim pending rows in batches, send them over reused SMTP connections and
+# retry failures with exponential backoff.
+
+import smtplib
+import statistics
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from queue import Empty, Full, LifoQueue
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+STALE_CLAIM_SECONDS = 600  # a 'sending' row older than this belongs to a dead worker
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt (exponential backoff)"""
+    return min(RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), RETRY_MAX_SECONDS)
+
+
+def build_message(from_addr, to_addr, subject, html_body):
+    msg = MIMEMultipart()
+    msg['From'] = from_addr
+    msg['To'] = to_addr
+    msg['Subject'] = subject
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+
+class MailMetrics:
+    """Counters and queue latency for the email worker"""
+
+    def __init__(self, window=1000):
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+        self.connections_opened = 0
+        self.latencies = deque(maxlen=window)  # seconds from enqueue to delivery
+
+    def record_sent(self, queued_at):
+        with self.lock:
+            self.sent += 1
+            self.latencies.append((datetime.utcnow() - queued_at).total_seconds())
+
+    def record_failure(self, gave_up):
+        with self.lock:
+            if gave_up:
+                self.failed += 1
+            else:
+                self.retried += 1
+
+    def snapshot(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            data = {
+                'sent': self.sent,
+                'failed': self.failed,
+                'retried': self.retried,
+                'batches': self.batches,
+                'connections_opened': self.connections_opened,
+            }
+        if latencies:
+            data['latency_p50'] = round(statistics.median(latencies), 3)
+            data['latency_p95'] = round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 3)
+            data['latency_max'] = round(latencies[-1], 3)
+        return data
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open between batches"""
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True,
+                 size=2, timeout=30, max_idle=60, metrics=None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.metrics = metrics or MailMetrics()
+        self._idle = LifoQueue(maxsize=size)
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        with self.metrics.lock:
+            self.metrics.connections_opened += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def _is_usable(self, server, last_used):
+        if time.monotonic() - last_used > self.max_idle:
+            return False
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self):
+        server = None
+        try:
+            server, last_used = self._idle.get_nowait()
+            if not self._is_usable(server, last_used):
+                self._close(server)
+                server = None
+        except Empty:
+            pass
+        if server is None:
+            server = self._connect()
+
+        reusable = False
+        try:
+            yield server
+            reusable = True
+        finally:
+            # A connection that saw any error may be mid-command, so it is closed
+            if not reusable:
+                self._close(server)
+        try:
+            self._idle.put_nowait((server, time.monotonic()))
+        except Full:
+            self._close(server)
+
+    def close_all(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except Empty:
+                return
+            self._close(server)
+
+
+class OutboxStore:
+    """Claims and updates rows of the email outbox table"""
+
+    def __init__(self, app, db, model):
+        self.app = app
+        self.db = db
+        self.model = model
+
+    def enqueue(self, to_email, subject, html_body):
+        """Add a message to the current session; the caller commits"""
+        entry = self.model(to_email=to_email, subject=subject, body_html=html_body)
+        self.db.session.add(entry)
+        return entry
+
+    def claim_batch(self, size):
+        """Atomically mark up to size due messages as being sent by this worker"""
+        Outbox = self.model
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        with self.app.app_context():
+            due = self.db.session.query(Outbox.id).filter(
+                ((Outbox.status == 'pending') & (Outbox.next_attempt_at <= now)) |
+                ((Outbox.status == 'sending') & (Outbox.claimed_at < now - timedelta(seconds=STALE_CLAIM_SECONDS)))
+            ).order_by(Outbox.next_attempt_at).limit(size).scalar_subquery()
+            # The guarded UPDATE is a single statement, so two workers can
+            # never claim the same row
+            self.db.session.query(Outbox).filter(Outbox.id.in_(due)).update(
+                {'status': 'sending', 'claim_token': token, 'claimed_at': now},
+                synchronize_session=False
+            )
+            self.db.session.commit()
+            rows = Outbox.query.filter_by(claim_token=token, status='sending').all()
+            batch = [{
+                'id': row.id,
+                'to_email': row.to_email,
+                'subject': row.subject,
+                'body_html': row.body_html,
+                'attempts': row.attempts,
+                'created_at': row.created_at,
+            } for row in rows]
+            self.db.session.remove()
+            return batch
+
+    def mark_sent(self, ids):
+        with self.app.app_context():
+            self.db.session.query(self.model).filter(self.model.id.in_(ids)).update(
+                {'status': 'sent', 'sent_at': datetime.utcnow(), 'claim_token': None},
+                synchronize_session=False
+            )
+            self.db.session.commit()
+            self.db.session.remove()
+
+    def mark_failed(self, item, error):
+        """Schedule a retry with backoff, or give up after MAX_ATTEMPTS"""
+        attempts = item['attempts'] + 1
+        gave_up = attempts >= MAX_ATTEMPTS
+        with self.app.app_context():
+            self.db.session.query(self.model).filter_by(id=item['id']).update({
+                'status': 'failed' if gave_up else 'pending',
+                'attempts': attempts,
+                'last_error': str(error)[:500],
+                'next_attempt_at': datetime.utcnow() + timedelta(seconds=retry_delay(attempts)),
+                'claim_token': None,
+            }, synchronize_session=False)
+            self.db.session.commit()
+            self.db.session.remove()
+        return gave_up
+
+    def queue_depth(self):
+        Outbox = self.model
+        with self.app.app_context():
+            rows = self.db.session.query(Outbox.status, self.db.func.count(Outbox.id)).group_by(Outbox.status).all()
+            oldest = self.db.session.query(self.db.func.min(Outbox.created_at)).filter(Outbox.status == 'pending').scalar()
+            self.db.session.remove()
+        depth = {status: count for status, count in rows}
+        depth['oldest_pending_age'] = round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else 0
+        return depth
+
+
+class OutboxWorker:
+    """Background threads that drain the outbox over pooled SMTP connections"""
+
+    def __init__(self, store, pool, from_addr, threads=2, batch_size=20, poll_interval=5):
+        self.store = store
+        self.pool = pool
+        self.metrics = pool.metrics
+        self.from_addr = from_addr
+        self.threads = threads
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._workers = []
+
+    def start(self):
+        if self._workers:
+            return
+        self._stopping.clear()
+        for i in range(self.threads):
+            worker = threading.Thread(target=self._run, name=f'mail-worker-{i}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def notify(self):
+        self._wakeup.set()
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        self.pool.close_all()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                processed = self.process_batch()
+            except Exception as e:
+                print(f"Email worker error: {e}")
+                processed = 0
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def process_batch(self):
+        """Send one claimed batch; returns the number of messages handled"""
+        batch = self.store.claim_batch(self.batch_size)
+        if not batch:
+            return 0
+        with self.metrics.lock:
+            self.metrics.batches += 1
+
+        sent_ids = []
+        remaining = list(batch)
+        try:
+            with self.pool.connection() as server:
+                while remaining:
+                    item = remaining[0]
+                    msg = build_message(self.from_addr, item['to_email'], item['subject'], item['body_html'])
+                    try:
+                        server.send_message(msg)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                        # Problem with this message only; keep the connection
+                        self.metrics.record_failure(self.store.mark_failed(item, e))
+                    else:
+                        sent_ids.append(item['id'])
+                        self.metrics.record_sent(item['created_at'])
+                    remaining.pop(0)
+        except Exception as e:
+            # Connection-level failure: everything not yet sent is retried
+            for item in remaining:
+                self.metrics.record_failure(self.store.mark_failed(item, e))
+        finally:
+            if sent_ids:
+                self.store.mark_sent(sent_ids)
+        return len(batch)
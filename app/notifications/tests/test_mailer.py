@@ -0,0 +1,166 @@
+"""Tests for the email outbox and pooled SMTP worker."""
+import socket
+import unittest
+from datetime import datetime
+
+from flask import g
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:  # aiosmtpd is only needed for these tests
+    Controller = None
+
+from app import create_app
+from app.notifications.mailer import OutboxWorker, SMTPConnectionPool, MailMetrics, retry_delay, MAX_ATTEMPTS
+from app.database import db
+from app.bootstrap import seed_locations
+from app.database.models import EmailOutbox, SimpleUser
+from app.notifications.emails import get_email_outbox, send_email_notification
+
+app = create_app('testing', {'EMAIL_USER': 'campusconnect@purdue.edu'})
+email_outbox = get_email_outbox(app)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return '250 OK'
+
+
+@unittest.skipIf(Controller is None, 'aiosmtpd is not installed')
+class MailerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.port = free_port()
+        self.smtp = Controller(self.handler, hostname='127.0.0.1', port=self.port)
+        self.smtp.start()
+
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        self.smtp.stop()
+
+    def make_worker(self, port, threads=2):
+        pool = SMTPConnectionPool('127.0.0.1', port, use_tls=False, metrics=MailMetrics())
+        return OutboxWorker(email_outbox, pool, 'campusconnect@purdue.edu', threads=threads, batch_size=10)
+
+    def test_notification_is_queued_not_sent(self):
+        """Test that sending a notification only writes to the outbox."""
+        self.assertTrue(send_email_notification('student@purdue.edu', 'Hello', 'Study at Hicks?'))
+        db.session.commit()
+        self.assertEqual(EmailOutbox.query.filter_by(status='pending').count(), 1)
+        self.assertEqual(self.handler.messages, [])
+
+    def test_batch_reuses_one_connection(self):
+        """Test that a batch is delivered over a single pooled connection."""
+        for i in range(5):
+            send_email_notification(f'student{i}@purdue.edu', 'Hello', 'Study at Hicks?')
+        db.session.commit()
+
+        worker = self.make_worker(self.port)
+        self.assertEqual(worker.process_batch(), 5)
+        self.assertEqual(worker.process_batch(), 0)
+        worker.stop()
+
+        self.assertEqual(len(self.handler.messages), 5)
+        self.assertEqual(worker.metrics.connections_opened, 1)
+        self.assertEqual(worker.metrics.sent, 5)
+        self.assertEqual(EmailOutbox.query.filter_by(status='sent').count(), 5)
+        self.assertEqual(email_outbox.queue_depth().get('pending', 0), 0)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        """Test that an unreachable server schedules a retry instead of dropping mail."""
+        send_email_notification('student@purdue.edu', 'Hello', 'Study at Hicks?')
+        db.session.commit()
+
+        worker = self.make_worker(free_port())
+        self.assertEqual(worker.process_batch(), 1)
+        entry = EmailOutbox.query.one()
+        db.session.refresh(entry)
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(entry.attempts, 1)
+        self.assertGreater(entry.next_attempt_at, datetime.utcnow())
+        # Not due yet, so nothing is claimed
+        self.assertEqual(worker.process_batch(), 0)
+
+    def test_background_worker_drains_queue(self):
+        """Test that the worker threads send queued mail after notify()."""
+        send_email_notification('student@purdue.edu', 'Hello', 'Study at Hicks?')
+        db.session.commit()
+
+        # One thread: the in-memory test database is a single shared connection
+        worker = self.make_worker(self.port, threads=1)
+        worker.start()
+        worker.notify()
+        for _ in range(50):
+            if self.handler.messages:
+                break
+            worker._stopping.wait(0.1)
+        worker.stop()
+        self.assertEqual(len(self.handler.messages), 1)
+
+    def test_connection_is_dropped_after_any_error(self):
+        pool = SMTPConnectionPool('127.0.0.1', self.port, use_tls=False, metrics=MailMetrics())
+        with self.assertRaises(ValueError):
+            with pool.connection():
+                raise ValueError('bad message')
+        with pool.connection():
+            pass
+        self.assertEqual(pool.metrics.connections_opened, 2)
+        pool.close_all()
+
+    def test_retry_delay_grows(self):
+        self.assertLess(retry_delay(1), retry_delay(2))
+        self.assertLessEqual(retry_delay(MAX_ATTEMPTS + 10), 3600)
+
+
+class NotifyingRoutesTestCase(unittest.TestCase):
+    """Query budgets of the routes that queue an email, which adds the outbox INSERT"""
+
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        seed_locations()
+        db.session.add_all([SimpleUser(id=1, name='Student 1', email='student1@purdue.edu'),
+                            SimpleUser(id=2, name='Student 2', email='student2@purdue.edu')])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_routes_stay_within_budget(self):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student 1'}
+        booking = {'location_name': 'Hicks Undergraduate Library', 'room_number': 'Room 001',
+                   'booking_date': '2031-03-01', 'start_time': '10:00', 'end_time': '11:00', 'group_size': 2}
+        requests = [
+            ('/book_room', booking),
+            ('/book_room/recurring', dict(booking, start_time='12:00', end_time='13:00', repeat='weekly', count=3)),
+            ('/send_message', {'recipient_id': 2, 'content': 'Study at Hicks?'}),
+        ]
+        for path, body in requests:
+            g.pop('current_user', None)  # requests share the test's app context
+            self.assertTrue(client.post(path, json=body).get_json()['success'], path)
+        self.assertEqual(EmailOutbox.query.count(), len(requests))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+""" Append-only study hours log with per-plan and per-course rollups """
+# hours.py
+# Logging hours inserts a row into study_hours_log and adds it to the plan's
+# and the course's rollup with `hours = hours + excluded.hours` upserts in
+# the same transaction, so concurrent logs from several tabs never read,
+# modify and write back a total. Pages read progress from the rollups with
+# one join. rebuild_study_hours recomputes both rollups from the log and can
+# run at any time, e.g. after rows were bulk inserted.
+
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
+
+from app.database import db
+from app.database.models import CourseStudyHours, StudyHoursLog, StudyPlan, StudyPlanHours
+
+MAX_HOURS_PER_LOG = 24  # per log entry
+
+ADD_TO_PLAN = text("""
+    INSERT INTO study_plan_hours (plan_id, hours, sessions, last_logged_at)
+    VALUES (:plan_id, :hours, 1, :logged_at)
+    ON CONFLICT (plan_id) DO UPDATE SET
+        hours = study_plan_hours.hours + excluded.hours,
+        sessions = study_plan_hours.sessions + 1,
+        last_logged_at = excluded.last_logged_at
+    RETURNING hours
+""").bindparams(bindparam('logged_at', type_=db.DateTime))
+
+ADD_TO_COURSE = text("""
+    INSERT INTO course_study_hours (user_id, course_id, hours, sessions, last_logged_at)
+    VALUES (:user_id, :course_id, :hours, 1, :logged_at)
+    ON CONFLICT (user_id, course_id) DO UPDATE SET
+        hours = course_study_hours.hours + excluded.hours,
+        sessions = course_study_hours.sessions + 1,
+        last_logged_at = excluded.last_logged_at
+    RETURNING hours
+""").bindparams(bindparam('logged_at', type_=db.DateTime))
+
+
+def progress_percent(hours, hours_needed):
+    if not hours_needed or hours_needed <= 0:
+        return 0
+    return min(hours / hours_needed * 100, 100)
+
+
+def record_hours(plan, hours):
+    """Log hours against plan; returns the new (plan total, course total). The caller commits"""
+    logged_at = datetime.utcnow()
+    db.session.execute(db.insert(StudyHoursLog).values(
+        plan_id=plan.id, user_id=plan.user_id, course_id=plan.course_id, hours=hours, logged_at=logged_at
+    ))
+    plan_total = db.session.execute(ADD_TO_PLAN, {
+        'plan_id': plan.id, 'hours': hours, 'logged_at': logged_at
+    }).scalar_one()
+    course_total = db.session.execute(ADD_TO_COURSE, {
+        'user_id': plan.user_id, 'course_id': plan.course_id, 'hours': hours, 'logged_at': logged_at
+    }).scalar_one()
+    return plan_total, course_total
+
+
+def rebuild_study_hours():
+    """Recompute both rollups from the log; returns the number of plans with hours"""
+    db.session.query(StudyPlanHours).delete()
+    db.session.query(CourseStudyHours).delete()
+    db.session.execute(text("""
+        INSERT INTO study_plan_hours (plan_id, hours, sessions, last_logged_at)
+        SELECT plan_id, SUM(hours), COUNT(*), MAX(logged_at) FROM study_hours_log GROUP BY plan_id
+    """))
+    db.session.execute(text("""
+        INSERT INTO course_study_hours (user_id, course_id, hours, sessions, last_logged_at)
+        SELECT user_id, course_id, SUM(hours), COUNT(*), MAX(logged_at) FROM study_hours_log
+        GROUP BY user_id, course_id
+    """))
+    db.session.commit()
+    return db.session.query(StudyPlanHours).count()
+
+
+def plans_with_progress(user_id, after=None, limit=None):
+    """The user's study plans by exam date, each with hours_logged and progress set, from one query"""
+    query = db.session.query(StudyPlan, StudyPlanHours.hours).outerjoin(
+        StudyPlanHours, StudyPlanHours.plan_id == StudyPlan.id
+    ).filter(StudyPlan.user_id == user_id)
+    if after is not None:
+        query = query.filter(StudyPlan.exam_date > after)
+    query = query.order_by(StudyPlan.exam_date)
+    if limit is not None:
+        query = query.limit(limit)
+
+    plans = []
+    for plan, hours in query:
+        plan.hours_logged = hours or 0
+        plan.progress = progress_percent(plan.hours_logged, plan.prep_hours_needed)
+        plans.append(plan)
+    return plans
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from flask import Blueprint, render_template, session, redirect, url_for, request, jsonify
+
+from app.courses import course_catalog, get_user_courses
+from app.database import db
+from app.database.models import StudyPlan
+from app.planner.hours import MAX_HOURS_PER_LOG, plans_with_progress, progress_percent, record_hours
+from app.planner.scheduler import schedule_for_user
+from app.query_profiler import query_budget
+
+planner_bp = Blueprint('planner', __name__)
+
+@planner_bp.route('/study_planner')
+@query_budget(7)  # 5 when the stored schedule covers every plan
+def study_planner():
+    if 'user' not in session:
+        return redirect(url_for('auth.index'))
+    
+    user_id = session['user']['id']
+    study_plans = plans_with_progress(user_id)
+    
+    # Add course info to study plans
+    for plan in study_plans:
+        plan.course = course_catalog.get(plan.course_id)
+    
+    courses = get_user_courses(user_id)
+    
+    # Suggested prep sessions in free study rooms: the stored schedule, topped up live
+    prep_sessions, unscheduled = schedule_for_user(user_id, study_plans)
+    plans_by_id = {plan.id: plan for plan in study_plans}
+    for plan in study_plans:
+        plan.unscheduled_hours = unscheduled.get(plan.id, 0)
+    
+    return render_template('study_planner.html', study_plans=study_plans, courses=courses, now=datetime.now,
+                           prep_sessions=prep_sessions, plans_by_id=plans_by_id)
+
+@planner_bp.route('/create_study_plan', methods=['POST'])
+def create_study_plan():
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    try:
+        data = request.get_json()
+        user_id = session['user']['id']
+        
+        study_plan = StudyPlan(
+            user_id=user_id,
+            course_id=data.get('course_id'),
+            exam_name=data.get('exam_name'),
+            exam_date=datetime.strptime(data.get('exam_date'), '%Y-%m-%d'),
+            prep_hours_needed=data.get('prep_hours_needed', 20)
+        )
+        
+        db.session.add(study_plan)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'message': 'Study plan created successfully!'})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@planner_bp.route('/log_study_hours', methods=['POST'])
+@query_budget(4)
+def log_study_hours():
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    try:
+        data = request.get_json()
+        plan_id = data.get('plan_id')
+        hours = float(data.get('hours', 0))
+        
+        if hours <= 0:
+            return jsonify({'success': False, 'error': 'Hours must be greater than 0'})
+        if hours > MAX_HOURS_PER_LOG:
+            return jsonify({'success': False, 'error': f'At most {MAX_HOURS_PER_LOG} hours per log'})
+        
+        study_plan = StudyPlan.query.get(plan_id)
+        if not study_plan:
+            return jsonify({'success': False, 'error': 'Study plan not found'})
+        
+        if study_plan.user_id != session['user']['id']:
+            return jsonify({'success': False, 'error': 'Unauthorized'})
+        
+        # Append to the log; the plan and course totals are added up in SQL
+        total_hours, course_hours = record_hours(study_plan, hours)
+        prep_hours_needed = study_plan.prep_hours_needed  # read before the commit expires the plan
+        db.session.commit()
+        
+        return jsonify({
+            'success': True, 
+            'message': f'Logged {hours} hours successfully!',
+            'total_hours': total_hours,
+            'course_hours': course_hours,
+            'progress_percent': progress_percent(total_hours, prep_hours_needed)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
@@ -0,0 +1,300 @@
+""" Exam-prep scheduler: places the remaining hours of study plans into free study rooms """
+# scheduler.py
+# Remaining prep hours are cut into one-hour sessions and placed day by day,
+# earliest deadline first: every free hour of a day (inside study hours, not
+# overlapping the student's own bookings or sessions, with a room free in its
+# occupancy bitmap) goes to the plan whose exam comes soonest and still needs
+# hours. With equal-sized sessions this places as many hours before their
+# exams as any schedule could. schedule_all_users stores everyone's schedule
+# overnight in a process pool, never giving a room to two students at once.
+# A student is shown their stored sessions; only hours these don't cover
+# (say, of a plan added since) are placed live, around every stored session.
+# Rooms and bitmaps for the whole horizon come from one query, so that takes
+# a few milliseconds. Sessions are suggestions: rooms are only booked when
+# the student books them.
+
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta
+from multiprocessing import get_context
+
+from flask import current_app
+
+from app.database import db
+from app.database.models import (
+    RoomBooking, RoomOccupancy, ScheduledStudySession, StudyPlan, StudyPlanHours, StudyRoom
+)
+from app.database.sqlite import dispose_engines, is_sqlite_file
+from app.rooms.occupancy import SLOT_MINUTES, join_mask, slot_mask
+
+SESSION_MINUTES = 60
+SESSION_SLOTS = SESSION_MINUTES // SLOT_MINUTES
+STUDY_DAY = (time(8), time(22))  # sessions start and end inside these hours
+MAX_SESSIONS_PER_DAY = 3
+HORIZON_DAYS = 14
+CHUNK_USERS = 500  # users per process pool task
+
+PrepSession = namedtuple('PrepSession', 'plan_id day start_time end_time location_name room_number')
+
+# Candidate session start slots of a day, earliest first
+SESSION_STARTS = range(slot_mask(time(0), STUDY_DAY[0]).bit_length(),
+                       slot_mask(time(0), STUDY_DAY[1]).bit_length() - SESSION_SLOTS + 1, SESSION_SLOTS)
+
+
+def slot_time(slot):
+    minutes = slot * SLOT_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+class RoomCalendar:
+    """Rooms, smallest first, with their booked slots for each day of a date range"""
+
+    def __init__(self, rooms, occupancy):
+        self.rooms = rooms  # [(room_id, location_name, room_number)]
+        self.occupancy = occupancy  # {(day, room_id): mask}
+        self.by_name = {(room[1], room[2]): room for room in rooms}
+
+    @classmethod
+    def load(cls, first_day, last_day):
+        rooms = {}
+        occupancy = {}
+        for room_id, location_name, room_number, day, slots_am, slots_pm in db.session.query(
+            StudyRoom.id, StudyRoom.location_name, StudyRoom.room_number,
+            RoomOccupancy.day, RoomOccupancy.slots_am, RoomOccupancy.slots_pm
+        ).outerjoin(
+            RoomOccupancy, (RoomOccupancy.room_id == StudyRoom.id) & RoomOccupancy.day.between(first_day, last_day)
+        ).order_by(StudyRoom.capacity, StudyRoom.location_name, StudyRoom.room_number):
+            rooms[room_id] = (room_id, location_name, room_number)
+            if day is not None:
+                occupancy[(day, room_id)] = join_mask(slots_am, slots_pm)
+        return cls(list(rooms.values()), occupancy)
+
+    def is_free(self, day, room, mask):
+        return not self.occupancy.get((day, room[0]), 0) & mask
+
+    def free_room(self, day, mask):
+        """First room with none of mask's slots booked on day, or None"""
+        for room in self.rooms:
+            if self.is_free(day, room, mask):
+                return room
+        return None
+
+    def book(self, day, room, mask):
+        """Mark mask's slots of room as taken, so no later session gets them"""
+        self.occupancy[(day, room[0])] = self.occupancy.get((day, room[0]), 0) | mask
+
+    def book_stored_sessions(self, first_day, last_day):
+        """Mark the rooms of every stored session in the date range as taken"""
+        for day, location_name, room_number, start_time, end_time in db.session.query(
+            ScheduledStudySession.day, ScheduledStudySession.location_name, ScheduledStudySession.room_number,
+            ScheduledStudySession.start_time, ScheduledStudySession.end_time
+        ).filter(ScheduledStudySession.day.between(first_day, last_day)):
+            room = self.by_name.get((location_name, room_number))
+            if room is not None:
+                self.book(day, room, slot_mask(start_time, end_time))
+
+
+def schedule_plans(plans, busy, calendar, first_day, days=HORIZON_DAYS):
+    """Place plans' remaining hours into sessions from first_day on
+
+    plans     [(plan_id, exam_day, hours_left)]
+    busy      {day: mask} of slots the student already has booked
+    Each session's room is booked in calendar, so students scheduled with the
+    same calendar never share a room.
+    Returns (sessions, {plan_id: hours that did not fit before the exam}).
+    """
+    # [plan_id, exam_day, sessions still needed], soonest exam first
+    demand = [[plan_id, exam_day, math.ceil(hours_left * 60 / SESSION_MINUTES)]
+              for plan_id, exam_day, hours_left in plans if hours_left > 0]
+    demand.sort(key=lambda plan: plan[1])
+    pending = demand
+    sessions = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        pending = [plan for plan in pending if plan[2] and plan[1] > day]
+        if not pending:
+            break
+        used = busy.get(day, 0)
+        placed = 0
+        for start in SESSION_STARTS:
+            mask = ((1 << SESSION_SLOTS) - 1) << start
+            if used & mask:
+                continue
+            room = calendar.free_room(day, mask)
+            if room is None:
+                continue
+            plan = next((plan for plan in pending if plan[2]), None)
+            if plan is None:
+                break
+            plan[2] -= 1
+            used |= mask
+            calendar.book(day, room, mask)
+            sessions.append(PrepSession(plan[0], day, slot_time(start), slot_time(start + SESSION_SLOTS),
+                                        room[1], room[2]))
+            placed += 1
+            if placed == MAX_SESSIONS_PER_DAY:
+                break
+    unscheduled = {plan_id: blocks * SESSION_MINUTES / 60 for plan_id, _, blocks in demand if blocks}
+    return sessions, unscheduled
+
+
+def busy_masks(user_ids, first_day, last_day):
+    """{user_id: {day: mask}} of the users' active bookings in the date range"""
+    busy = {user_id: {} for user_id in user_ids}
+    for user_id, day, start_time, end_time in db.session.query(
+        RoomBooking.user_id, RoomBooking.booking_date, RoomBooking.start_time, RoomBooking.end_time
+    ).filter(
+        RoomBooking.user_id.in_(user_ids),
+        RoomBooking.booking_date.between(first_day, last_day),
+        RoomBooking.status == 'active'
+    ):
+        days = busy[user_id]
+        days[day] = days.get(day, 0) | slot_mask(start_time, end_time)
+    return busy
+
+
+def plan_demand(plan, hours_logged):
+    return plan.id, plan.exam_date.date(), plan.prep_hours_needed - hours_logged
+
+
+def stored_sessions(user_id, first_day, last_day):
+    """The user's sessions stored by the last nightly run, earliest first"""
+    return [PrepSession(*row) for row in db.session.query(
+        ScheduledStudySession.plan_id, ScheduledStudySession.day, ScheduledStudySession.start_time,
+        ScheduledStudySession.end_time, ScheduledStudySession.location_name, ScheduledStudySession.room_number
+    ).filter(
+        ScheduledStudySession.user_id == user_id, ScheduledStudySession.day.between(first_day, last_day)
+    ).order_by(ScheduledStudySession.day, ScheduledStudySession.start_time)]
+
+
+def schedule_for_user(user_id, plans, today=None):
+    """Schedule from the user's plans as loaded by plans_with_progress
+
+    Stored sessions are kept while their plan still needs the hours; what
+    they leave uncovered is placed live, in rooms no stored session has.
+    """
+    first_day = (today or date.today()) + timedelta(days=1)
+    last_day = first_day + timedelta(days=HORIZON_DAYS - 1)
+    demand = [plan_demand(plan, plan.hours_logged) for plan in plans if plan.exam_date.date() > first_day]
+    if not demand:
+        return [], {}
+
+    needed = {plan_id: math.ceil(hours_left * 60 / SESSION_MINUTES) for plan_id, _, hours_left in demand}
+    sessions = []
+    for prep in stored_sessions(user_id, first_day, last_day):
+        if needed.get(prep.plan_id, 0) > 0:
+            needed[prep.plan_id] -= 1
+            sessions.append(prep)
+    demand = [(plan_id, exam_day, needed[plan_id] * SESSION_MINUTES / 60)
+              for plan_id, exam_day, _ in demand if needed[plan_id] > 0]
+    if not demand:
+        return sessions, {}
+
+    busy = busy_masks([user_id], first_day, last_day)[user_id]
+    for prep in sessions:
+        busy[prep.day] = busy.get(prep.day, 0) | slot_mask(prep.start_time, prep.end_time)
+    calendar = RoomCalendar.load(first_day, last_day)
+    calendar.book_stored_sessions(first_day, last_day)
+    live, unscheduled = schedule_plans(demand, busy, calendar, first_day)
+    return sorted(sessions + live, key=lambda prep: (prep.day, prep.start_time)), unscheduled
+
+
+# Overnight batch
+
+_calendars = {}  # per worker process: first_day -> RoomCalendar
+
+
+def schedule_users(user_ids, first_day):
+    """Session rows for the users' outstanding plans; runs in an app context"""
+    last_day = first_day + timedelta(days=HORIZON_DAYS - 1)
+    if first_day not in _calendars:
+        _calendars.clear()
+        _calendars[first_day] = RoomCalendar.load(first_day, last_day)
+    calendar = _calendars[first_day]
+
+    plans = {user_id: [] for user_id in user_ids}
+    for plan, hours in db.session.query(StudyPlan, StudyPlanHours.hours).outerjoin(
+        StudyPlanHours, StudyPlanHours.plan_id == StudyPlan.id
+    ).filter(StudyPlan.user_id.in_(user_ids), StudyPlan.exam_date > datetime.combine(first_day, time.max)):
+        plans[plan.user_id].append(plan_demand(plan, hours or 0))
+    busy = busy_masks(user_ids, first_day, last_day)
+
+    rows = []
+    for user_id in user_ids:
+        sessions, _ = schedule_plans(plans[user_id], busy[user_id], calendar, first_day)
+        rows.extend(dict(prep._asdict(), user_id=user_id) for prep in sessions)
+    return rows
+
+
+_worker_app = None
+
+
+def _init_worker(app):
+    global _worker_app
+    _worker_app = app
+
+
+def settle_rooms(rows, calendar):
+    """Rows of a worker whose rooms are taken by earlier chunks move to
+    another room free at the same time, or are dropped if none is left"""
+    settled = []
+    for row in rows:
+        mask = slot_mask(row['start_time'], row['end_time'])
+        room = calendar.by_name.get((row['location_name'], row['room_number']))
+        if room is None or not calendar.is_free(row['day'], room, mask):
+            room = calendar.free_room(row['day'], mask)
+            if room is None:
+                continue
+            row = dict(row, location_name=room[1], room_number=room[2])
+        calendar.book(row['day'], room, mask)
+        settled.append(row)
+    return settled
+
+
+def _schedule_chunk(user_ids, first_day):
+    with _worker_app.app_context():
+        try:
+            return schedule_users(user_ids, first_day)
+        finally:
+            db.session.remove()
+
+
+def schedule_all_users(workers=None, today=None, chunk_users=CHUNK_USERS):
+    """Recompute and store every user's schedule; returns (users, sessions)
+
+    Chunks of users are scheduled by a pool of forked worker processes, each
+    reading through its own connections and booking rooms in its own copy of
+    the calendar; the parent settles rooms that chunks booked twice, then
+    replaces the stored sessions in one transaction. In-memory databases are
+    scheduled inline.
+    """
+    first_day = (today or date.today()) + timedelta(days=1)
+    user_ids = [user_id for (user_id,) in db.session.query(StudyPlan.user_id).filter(
+        StudyPlan.exam_date > datetime.combine(first_day, time.max)
+    ).distinct().order_by(StudyPlan.user_id)]
+    chunks = [user_ids[i:i + chunk_users] for i in range(0, len(user_ids), chunk_users)]
+    workers = workers or os.cpu_count() or 1
+
+    rows = []
+    if workers > 1 and len(chunks) > 1 and is_sqlite_file(current_app.config['SQLALCHEMY_DATABASE_URI']):
+        app = current_app._get_current_object()
+        db.session.remove()
+        dispose_engines(app, db)  # never share pooled connections across fork
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=get_context('fork'),
+                                 initializer=_init_worker, initargs=(app,)) as pool:
+            chunk_results = list(pool.map(_schedule_chunk, chunks, [first_day] * len(chunks)))
+        calendar = RoomCalendar.load(first_day, first_day + timedelta(days=HORIZON_DAYS - 1))
+        for chunk_rows in chunk_results:
+            rows.extend(settle_rooms(chunk_rows, calendar))
+    else:
+        for chunk in chunks:
+            rows.extend(schedule_users(chunk, first_day))
+        _calendars.clear()
+
+    db.session.query(ScheduledStudySession).delete()
+    for start in range(0, len(rows), 5000):
+        db.session.execute(db.insert(ScheduledStudySession), rows[start:start + 5000])
+    db.session.commit()
+    return len(user_ids), len(rows)
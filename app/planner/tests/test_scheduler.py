@@ -0,0 +1,158 @@
+"""Tests for the exam-prep scheduler."""
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+
+from app import create_app
+from app.bootstrap import seed_locations
+from app.database import db
+from app.database.models import RoomBooking, ScheduledStudySession, StudyPlan
+from app.database.sqlite import dispose_engines
+from app.planner.hours import plans_with_progress
+from app.planner.scheduler import (
+    MAX_SESSIONS_PER_DAY, RoomCalendar, schedule_all_users, schedule_for_user, schedule_plans
+)
+from app.rooms.occupancy import slot_mask
+
+app = create_app('testing')
+
+DAY = date(2031, 3, 3)
+ROOMS = [(1, 'Hicks Undergraduate Library', 'Room 001'), (2, 'Hicks Undergraduate Library', 'Room 002')]
+
+
+class SchedulePlansTestCase(unittest.TestCase):
+    def test_earliest_exam_goes_first(self):
+        """Test that sessions fill the soonest exam first and stop the day before it."""
+        calendar = RoomCalendar(ROOMS, {})
+        plans = [(1, DAY + timedelta(days=10), 2), (2, DAY + timedelta(days=1), 5)]
+        sessions, unscheduled = schedule_plans(plans, {}, calendar, DAY)
+        first_day = [prep for prep in sessions if prep.day == DAY]
+        self.assertEqual([prep.plan_id for prep in first_day], [2] * MAX_SESSIONS_PER_DAY)
+        self.assertEqual(first_day[0].start_time, time(8))
+        self.assertEqual(unscheduled, {2: 2})
+        self.assertEqual([prep.plan_id for prep in sessions[MAX_SESSIONS_PER_DAY:]], [1, 1])
+
+    def test_busy_slots_and_booked_rooms_are_skipped(self):
+        calendar = RoomCalendar(ROOMS, {(DAY, 1): slot_mask(time(8), time(22)), (DAY, 2): slot_mask(time(9), time(10))})
+        busy = {DAY: slot_mask(time(8), time(8, 30))}
+        sessions, _ = schedule_plans([(1, DAY + timedelta(days=1), 1.5)], busy, calendar, DAY)
+        self.assertEqual([(prep.start_time, prep.room_number) for prep in sessions],
+                         [(time(10), 'Room 002'), (time(11), 'Room 002')])
+
+    def test_students_sharing_a_calendar_get_different_rooms(self):
+        calendar = RoomCalendar(ROOMS, {})
+        plans = [(1, DAY + timedelta(days=2), 2)]
+        first, _ = schedule_plans(plans, {}, calendar, DAY)
+        second, _ = schedule_plans(plans, {}, calendar, DAY)
+        self.assertEqual([prep.start_time for prep in first], [prep.start_time for prep in second])
+        self.assertEqual({prep.room_number for prep in first}, {'Room 001'})
+        self.assertEqual({prep.room_number for prep in second}, {'Room 002'})
+
+
+class StudyScheduleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        seed_locations()
+        exam = datetime.now() + timedelta(days=3)
+        db.session.add_all([
+            StudyPlan(id=1, user_id=1, course_id=1, exam_name='CS 180 Final', exam_date=exam, prep_hours_needed=4),
+            StudyPlan(id=2, user_id=2, course_id=1, exam_name='Midterm', exam_date=exam, prep_hours_needed=2),
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_study_planner_suggests_sessions(self):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student'}
+        page = client.get('/study_planner').data
+        self.assertIn(b'Suggested Study Sessions', page)
+        self.assertEqual(page.count(b'bookSession("'), 4)
+
+    def test_study_planner_serves_the_stored_schedule(self):
+        schedule_all_users()
+        ScheduledStudySession.query.filter_by(user_id=1).update({'room_number': 'Room 099'})
+        db.session.commit()
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student'}
+        self.assertEqual(client.get('/study_planner').data.count(b'"Room 099"'), 4)
+
+    def test_live_schedule_avoids_stored_sessions(self):
+        """Test that hours left out of the stored schedule never get a room stored for someone else."""
+        schedule_all_users()
+        ScheduledStudySession.query.filter_by(user_id=2).delete()  # as if user 2's plan came after the run
+        db.session.commit()
+        taken = {(s.day, s.start_time, s.location_name, s.room_number) for s in ScheduledStudySession.query}
+        sessions, unscheduled = schedule_for_user(2, plans_with_progress(2))
+        self.assertEqual((len(sessions), unscheduled), (2, {}))
+        self.assertFalse(taken & {(s.day, s.start_time, s.location_name, s.room_number) for s in sessions})
+
+    def test_nightly_run_stores_every_users_sessions(self):
+        self.assertEqual(schedule_all_users(), (2, 6))
+        self.assertEqual(ScheduledStudySession.query.filter_by(user_id=2).count(), 2)
+        # A rerun replaces the previous schedule
+        self.assertEqual(schedule_all_users(), (2, 6))
+        self.assertEqual(ScheduledStudySession.query.count(), 6)
+
+
+class ProcessPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(self.db_dir, 'test.db')}"})
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        seed_locations()
+        exam = datetime(2031, 3, 10)
+        db.session.add_all([StudyPlan(user_id=user_id, course_id=1, exam_name='Final', exam_date=exam,
+                                      prep_hours_needed=user_id) for user_id in range(1, 9)])
+        db.session.add(RoomBooking(user_id=3, location_name='Hicks Undergraduate Library', room_number='Room 001',
+                                   booking_date=date(2031, 3, 2), start_time=time(8), end_time=time(10)))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        dispose_engines(self.app, db)
+        shutil.rmtree(self.db_dir, ignore_errors=True)
+
+    def stored(self):
+        return db.session.query(ScheduledStudySession.user_id, ScheduledStudySession.day,
+                                ScheduledStudySession.start_time).order_by(ScheduledStudySession.id).all()
+
+    def double_booked(self):
+        return db.session.query(
+            ScheduledStudySession.day, ScheduledStudySession.start_time,
+            ScheduledStudySession.location_name, ScheduledStudySession.room_number
+        ).group_by(
+            ScheduledStudySession.day, ScheduledStudySession.start_time,
+            ScheduledStudySession.location_name, ScheduledStudySession.room_number
+        ).having(db.func.count() > 1).all()
+
+    def test_pool_matches_inline_run(self):
+        """Test that worker processes produce the same schedule as one process."""
+        today = date(2031, 3, 1)
+        self.assertEqual(schedule_all_users(workers=1, today=today), (8, 36))
+        inline = self.stored()
+        self.assertEqual(self.double_booked(), [])
+        self.assertEqual(schedule_all_users(workers=2, today=today, chunk_users=3), (8, 36))
+        self.assertEqual(self.stored(), inline)
+        # Chunks were scheduled apart, yet no room is given out twice
+        self.assertEqual(self.double_booked(), [])
+        # The student's own booking takes the first two hours
+        self.assertEqual([start for user_id, day, start in inline if user_id == 3 and day == date(2031, 3, 2)],
+                         [time(10), time(11), time(12)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for the study hours log and its rollups."""
+import unittest
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.bootstrap import migrate_schema, set_app_metadata
+from app.database import db
+from app.database.models import CourseStudyHours, StudyHoursLog, StudyPlan, StudyPlanHours
+from app.planner.hours import plans_with_progress, rebuild_study_hours
+
+app = create_app('testing')
+
+
+class StudyHoursTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        soon = datetime.now() + timedelta(days=7)
+        db.session.add_all([
+            StudyPlan(id=1, user_id=1, course_id=10, exam_name='Midterm', exam_date=soon, prep_hours_needed=4),
+            StudyPlan(id=2, user_id=1, course_id=10, exam_name='Final', exam_date=soon + timedelta(days=30)),
+            StudyPlan(id=3, user_id=2, course_id=10, exam_name='Final', exam_date=soon),
+        ])
+        db.session.commit()
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def log(self, plan_id, hours):
+        return self.client.post('/log_study_hours', json={'plan_id': plan_id, 'hours': hours}).get_json()
+
+    def test_logging_appends_and_rolls_up(self):
+        """Test that fractional hours add up per plan and per course."""
+        self.assertEqual(self.log(1, 1.5)['total_hours'], 1.5)
+        response = self.log(1, 1.5)
+        self.assertEqual(response['total_hours'], 3)
+        self.assertEqual(response['progress_percent'], 75)
+        self.assertEqual(self.log(2, 2)['course_hours'], 5)
+        self.assertEqual(self.log(1, 4)['progress_percent'], 100)
+
+        self.assertEqual(StudyHoursLog.query.count(), 4)
+        self.assertEqual(db.session.get(StudyPlanHours, 1).sessions, 3)
+        self.assertEqual(db.session.get(CourseStudyHours, (1, 10)).hours, 9)
+        self.assertFalse(self.log(3, 1)['success'])
+        self.assertFalse(self.log(1, 25)['success'])
+
+    def test_progress_comes_from_the_rollup(self):
+        self.log(1, 2)
+        plans = plans_with_progress(1)
+        self.assertEqual([(plan.id, plan.hours_logged, plan.progress) for plan in plans], [(1, 2, 50), (2, 0, 0)])
+        self.assertEqual([plan.id for plan in plans_with_progress(1, after=datetime.now(), limit=1)], [1])
+        self.assertIn(b'2.0/4 hours', self.client.get('/study_planner').data)
+
+    def test_rebuild_and_migration_match_the_log(self):
+        """Test that the rollups can be recomputed and the legacy totals are carried over."""
+        self.log(1, 2)
+        db.session.query(StudyPlanHours).delete()
+        db.session.commit()
+        self.assertEqual(rebuild_study_hours(), 1)
+        self.assertEqual(db.session.get(StudyPlanHours, 1).hours, 2)
+
+        db.session.get(StudyPlan, 3).hours_completed = 6
+        set_app_metadata('schema_version', '7')
+        db.session.commit()
+        migrate_schema()
+        self.assertEqual(db.session.get(StudyPlanHours, 3).hours, 6)
+        self.assertEqual(db.session.get(CourseStudyHours, (2, 10)).hours, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
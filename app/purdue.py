@@ -0,0 +1,56 @@
+""" Purdue reference data and the Purdue.io course API """
+# purdue.py
+
+from flask import current_app
+
+# Purdue.io API Integration
+class PurdueAPI:
+    BASE_URL = "https://api.purdue.io/odata"
+    _client = None
+    
+    @staticmethod
+    def client():
+        if PurdueAPI._client is None:
+            from app.purdue_api import PurdueAPIClient  # imports requests; only sync-courses needs it
+            PurdueAPI._client = PurdueAPIClient(
+                PurdueAPI.BASE_URL,
+                cache_dir=current_app.config['PURDUE_API_CACHE_DIR'],
+                replay=current_app.config['PURDUE_API_REPLAY']
+            )
+        return PurdueAPI._client
+    
+    @staticmethod
+    def get_courses():
+        import requests
+        try:
+            return PurdueAPI.client().get_courses()
+        except (requests.RequestException, LookupError, ValueError) as e:
+            print(f"Error fetching Purdue courses: {e}")
+            return None
+
+# Real Purdue Data
+PURDUE_DINING_HALLS = [
+    {"name": "Wiley Dining Court", "building": "Wiley Residence Hall"},
+    {"name": "Windsor Dining Court", "building": "Windsor Halls"},
+    {"name": "Earhart Dining Court", "building": "Earhart Residence Hall"},
+    {"name": "Hillenbrand Dining Court", "building": "Hillenbrand Residence Hall"},
+    {"name": "Ford Dining Court", "building": "Ford Residence Hall"},
+    {"name": "On the Go Market - WALC", "building": "WALC"},
+]
+
+PURDUE_STUDY_LOCATIONS = [
+    {"name": "Hicks Undergraduate Library", "building": "Hicks Library", "capacity": 300},
+    {"name": "WALC (Wilmeth Active Learning Center)", "building": "WALC", "capacity": 500},
+    {"name": "MATH Library", "building": "Mathematical Sciences Building", "capacity": 100},
+    {"name": "Physics Library", "building": "Physics Building", "capacity": 80},
+    {"name": "Engineering Library", "building": "Potter Engineering Center", "capacity": 200},
+    {"name": "Stewart Center Study Rooms", "building": "Stewart Center", "capacity": 50},
+]
+
+PURDUE_MAJORS = [
+    "Computer Science", "Electrical Engineering", "Mechanical Engineering", "Civil Engineering",
+    "Chemical Engineering", "Aerospace Engineering", "Industrial Engineering", "Biomedical Engineering",
+    "Mathematics", "Statistics", "Physics", "Chemistry", "Biology", "Biochemistry",
+    "Management", "Economics", "Accounting", "Finance", "Marketing", "Supply Chain Management",
+    "Psychology", "Communication", "English", "History", "Political Science", "Sociology"
+]
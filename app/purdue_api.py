@@ -0,0 +1,160 @@
+""" HTTP client for the Purdue.io OData API with caching, paging and offline replay """
+# purdue_api.py
+# One pooled requests.Session is reused for every call. Responses are kept in
+# an on-disk cache together with their ETag / Last-Modified headers so a
+# refresh only re-downloads pages that changed. The same cache files double as
+# fixtures: a client in replay mode serves them without touching the network.
+
+import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = 'https://api.purdue.io/odata'
+PAGE_SIZE = 500
+WORKERS = 4
+TIMEOUT = (5, 15)  # connect, read
+
+
+class ReplayMiss(LookupError):
+    """Replay mode was asked for a response that has no fixture"""
+
+
+def cache_name(path, params=None):
+    """File name of the cached response for path and params"""
+    query = '&'.join(f"{key}={value}" for key, value in sorted((params or {}).items()))
+    name = f"{path}?{query}" if query else path
+    return re.sub(r'[^A-Za-z0-9=._-]+', '_', name).strip('_') + '.json'
+
+
+class PurdueAPIClient:
+    """Purdue.io client.
+
+    cache_dir  directory for cached responses; enables conditional requests
+    replay     serve responses from cache_dir only and never use the network
+    """
+
+    def __init__(self, base_url=BASE_URL, cache_dir=None, replay=False,
+                 page_size=PAGE_SIZE, workers=WORKERS, timeout=TIMEOUT, session=None):
+        if replay and not cache_dir:
+            raise ValueError('Replay mode needs a cache_dir with fixture files')
+        self.base_url = base_url.rstrip('/')
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.replay = replay
+        self.page_size = page_size
+        self.workers = workers
+        self.timeout = timeout
+        self.session = session or self._make_session(workers)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'downloaded': 0, 'not_modified': 0, 'replayed': 0}
+
+    @staticmethod
+    def _make_session(workers):
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Accept'] = 'application/json'
+        return session
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def _cache_path(self, path, params):
+        return self.cache_dir / cache_name(path, params) if self.cache_dir else None
+
+    def _read_cache(self, cache_path):
+        if cache_path is None or not cache_path.exists():
+            return None
+        with open(cache_path, 'r') as file:
+            return json.load(file)
+
+    def _write_cache(self, cache_path, entry):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, cache_path)
+
+    def get(self, path, params=None):
+        """JSON body of GET path, revalidated against the cache when possible"""
+        cache_path = self._cache_path(path, params)
+        cached = self._read_cache(cache_path)
+
+        if self.replay:
+            if cached is None:
+                raise ReplayMiss(f"No fixture {cache_path.name} for {path} {params or ''}")
+            self._count('replayed')
+            return cached['body']
+
+        headers = {}
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        self._count('requests')
+        response = self.session.get(f"{self.base_url}/{path}", params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            self._count('not_modified')
+            return cached['body']
+        response.raise_for_status()
+        self._count('downloaded')
+
+        body = response.json()
+        if cache_path is not None:
+            self._write_cache(cache_path, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'body': body,
+            })
+        return body
+
+    def _page(self, path, params, skip):
+        page_params = dict(params or {})
+        page_params.update({'$top': self.page_size, '$skip': skip})
+        return self.get(path, page_params)
+
+    def get_collection(self, path, params=None):
+        """Every entity of an OData collection, fetched in $skip/$top pages.
+
+        The first page asks for $count so the remaining pages can be
+        requested concurrently; without a count, pages are read in order
+        until a short one comes back.
+        """
+        params = dict(params or {})
+        params['$count'] = 'true'
+        first = self._page(path, params, 0)
+        values = list(first.get('value', []))
+        total = first.get('@odata.count')
+
+        if total is None:
+            page, skip = values, self.page_size
+            while len(page) == self.page_size:
+                page = self._page(path, params, skip).get('value', [])
+                values.extend(page)
+                skip += self.page_size
+            return values
+
+        skips = range(self.page_size, total, self.page_size)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for page in executor.map(lambda skip: self._page(path, params, skip), skips):
+                values.extend(page.get('value', []))
+        return values
+
+    def get_courses(self):
+        return self.get_collection('Courses', {'$expand': 'Subject'})
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,158 @@
+""" Per-request SQL instrumentation: statement counts, DB time and query budgets """
+# query_profiler.py
+# Listens to cursor events on every SQLAlchemy engine and charges each
+# statement to the Flask request that issued it. Statements run outside a
+# request (background workers, CLI commands) are ignored.
+
+import heapq
+import hmac
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_KEPT = 5
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL statements than its declared budget"""
+
+
+def query_budget(max_queries):
+    """Declare the most SQL statements a view may run per request"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            return view(*args, **kwargs)
+        wrapped.query_budget = max_queries
+        return wrapped
+    return decorator
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+        self.slowest = []  # min-heap of (seconds, statement)
+
+    def add(self, statements):
+        self.requests += 1
+        self.queries += len(statements)
+        self.max_queries = max(self.max_queries, len(statements))
+        for elapsed, statement in statements:
+            self.db_time += elapsed
+            if len(self.slowest) < SLOWEST_KEPT:
+                heapq.heappush(self.slowest, (elapsed, statement))
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, statement))
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'queries': self.queries,
+            'avg_queries': round(self.queries / self.requests, 2) if self.requests else 0,
+            'max_queries': self.max_queries,
+            'db_time_ms': round(self.db_time * 1000, 2),
+            'avg_db_time_ms': round(self.db_time * 1000 / self.requests, 2) if self.requests else 0,
+            'slowest': [{'ms': round(elapsed * 1000, 2), 'statement': statement[:300]}
+                        for elapsed, statement in sorted(self.slowest, reverse=True)],
+        }
+
+
+class QueryProfiler:
+    """Flask extension recording SQL statements per request and per endpoint.
+
+    Config:
+        QUERY_STATS_HEADERS   add X-DB-Query-Count / X-DB-Time-ms headers (default: app.debug)
+        QUERY_BUDGET_ENFORCE  raise QueryBudgetExceeded when a view exceeds its budget (default: app.testing)
+        METRICS_TOKEN         if set, /metrics requires it in the X-Metrics-Token header;
+                              if not, /metrics is only served by debug and testing apps
+    """
+
+    _listening = False
+
+    def __init__(self, app=None):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_STATS_HEADERS', app.debug)
+        app.config.setdefault('QUERY_BUDGET_ENFORCE', None)
+        app.config.setdefault('METRICS_TOKEN', None)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['query_profiler'] = self
+        QueryProfiler._listen()
+
+    @classmethod
+    def _listen(cls):
+        if cls._listening:
+            return
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        cls._listening = True
+
+    def _start_request(self):
+        g.query_log = []
+
+    def _finish_request(self, response):
+        statements = g.pop('query_log', None)
+        if statements is None:
+            return response
+        endpoint = request.endpoint or 'unknown'
+        with self.lock:
+            self.endpoints.setdefault(endpoint, EndpointStats()).add(statements)
+
+        if current_app.config['QUERY_STATS_HEADERS']:
+            response.headers['X-DB-Query-Count'] = str(len(statements))
+            response.headers['X-DB-Time-ms'] = f"{sum(e for e, _ in statements) * 1000:.2f}"
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        if budget is not None and len(statements) > budget:
+            message = f"{endpoint} ran {len(statements)} SQL statements, budget is {budget}"
+            enforce = current_app.config['QUERY_BUDGET_ENFORCE']
+            if enforce or (enforce is None and current_app.testing):
+                raise QueryBudgetExceeded(message + ':\n' + '\n'.join(s for _, s in statements))
+            current_app.logger.warning(message)
+        return response
+
+    def snapshot(self):
+        with self.lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in sorted(self.endpoints.items())}
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+    def metrics_view(self):
+        if not metrics_allowed():
+            return jsonify({'error': 'Forbidden'}), 403
+        g.pop('query_log', None)  # don't count the metrics request itself
+        return jsonify({'endpoints': self.snapshot()})
+
+
+def metrics_allowed():
+    """Whether the request may read metrics, which include SQL text"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        return hmac.compare_digest(request.headers.get('X-Metrics-Token', ''), token)
+    return current_app.debug or current_app.testing
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_start'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('query_start', None)
+    if started is not None and has_request_context() and 'query_log' in g:
+        g.query_log.append((time.perf_counter() - started, statement))
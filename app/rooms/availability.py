@@ -0,0 +1,43 @@
+""" Per-room interval index over one day's bookings """
+# availability.py
+# Built from a single query for the day's active bookings, then answers
+# "who has this room now" and "when is it next booked" without going back
+# to the database for each room.
+
+from bisect import bisect_right
+from collections import defaultdict
+
+
+class BookingIntervalIndex:
+    """Bookings grouped by (location_name, room_number) and sorted by start time"""
+
+    def __init__(self, bookings):
+        self.rooms = defaultdict(list)
+        for booking in bookings:
+            self.rooms[(booking.location_name, booking.room_number)].append(booking)
+        self.starts = {}
+        for key, room_bookings in self.rooms.items():
+            room_bookings.sort(key=lambda b: (b.start_time, b.end_time))
+            self.starts[key] = [b.start_time for b in room_bookings]
+
+    def current_booking(self, location_name, room_number, at):
+        """Booking covering time `at`, or None"""
+        key = (location_name, room_number)
+        room_bookings = self.rooms.get(key)
+        if not room_bookings:
+            return None
+        # Only bookings that started at or before `at` can cover it
+        for booking in room_bookings[:bisect_right(self.starts[key], at)]:
+            if booking.end_time > at:
+                return booking
+        return None
+
+    def next_booking(self, location_name, room_number, at):
+        """First booking starting after time `at`, or None"""
+        key = (location_name, room_number)
+        room_bookings = self.rooms.get(key)
+        if not room_bookings:
+            return None
+        i = bisect_right(self.starts[key], at)
+        return room_bookings[i] if i < len(room_bookings) else None
+
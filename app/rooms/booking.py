@@ -0,0 +1,118 @@
+""" Room booking engine: canonical overlap check and per-room serialization """
+# booking.py
+# Two requests for the same room must not both pass the conflict check. We
+# serialize per room inside the process with striped locks, and across
+# processes by inserting the new row *before* checking: on SQLite the insert
+# takes the database write lock, so no other booking can commit between our
+# check and our commit. The room's occupancy bitmap is updated in the same
+# transaction. Batch and recurring bookings go through the same path: all
+# occurrences are inserted, checked against the room's other bookings with
+# one query, and the conflicting ones dropped before the single commit.
+
+import threading
+from datetime import timedelta
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.rooms.occupancy import mark_booked
+
+
+MAX_OCCURRENCES = 16
+REPEAT_STEPS = {'daily': timedelta(days=1), 'weekly': timedelta(weeks=1)}
+
+
+class BookingConflict(Exception):
+    """The requested slot overlaps an active booking"""
+
+
+def expand_recurrence(first_date, repeat, count=None, until=None, interval=1):
+    """Dates of a daily or weekly rule starting at first_date, ending after count dates or on until"""
+    if repeat not in REPEAT_STEPS:
+        raise ValueError(f'repeat must be one of {", ".join(REPEAT_STEPS)}')
+    if count is None and until is None:
+        raise ValueError('Give count or until')
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError('count and interval must be positive')
+    step = REPEAT_STEPS[repeat] * interval
+    dates = []
+    day = first_date
+    while (count is None or len(dates) < count) and (until is None or day <= until):
+        if len(dates) == MAX_OCCURRENCES:
+            raise ValueError(f'At most {MAX_OCCURRENCES} occurrences per request')
+        dates.append(day)
+        day += step
+    return dates
+
+
+def overlap_clause(model, start_time, end_time):
+    """The one overlap predicate: [start, end) intervals intersect"""
+    return (model.start_time < end_time) & (model.end_time > start_time)
+
+
+def intervals_overlap(start_a, end_a, start_b, end_b):
+    return start_a < end_b and end_a > start_b
+
+
+class RoomLocks:
+    """Fixed pool of locks; each room always maps to the same one"""
+
+    def __init__(self, stripes=64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def for_room(self, location_name, room_number):
+        return self._locks[hash((location_name, room_number)) % len(self._locks)]
+
+
+room_locks = RoomLocks()
+
+
+def create_bookings(db, model, dates, **fields):
+    """Book the same room and times on each of dates in one transaction
+
+    Occurrences overlapping an active booking are skipped. Returns
+    {date: booking id or None} in the order of dates.
+    """
+    if fields['end_time'] <= fields['start_time']:
+        raise ValueError('End time must be after start time')
+    dates = list(dict.fromkeys(dates))
+    if not dates:
+        return {}
+
+    with room_locks.for_room(fields['location_name'], fields['room_number']):
+        try:
+            # One multi-row INSERT; the dates are unique, so they tell the returned ids apart.
+            # It also takes the write lock before we look for conflicts
+            inserted = db.session.execute(
+                db.insert(model).returning(model.id, model.booking_date),
+                [dict(fields, booking_date=day, status='active') for day in dates]
+            ).all()
+            booking_ids = {day: booking_id for booking_id, day in inserted}
+            taken = [day for (day,) in db.session.query(model.booking_date).filter(
+                model.location_name == fields['location_name'],
+                model.room_number == fields['room_number'],
+                model.booking_date.in_(dates),
+                model.status == 'active',
+                overlap_clause(model, fields['start_time'], fields['end_time']),
+                model.id.notin_(booking_ids.values())
+            ).distinct()]
+            if taken:
+                db.session.execute(db.delete(model).where(model.id.in_([booking_ids.pop(day) for day in taken])))
+            mark_booked(fields['location_name'], fields['room_number'], list(booking_ids),
+                        fields['start_time'], fields['end_time'])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    return {day: booking_ids.get(day) for day in dates}
+
+
+def create_booking(db, model, booking_date, **fields):
+    """Insert and commit a booking, raising BookingConflict if the slot is taken"""
+    booking_id = create_bookings(db, model, [booking_date], **fields)[booking_date]
+    if booking_id is None:
+        raise BookingConflict('Room is already booked for this time slot')
+    # Hand back the committed row without selecting it again
+    booking = model(id=booking_id, booking_date=booking_date, status='active', **fields)
+    make_transient_to_detached(booking)
+    db.session.add(booking)
+    return booking
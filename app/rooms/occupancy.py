@@ -0,0 +1,113 @@
+""" Per-room, per-day occupancy bitmaps in 15-minute slots """
+# occupancy.py
+# A day has 96 slots. Each RoomOccupancy row keeps the booked ones as two
+# 48-bit integers (morning and afternoon), small enough for an SQLite
+# INTEGER, so a booking is merged in with a single `|` upsert. A slot counts
+# as booked if any active booking touches it. Free-room search loads the
+# rooms big enough for the group together with that day's bitmaps in one
+# query and tests each room with one AND instead of scanning bookings.
+# Cancelling recomputes the room's day from its remaining bookings, because
+# two bookings can share a partly used slot.
+
+from collections import defaultdict
+
+from sqlalchemy import bindparam, text
+
+from app.database import db
+from app.database.models import RoomBooking, RoomOccupancy, StudyRoom
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+HALF_DAY_SLOTS = SLOTS_PER_DAY // 2
+HALF_DAY_MASK = (1 << HALF_DAY_SLOTS) - 1
+
+
+def slot_mask(start_time, end_time):
+    """Bitmap of the slots touched by [start_time, end_time)"""
+    first = (start_time.hour * 60 + start_time.minute) // SLOT_MINUTES
+    end_minutes = end_time.hour * 60 + end_time.minute
+    last = -(-end_minutes // SLOT_MINUTES)  # first slot after the interval
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def split_mask(mask):
+    """(slots_am, slots_pm) columns of a day bitmap"""
+    return mask & HALF_DAY_MASK, mask >> HALF_DAY_SLOTS
+
+
+def join_mask(slots_am, slots_pm):
+    return (slots_am or 0) | (slots_pm or 0) << HALF_DAY_SLOTS
+
+
+def _save(rows, merge):
+    """Upsert (location_name, room_number, day, mask) rows in one executemany"""
+    assignment = 'room_occupancy.{0} | excluded.{0}' if merge else 'excluded.{0}'
+    statement = text(f"""
+        INSERT INTO room_occupancy (day, room_id, slots_am, slots_pm)
+        SELECT :day, id, :slots_am, :slots_pm FROM study_room
+        WHERE location_name = :location_name AND room_number = :room_number
+        ON CONFLICT (day, room_id) DO UPDATE SET
+            slots_am = {assignment.format('slots_am')}, slots_pm = {assignment.format('slots_pm')}
+    """).bindparams(bindparam('day', type_=db.Date))
+    params = []
+    for location_name, room_number, day, mask in rows:
+        slots_am, slots_pm = split_mask(mask)
+        params.append({
+            'day': day, 'slots_am': slots_am, 'slots_pm': slots_pm,
+            'location_name': location_name, 'room_number': room_number,
+        })
+    if params:
+        db.session.execute(statement, params)
+
+
+def mark_booked(location_name, room_number, days, start_time, end_time):
+    """Add [start_time, end_time) on each of days to the room's bitmaps, in the caller's transaction"""
+    mask = slot_mask(start_time, end_time)
+    _save([(location_name, room_number, day, mask) for day in days], merge=True)
+
+
+def refresh_occupancy(location_name, room_number, day):
+    """Recompute one room's day from its active bookings, e.g. after a cancellation"""
+    mask = 0
+    for start_time, end_time in db.session.query(RoomBooking.start_time, RoomBooking.end_time).filter_by(
+        location_name=location_name, room_number=room_number, booking_date=day, status='active'
+    ):
+        mask |= slot_mask(start_time, end_time)
+    _save([(location_name, room_number, day, mask)], merge=False)
+
+
+def rebuild_room_occupancy():
+    """Recompute every bitmap from the active bookings; returns the number of rows"""
+    rooms = {(location_name, room_number): room_id for room_id, location_name, room_number in
+             db.session.query(StudyRoom.id, StudyRoom.location_name, StudyRoom.room_number)}
+    masks = defaultdict(int)
+    for location_name, room_number, day, start_time, end_time in db.session.query(
+        RoomBooking.location_name, RoomBooking.room_number, RoomBooking.booking_date,
+        RoomBooking.start_time, RoomBooking.end_time
+    ).filter_by(status='active'):
+        room_id = rooms.get((location_name, room_number))
+        if room_id is not None:
+            masks[(day, room_id)] |= slot_mask(start_time, end_time)
+
+    db.session.query(RoomOccupancy).delete()
+    rows = []
+    for (day, room_id), mask in masks.items():
+        slots_am, slots_pm = split_mask(mask)
+        rows.append({'day': day, 'room_id': room_id, 'slots_am': slots_am, 'slots_pm': slots_pm})
+    if rows:
+        db.session.execute(db.insert(RoomOccupancy), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def find_free_rooms(day, start_time, end_time, group_size=1):
+    """Rooms seating group_size with no booking in [start_time, end_time) on day, smallest first"""
+    mask = slot_mask(start_time, end_time)
+    rows = db.session.query(StudyRoom, RoomOccupancy.slots_am, RoomOccupancy.slots_pm).outerjoin(
+        RoomOccupancy, (RoomOccupancy.room_id == StudyRoom.id) & (RoomOccupancy.day == day)
+    ).filter(StudyRoom.capacity >= group_size).order_by(
+        StudyRoom.capacity, StudyRoom.location_name, StudyRoom.room_number
+    ).all()
+    return [room for room, slots_am, slots_pm in rows if not join_mask(slots_am, slots_pm) & mask]
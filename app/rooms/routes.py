@@ -0,0 +1,357 @@
+from datetime import datetime, timedelta
+
+from flask import Blueprint, render_template, session, redirect, url_for, request, jsonify
+
+from app.auth.utils import get_current_user
+from app.cache import TTLCache
+from app.database import db
+from app.database.models import PurdueLocation, RoomBooking, StudyRoom
+from app.notifications.emails import send_email_notification
+from app.query_profiler import query_budget
+from app.rooms.availability import BookingIntervalIndex
+from app.rooms.booking import MAX_OCCURRENCES, BookingConflict, create_booking, create_bookings, expand_recurrence
+from app.rooms.occupancy import find_free_rooms, refresh_occupancy
+
+rooms_bp = Blueprint('rooms', __name__)
+
+def check_room(data):
+    """Error message if the requested room does not exist or is too small, else None"""
+    room = StudyRoom.query.filter_by(location_name=data['location_name'], room_number=data['room_number']).first()
+    if not room:
+        return 'Room not found'
+    if int(data['group_size']) > room.capacity:
+        return f'Room fits at most {room.capacity} people'
+    return None
+
+@rooms_bp.route('/book_room', methods=['POST'])
+@query_budget(7)  # with EMAIL_USER set, which adds the outbox INSERT
+def book_room():
+    """Book a study room"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    try:
+        data = request.get_json()
+        user_id = session['user']['id']
+        
+        # Validate booking data
+        required_fields = ['location_name', 'room_number', 'booking_date', 'start_time', 'end_time', 'group_size']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'success': False, 'error': f'Missing {field}'})
+        
+        booking_date = datetime.strptime(data['booking_date'], '%Y-%m-%d').date()
+        start_time = datetime.strptime(data['start_time'], '%H:%M').time()
+        end_time = datetime.strptime(data['end_time'], '%H:%M').time()
+        
+        room_error = check_room(data)
+        if room_error:
+            return jsonify({'success': False, 'error': room_error})
+        
+        try:
+            booking = create_booking(
+                db, RoomBooking,
+                user_id=user_id,
+                location_name=data['location_name'],
+                room_number=data['room_number'],
+                booking_date=booking_date,
+                start_time=start_time,
+                end_time=end_time,
+                purpose=data.get('purpose', ''),
+                group_size=int(data['group_size'])
+            )
+        except (BookingConflict, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)})
+        
+        invalidate_room_availability()
+        
+        # Send confirmation email
+        user = get_current_user()
+        if user:
+            email_subject = f"Room Booking Confirmation - {data['room_number']}"
+            email_content = f"""
+            Your study room has been successfully booked!
+            
+            Details:
+            • Room: {data['room_number']} at {data['location_name']}
+            • Date: {booking_date.strftime('%B %d, %Y')}
+            • Time: {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}
+            • Group Size: {data['group_size']} people
+            • Purpose: {data.get('purpose', 'Study session')}
+            
+            Please arrive on time and follow all library policies. Boiler Up!
+            """
+            send_email_notification(user.email, email_subject, email_content)
+            db.session.commit()
+        
+        return jsonify({
+            'success': True, 
+            'message': 'Room booked successfully!',
+            'booking_id': booking.id
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@rooms_bp.route('/book_room/recurring', methods=['POST'])
+@query_budget(7)  # with EMAIL_USER set, which adds the outbox INSERT
+def book_room_recurring():
+    """Book a study room on several dates, given as a list or a daily/weekly rule"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    try:
+        data = request.get_json()
+        user_id = session['user']['id']
+        
+        required_fields = ['location_name', 'room_number', 'start_time', 'end_time', 'group_size']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'success': False, 'error': f'Missing {field}'})
+        
+        start_time = datetime.strptime(data['start_time'], '%H:%M').time()
+        end_time = datetime.strptime(data['end_time'], '%H:%M').time()
+        try:
+            if data.get('dates'):
+                dates = [datetime.strptime(day, '%Y-%m-%d').date() for day in data['dates']]
+                if len(dates) > MAX_OCCURRENCES:
+                    raise ValueError(f'At most {MAX_OCCURRENCES} occurrences per request')
+            elif data.get('booking_date'):
+                dates = expand_recurrence(
+                    datetime.strptime(data['booking_date'], '%Y-%m-%d').date(),
+                    data.get('repeat', 'weekly'),
+                    count=int(data['count']) if data.get('count') else None,
+                    until=datetime.strptime(data['until'], '%Y-%m-%d').date() if data.get('until') else None,
+                    interval=int(data.get('interval', 1))
+                )
+            else:
+                raise ValueError('Missing dates or booking_date')
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)})
+        
+        room_error = check_room(data)
+        if room_error:
+            return jsonify({'success': False, 'error': room_error})
+        
+        try:
+            bookings = create_bookings(
+                db, RoomBooking, dates,
+                user_id=user_id,
+                location_name=data['location_name'],
+                room_number=data['room_number'],
+                start_time=start_time,
+                end_time=end_time,
+                purpose=data.get('purpose', ''),
+                group_size=int(data['group_size'])
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)})
+        
+        results = []
+        for day, booking_id in bookings.items():
+            if booking_id:
+                results.append({'date': day.isoformat(), 'booked': True, 'booking_id': booking_id})
+            else:
+                results.append({'date': day.isoformat(), 'booked': False,
+                                'error': 'Room is already booked for this time slot'})
+        booked_dates = [day for day, booking_id in bookings.items() if booking_id]
+        if not booked_dates:
+            return jsonify({'success': False, 'error': 'Room is already booked on every date', 'results': results})
+        
+        invalidate_room_availability()
+        
+        # One confirmation for the whole series
+        user = get_current_user()
+        if user:
+            email_subject = f"Room Booking Confirmation - {data['room_number']} ({len(booked_dates)} sessions)"
+            email_content = f"""
+            Your study room has been booked for {len(booked_dates)} sessions!
+            
+            Details:
+            • Room: {data['room_number']} at {data['location_name']}
+            • Dates: {', '.join(day.strftime('%B %d, %Y') for day in booked_dates)}
+            • Time: {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}
+            • Group Size: {data['group_size']} people
+            • Purpose: {data.get('purpose', 'Study session')}
+            
+            Please arrive on time and follow all library policies. Boiler Up!
+            """
+            send_email_notification(user.email, email_subject, email_content)
+            db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Room booked for {len(booked_dates)} of {len(results)} dates',
+            'booked': len(booked_dates),
+            'results': results
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@rooms_bp.route('/my_bookings')
+@query_budget(2)
+def my_bookings():
+    """View user's room bookings"""
+    if 'user' not in session:
+        return redirect(url_for('auth.index'))
+    
+    user_id = session['user']['id']
+    
+    # Get upcoming bookings
+    upcoming_bookings = RoomBooking.query.filter_by(
+        user_id=user_id, 
+        status='active'
+    ).filter(
+        RoomBooking.booking_date >= datetime.now().date()
+    ).order_by(RoomBooking.booking_date, RoomBooking.start_time).all()
+    
+    # Get past bookings (last 30 days)
+    past_date = datetime.now().date() - timedelta(days=30)
+    past_bookings = RoomBooking.query.filter_by(
+        user_id=user_id
+    ).filter(
+        RoomBooking.booking_date >= past_date,
+        RoomBooking.booking_date < datetime.now().date()
+    ).order_by(RoomBooking.booking_date.desc(), RoomBooking.start_time.desc()).all()
+    
+    return render_template('my_bookings.html', 
+                         upcoming_bookings=upcoming_bookings, 
+                         past_bookings=past_bookings,
+                         now=datetime.now())
+
+@rooms_bp.route('/cancel_booking/<int:booking_id>', methods=['POST'])
+@query_budget(4)
+def cancel_booking(booking_id):
+    """Cancel a room booking"""
+    if 'user' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'})
+    
+    try:
+        booking = RoomBooking.query.get(booking_id)
+        if not booking:
+            return jsonify({'success': False, 'error': 'Booking not found'})
+        
+        if booking.user_id != session['user']['id']:
+            return jsonify({'success': False, 'error': 'Unauthorized'})
+        
+        # Can only cancel future bookings
+        booking_datetime = datetime.combine(booking.booking_date, booking.start_time)
+        if booking_datetime <= datetime.now():
+            return jsonify({'success': False, 'error': 'Cannot cancel past bookings'})
+        
+        booking.status = 'cancelled'
+        refresh_occupancy(booking.location_name, booking.room_number, booking.booking_date)
+        db.session.commit()
+        invalidate_room_availability()
+        
+        return jsonify({'success': True, 'message': 'Booking cancelled successfully'})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+# Room availability is shared by every user polling it; booking changes clear it
+ROOM_AVAILABILITY_TTL = 15  # seconds
+room_availability_cache = TTLCache(ROOM_AVAILABILITY_TTL)
+
+def invalidate_room_availability():
+    room_availability_cache.clear()
+
+def compute_room_availability(now=None):
+    """Availability of every library room, from one query for today's bookings"""
+    # Get study rooms and their libraries from database
+    study_rooms = db.session.query(StudyRoom, PurdueLocation).join(
+        PurdueLocation, PurdueLocation.name == StudyRoom.location_name
+    ).order_by(PurdueLocation.id, StudyRoom.room_number).all()
+    
+    # Get current date and time for availability checking
+    now = now or datetime.now()
+    current_date = now.date()
+    current_time = now.time()
+    
+    todays_bookings = BookingIntervalIndex(RoomBooking.query.filter_by(
+        booking_date=current_date,
+        status='active'
+    ).all())
+    
+    rooms = {}
+    for room, location in study_rooms:
+        # Check if room is currently booked
+        current_booking = todays_bookings.current_booking(location.name, room.room_number, current_time)
+        
+        status = 'booked' if current_booking else 'available'
+        next_available = None
+        free_until = None
+        if current_booking:
+            # Back-to-back bookings keep the room taken until the last of them ends
+            end_time = current_booking.end_time
+            following = todays_bookings.next_booking(location.name, room.room_number, current_time)
+            while following and following.start_time <= end_time:
+                end_time = max(end_time, following.end_time)
+                following = todays_bookings.next_booking(location.name, room.room_number, following.start_time)
+            next_available = end_time.strftime('%I:%M %p')
+        else:
+            upcoming = todays_bookings.next_booking(location.name, room.room_number, current_time)
+            if upcoming:
+                free_until = upcoming.start_time.strftime('%I:%M %p')
+        
+        if location.name not in rooms:
+            rooms[location.name] = {'location': location.name, 'building': location.building, 'rooms': []}
+        rooms[location.name]['rooms'].append({
+            'room_number': room.room_number,
+            'capacity': room.capacity,
+            'status': status,
+            'next_available': next_available,
+            'free_until': free_until,  # start of the room's next booking today, if any
+            'current_booking': {
+                'user': f"User {current_booking.user_id}",
+                'end_time': current_booking.end_time.strftime('%I:%M %p'),
+                'purpose': current_booking.purpose
+            } if current_booking else None,
+            'amenities': location.amenities.split(', ') if location.amenities else []
+        })
+    
+    return list(rooms.values())
+
+@rooms_bp.route('/find_study_rooms')
+@query_budget(2)
+def find_study_rooms():
+    """Get available study rooms at Purdue with real booking status"""
+    if 'user' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    rooms = room_availability_cache.get_or_set(datetime.now().date(), compute_room_availability)
+    return jsonify({'study_locations': rooms})
+
+@rooms_bp.route('/api/rooms/free')
+@query_budget(1)
+def free_rooms():
+    """Rooms free for a whole time range, for a group of a given size, across all libraries"""
+    if 'user' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    try:
+        day = datetime.strptime(request.args.get('date') or datetime.now().strftime('%Y-%m-%d'), '%Y-%m-%d').date()
+        start_time = datetime.strptime(request.args['start'], '%H:%M').time()
+        end_time = datetime.strptime(request.args['end'], '%H:%M').time()
+        group_size = int(request.args.get('group_size', 1))
+    except (KeyError, ValueError):
+        return jsonify({'error': 'Expected date=YYYY-MM-DD, start=HH:MM, end=HH:MM and group_size'}), 400
+    if end_time <= start_time:
+        return jsonify({'error': 'End time must be after start time'}), 400
+    
+    rooms = find_free_rooms(day, start_time, end_time, group_size)
+    return jsonify({
+        'date': day.isoformat(),
+        'start': start_time.strftime('%H:%M'),
+        'end': end_time.strftime('%H:%M'),
+        'group_size': group_size,
+        'rooms': [{
+            'location': room.location_name,
+            'room_number': room.room_number,
+            'capacity': room.capacity
+        } for room in rooms]
+    })
@@ -0,0 +1,43 @@
+"""Unit tests for the per-room booking interval index."""
+import unittest
+from datetime import time
+from types import SimpleNamespace
+
+from app.rooms.availability import BookingIntervalIndex
+
+
+def booking(room, start, end, location='Hicks Undergraduate Library'):
+    return SimpleNamespace(location_name=location, room_number=room, start_time=start, end_time=end)
+
+
+class BookingIntervalIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.morning = booking('Room 001', time(9), time(10))
+        self.noon = booking('Room 001', time(12), time(13, 30))
+        self.other = booking('Room 002', time(9, 30), time(11))
+        self.index = BookingIntervalIndex([self.noon, self.other, self.morning])
+
+    def test_current_booking(self):
+        """Test finding the booking that covers a time."""
+        library = 'Hicks Undergraduate Library'
+        self.assertIs(self.index.current_booking(library, 'Room 001', time(9)), self.morning)
+        self.assertIs(self.index.current_booking(library, 'Room 001', time(12, 45)), self.noon)
+        # End times are exclusive
+        self.assertIsNone(self.index.current_booking(library, 'Room 001', time(10)))
+        self.assertIs(self.index.current_booking(library, 'Room 002', time(10)), self.other)
+
+    def test_next_booking(self):
+        """Test finding the next booking after a time."""
+        library = 'Hicks Undergraduate Library'
+        self.assertIs(self.index.next_booking(library, 'Room 001', time(9, 30)), self.noon)
+        self.assertIs(self.index.next_booking(library, 'Room 001', time(8)), self.morning)
+        self.assertIsNone(self.index.next_booking(library, 'Room 001', time(12)))
+
+    def test_unknown_room(self):
+        """Test that rooms without bookings are free."""
+        self.assertIsNone(self.index.current_booking('WALC', 'Room 001', time(9)))
+        self.assertIsNone(self.index.next_booking('WALC', 'Room 001', time(9)))
+
+
+if __name__ == '__main__':
+    unittest.main()
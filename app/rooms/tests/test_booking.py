@@ -0,0 +1,126 @@
+"""Tests for room booking conflict detection."""
+import threading
+import unittest
+from datetime import date, datetime, time, timedelta
+
+from app import create_app
+from app.bootstrap import seed_locations
+from app.rooms.booking import (
+    MAX_OCCURRENCES, BookingConflict, create_booking, create_bookings, expand_recurrence, intervals_overlap
+)
+from app.database import db
+from app.database.models import RoomBooking
+from app.rooms.routes import compute_room_availability
+
+app = create_app('testing')
+
+
+class BookingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def book(self, start, end, room='Room 001', user_id=1):
+        return create_booking(
+            db, RoomBooking, user_id=user_id, location_name='Hicks Undergraduate Library',
+            room_number=room, booking_date=date(2026, 11, 2), start_time=start, end_time=end
+        )
+
+    def test_room_availability_shows_when_rooms_change_hands(self):
+        """Test that free rooms show their next booking and back-to-back bookings are followed."""
+        seed_locations()
+        self.book(time(10), time(11))
+        self.book(time(11), time(12))
+        self.book(time(14), time(15), room='Room 002')
+        library = compute_room_availability(datetime(2026, 11, 2, 10, 30))[0]
+        self.assertEqual(library['location'], 'Hicks Undergraduate Library')
+        rooms = {room['room_number']: room for room in library['rooms']}
+        self.assertEqual((rooms['Room 001']['status'], rooms['Room 001']['next_available']), ('booked', '12:00 PM'))
+        self.assertEqual((rooms['Room 002']['status'], rooms['Room 002']['free_until']), ('available', '02:00 PM'))
+        self.assertIsNone(rooms['Room 003']['free_until'])
+
+    def test_overlapping_booking_is_rejected(self):
+        """Test that any overlap with an active booking is a conflict."""
+        self.book(time(10), time(12))
+        for start, end in [(time(9), time(11)), (time(11), time(13)), (time(10, 30), time(11)), (time(9), time(13))]:
+            with self.assertRaises(BookingConflict):
+                self.book(start, end)
+        self.assertEqual(RoomBooking.query.count(), 1)
+
+    def test_adjacent_and_other_rooms_are_allowed(self):
+        """Test that back-to-back slots and other rooms do not conflict."""
+        self.book(time(10), time(12))
+        self.book(time(12), time(13))
+        self.book(time(8), time(10))
+        self.book(time(10), time(12), room='Room 002')
+        self.assertEqual(RoomBooking.query.count(), 4)
+
+    def test_cancelled_booking_frees_slot(self):
+        """Test that cancelled bookings are ignored."""
+        booking = self.book(time(10), time(12))
+        booking.status = 'cancelled'
+        db.session.commit()
+        self.book(time(10), time(12))
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            self.book(time(12), time(10))
+
+    def test_concurrent_bookings_for_one_slot(self):
+        """Test that only one of many simultaneous requests wins the slot."""
+        results = []
+
+        def attempt(user_id):
+            with app.app_context():
+                try:
+                    self.book(time(14), time(15), user_id=user_id)
+                    results.append('booked')
+                except BookingConflict:
+                    results.append('conflict')
+
+        threads = [threading.Thread(target=attempt, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count('booked'), 1)
+        self.assertEqual(RoomBooking.query.filter_by(status='active').count(), 1)
+
+    def test_expand_recurrence(self):
+        first = date(2026, 11, 2)
+        self.assertEqual(expand_recurrence(first, 'weekly', count=3),
+                         [first, date(2026, 11, 9), date(2026, 11, 16)])
+        self.assertEqual(expand_recurrence(first, 'daily', until=date(2026, 11, 8), interval=3),
+                         [first, date(2026, 11, 5), date(2026, 11, 8)])
+        for kwargs in [{}, {'count': 0}, {'count': MAX_OCCURRENCES + 1}]:
+            with self.assertRaises(ValueError):
+                expand_recurrence(first, 'weekly', **kwargs)
+        with self.assertRaises(ValueError):
+            expand_recurrence(first, 'monthly', count=2)
+
+    def test_create_bookings_skips_conflicting_dates(self):
+        """Test that a batch books the free dates and reports the taken ones."""
+        self.book(time(11), time(12))  # on 2026-11-02
+        dates = [date(2026, 11, 2) + timedelta(weeks=i) for i in range(4)]
+        bookings = create_bookings(
+            db, RoomBooking, dates + [dates[1]], user_id=2, location_name='Hicks Undergraduate Library',
+            room_number='Room 001', start_time=time(10), end_time=time(12)
+        )
+        self.assertEqual(list(bookings), dates)
+        self.assertIsNone(bookings[dates[0]])
+        self.assertTrue(all(bookings[day] for day in dates[1:]))
+        self.assertEqual(RoomBooking.query.filter_by(user_id=2).count(), 3)
+
+    def test_intervals_overlap(self):
+        self.assertTrue(intervals_overlap(1, 3, 2, 4))
+        self.assertFalse(intervals_overlap(1, 2, 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for room occupancy bitmaps and free-room search."""
+import unittest
+from datetime import date, time, timedelta
+
+from app import create_app
+from app.bootstrap import seed_locations
+from app.database import db
+from app.database.models import RoomBooking, RoomOccupancy, StudyRoom
+from app.rooms.booking import create_booking
+from app.rooms.occupancy import find_free_rooms, join_mask, rebuild_room_occupancy, slot_mask, split_mask
+
+app = create_app('testing')
+
+LIBRARY = 'Hicks Undergraduate Library'
+
+
+class SlotMaskTestCase(unittest.TestCase):
+    def test_slot_mask(self):
+        """Test that every 15-minute slot an interval touches is set."""
+        self.assertEqual(slot_mask(time(0), time(0, 15)), 0b1)
+        self.assertEqual(slot_mask(time(10), time(11)), 0b1111 << 40)
+        # Partly used slots count as booked
+        self.assertEqual(slot_mask(time(10, 10), time(10, 20)), 0b11 << 40)
+        self.assertEqual(slot_mask(time(23, 45), time(23, 59)), 1 << 95)
+        self.assertEqual(slot_mask(time(12), time(11)), 0)
+
+    def test_split_and_join(self):
+        mask = slot_mask(time(11), time(13))
+        slots_am, slots_pm = split_mask(mask)
+        self.assertEqual(slots_am, 0b1111 << 44)
+        self.assertEqual(slots_pm, 0b1111)
+        self.assertEqual(join_mask(slots_am, slots_pm), mask)
+        self.assertEqual(join_mask(None, None), 0)
+
+
+class OccupancyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        seed_locations()
+        self.day = date.today() + timedelta(days=1)
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Student'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def book(self, start, end, room='Room 001'):
+        return create_booking(
+            db, RoomBooking, user_id=1, location_name=LIBRARY, room_number=room,
+            booking_date=self.day, start_time=start, end_time=end
+        )
+
+    def occupancy(self, room='Room 001'):
+        room_id = StudyRoom.query.filter_by(location_name=LIBRARY, room_number=room).one().id
+        row = db.session.get(RoomOccupancy, (self.day, room_id))
+        return join_mask(row.slots_am, row.slots_pm) if row else 0
+
+    def test_rooms_have_stable_capacities(self):
+        rooms = StudyRoom.query.filter_by(location_name=LIBRARY).order_by(StudyRoom.room_number).all()
+        self.assertEqual([room.capacity for room in rooms[:5]], [4, 6, 8, 12, 4])
+        seed_locations()
+        self.assertEqual(StudyRoom.query.filter_by(location_name=LIBRARY).count(), len(rooms))
+
+    def test_bookings_and_cancellations_update_the_bitmap(self):
+        morning = self.book(time(9), time(10, 10))
+        self.book(time(10, 10), time(11))
+        self.assertEqual(self.occupancy(), slot_mask(time(9), time(11)))
+
+        response = self.client.post(f'/cancel_booking/{morning.id}').get_json()
+        self.assertTrue(response['success'])
+        # The slot shared with the remaining booking stays booked
+        self.assertEqual(self.occupancy(), slot_mask(time(10), time(11)))
+        self.assertEqual(rebuild_room_occupancy(), 1)
+        self.assertEqual(self.occupancy(), slot_mask(time(10), time(11)))
+
+    def test_find_free_rooms(self):
+        """Test that booked and too small rooms are left out, smallest rooms first."""
+        self.book(time(14), time(16), room='Room 003')
+        free = find_free_rooms(self.day, time(15), time(17), group_size=6)
+        names = [(room.location_name, room.room_number) for room in free]
+        self.assertNotIn((LIBRARY, 'Room 003'), names)
+        self.assertIn((LIBRARY, 'Room 002'), names)
+        self.assertTrue(all(room.capacity >= 6 for room in free))
+        self.assertEqual([room.capacity for room in free], sorted(room.capacity for room in free))
+        # Back to back with the booking is free
+        self.assertIn((LIBRARY, 'Room 003'),
+                      [(room.location_name, room.room_number) for room in find_free_rooms(self.day, time(16), time(17), 6)])
+
+    def test_free_rooms_api(self):
+        self.book(time(14), time(16), room='Room 004')
+        response = self.client.get(f'/api/rooms/free?date={self.day}&start=15:00&end=16:00&group_size=12')
+        rooms = response.get_json()['rooms']
+        self.assertTrue(rooms)
+        self.assertNotIn({'location': LIBRARY, 'room_number': 'Room 004', 'capacity': 12}, rooms)
+        self.assertEqual(self.client.get('/api/rooms/free?start=16:00&end=15:00').status_code, 400)
+
+    def test_book_room_checks_room_and_capacity(self):
+        payload = {'location_name': LIBRARY, 'room_number': 'Room 001', 'booking_date': self.day.isoformat(),
+                   'start_time': '10:00', 'end_time': '11:00', 'group_size': 5}
+        self.assertIn('at most 4', self.client.post('/book_room', json=payload).get_json()['error'])
+        payload['room_number'] = 'Room 999'
+        self.assertEqual(self.client.post('/book_room', json=payload).get_json()['error'], 'Room not found')
+        payload.update(room_number='Room 004', group_size=12)
+        self.assertTrue(self.client.post('/book_room', json=payload).get_json()['success'])
+        self.assertEqual(self.occupancy('Room 004'), slot_mask(time(10), time(11)))
+
+    def test_recurring_booking_api(self):
+        """Test that a weekly series books the free weeks and marks their bitmaps."""
+        self.book(time(10), time(11), room='Room 004')
+        payload = {'location_name': LIBRARY, 'room_number': 'Room 004', 'booking_date': self.day.isoformat(),
+                   'repeat': 'weekly', 'count': 3, 'start_time': '10:00', 'end_time': '11:00', 'group_size': 8}
+        response = self.client.post('/book_room/recurring', json=payload).get_json()
+        self.assertTrue(response['success'])
+        self.assertEqual(response['booked'], 2)
+        self.assertEqual([result['booked'] for result in response['results']], [False, True, True])
+        self.day += timedelta(weeks=2)
+        self.assertEqual(self.occupancy('Room 004'), slot_mask(time(10), time(11)))
+
+        payload['group_size'] = 20
+        self.assertIn('at most 12', self.client.post('/book_room/recurring', json=payload).get_json()['error'])
+        payload.update(group_size=2, count=None)
+        self.assertEqual(self.client.post('/book_room/recurring', json=payload).get_json()['error'], 'Give count or until')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+""" Server-side Flask sessions shared by every worker process """
+# sessions.py
+# The session cookie only carries a signed random id; the session data lives
+# in a store every worker can reach. Stores follow the small part of the
+# Redis client API the session interface needs (get / setex / delete), so a
+# redis.Redis client can be used as-is next to the SQLite and file stores.
+
+import os
+import re
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+PURGE_EVERY = 500  # writes between sweeps of expired sessions
+REFRESH_INTERVAL = 600  # seconds between expiry extensions of an unchanged session
+REFRESHED_KEY = '_refreshed_at'
+_SESSION_ID = re.compile(r'^[A-Za-z0-9_-]{20,100}$')
+
+
+def load_secret_key(path):
+    """Read the app secret from path, creating it once if it does not exist.
+
+    Every worker on the host reads the same file, so cookies signed by one
+    worker are accepted by all of them.
+    """
+    path = Path(path)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, 'w') as file:
+            file.write(secrets.token_hex(32))
+        try:
+            os.link(tmp_path, path)  # fails if another worker got there first
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    return path.read_text().strip()
+
+
+class SQLiteSessionStore:
+    """Session store in a local SQLite file, shared by the workers of one host"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS session_store '
+                         '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        # A connection must not be used in a process forked after it was opened
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM session_store WHERE key = ? AND expires > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def setex(self, key, seconds, value):
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO session_store (key, value, expires) VALUES (?, ?, ?)',
+                     (key, value, time.time() + seconds))
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute('DELETE FROM session_store WHERE expires <= ?', (time.time(),))
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM session_store WHERE key = ?', (key,))
+
+
+class FileSessionStore:
+    """Session store with one file per session, e.g. on a shared volume"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+
+    def _path(self, key):
+        return self.directory / re.sub(r'[^A-Za-z0-9_-]', '_', key)
+
+    def get(self, key):
+        try:
+            expires, value = self._path(key).read_bytes().split(b'\n', 1)
+        except (OSError, ValueError):
+            return None
+        return value if float(expires) > time.time() else None
+
+    def setex(self, key, seconds, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(f'{time.time() + seconds}\n'.encode() + value)
+        os.replace(tmp_path, self._path(key))
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.purge()
+
+    def delete(self, key):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def purge(self):
+        for path in self.directory.iterdir():
+            if path.suffix != '.tmp' and self.get(path.name) is None:
+                path.unlink(missing_ok=True)
+
+
+def make_session_store(backend, instance_path, url=None):
+    """Store for SESSION_BACKEND 'sqlite', 'filesystem' or 'redis'"""
+    if backend == 'sqlite':
+        return SQLiteSessionStore(url or Path(instance_path) / 'sessions.db')
+    if backend == 'filesystem':
+        return FileSessionStore(url or Path(instance_path) / 'sessions')
+    if backend == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SESSION_BACKEND=redis needs the redis package (pip install redis)")
+        return redis.Redis.from_url(url or 'redis://localhost:6379/0')
+    raise ValueError(f"Unknown session backend: {backend}")
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.previous_sid = None
+
+    def regenerate(self):
+        """Move the data to a fresh session id, e.g. after login"""
+        if not self.new and self.previous_sid is None:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keeps session data in store and only a signed session id in the cookie"""
+
+    serializer = TaggedJSONSerializer()
+    key_prefix = 'session:'
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode()
+            except BadSignature:
+                sid = None
+            if sid and _SESSION_ID.match(sid):
+                data = self.store.get(self.key_prefix + sid)
+                if data is not None:
+                    try:
+                        return ServerSideSession(self.serializer.loads(data.decode()), sid=sid)
+                    except ValueError:
+                        pass
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.previous_sid:
+            self.store.delete(self.key_prefix + session.previous_sid)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(self.key_prefix + session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        if not self.should_set_cookie(app, session):
+            return
+        # An unchanged session is only rewritten, to push back its expiry,
+        # once per SESSION_REFRESH_INTERVAL instead of on every request
+        now = time.time()
+        interval = app.config.get('SESSION_REFRESH_INTERVAL', REFRESH_INTERVAL)
+        if not session.modified and now - session.get(REFRESHED_KEY, 0) < interval:
+            return
+        session[REFRESHED_KEY] = now
+
+        ttl = int(app.permanent_session_lifetime.total_seconds())
+        self.store.setex(self.key_prefix + session.sid, ttl, self.serializer.dumps(dict(session)).encode())
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid).decode(),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
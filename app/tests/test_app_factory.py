@@ -0,0 +1,66 @@
+"""Tests for the application factory and lazy startup."""
+import gc
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import create_app, warm_up
+from app.auth.utils import OAUTH_EXTENSION, google_client
+from app.courses import course_catalog
+from app.dashboard.matching import invalidate_match_index
+from app.database import db
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class AppFactoryTestCase(unittest.TestCase):
+    def test_registers_blueprints(self):
+        app = create_app('testing')
+        self.assertTrue({'auth', 'dashboard'} <= set(app.blueprints))
+        self.assertEqual(app.url_map.bind('').match('/dashboard')[0], 'dashboard.dashboard')
+        response = app.test_client().get('/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_startup_skips_heavy_imports(self):
+        """Test that creating the app imports neither authlib, requests nor smtplib."""
+        code = ("import sys; from app import create_app; create_app('testing'); "
+                "print(','.join(m for m in ('authlib', 'requests', 'smtplib') if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), '')
+
+    def test_oauth_client_is_registered_on_first_use(self):
+        app = create_app('testing')
+        self.assertNotIn(OAUTH_EXTENSION, app.extensions)
+        with app.test_request_context('/login'):
+            client = google_client()
+            self.assertIs(google_client(), client)
+        self.assertEqual(client.name, 'google')
+
+    def test_warm_up_loads_caches_and_closes_connections(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'app.db')}"})
+        with app.app_context():
+            db.create_all()
+            db.session.execute(db.text("INSERT INTO simple_course (course_number, course_name, course_subject) "
+                                       "VALUES ('CS180', 'Programming', 'CS')"))
+            db.session.commit()
+        course_catalog.invalidate()
+        self.addCleanup(course_catalog.invalidate)
+        self.addCleanup(invalidate_match_index)
+        self.addCleanup(gc.unfreeze)
+
+        warm_up(app)
+        self.assertEqual(len(course_catalog), 1)
+        with app.app_context():
+            self.assertEqual(db.engine.pool.checkedout(), 0)
+            self.assertIn(OAUTH_EXTENSION, app.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
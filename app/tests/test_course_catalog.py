@@ -0,0 +1,46 @@
+"""Unit tests for the in-process course catalog."""
+import unittest
+
+from app.course_catalog import CourseCatalog
+
+
+class CourseCatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loads = 0
+        self.rows = [
+            (1, 'CS180', 'Problem Solving And Object-Oriented Programming', 'CS', 4),
+            (2, 'CS240', 'Programming in C', 'CS', 3),
+            (3, 'MA161', 'Plane Analytic Geometry And Calculus I', 'MA', 5),
+        ]
+
+        def loader():
+            self.loads += 1
+            return list(self.rows)
+
+        self.catalog = CourseCatalog(loader)
+
+    def test_lookups_share_one_load(self):
+        """Test that the catalog is loaded once and served from memory."""
+        self.assertEqual(self.catalog.get(2).course_number, 'CS240')
+        self.assertEqual([c.id for c in self.catalog.get_many([3, 99, 1])], [3, 1])
+        self.assertEqual(len(self.catalog), 3)
+        self.assertEqual(self.loads, 1)
+
+    def test_invalidate_reloads(self):
+        """Test that invalidation picks up a reseeded catalog."""
+        self.catalog.get(1)
+        self.rows.append((4, 'PHYS172', 'Modern Mechanics', 'PHYS', 4))
+        self.assertIsNone(self.catalog.get(4))
+        self.catalog.invalidate()
+        self.assertEqual(self.catalog.get(4).course_name, 'Modern Mechanics')
+        self.assertEqual(self.loads, 2)
+
+    def test_ttl_expiry(self):
+        catalog = CourseCatalog(lambda: self.rows, ttl=0)
+        catalog.get(1)
+        self.rows.append((4, 'PHYS172', 'Modern Mechanics', 'PHYS', 4))
+        self.assertIsNotNone(catalog.get(4))
+
+
+if __name__ == '__main__':
+    unittest.main()
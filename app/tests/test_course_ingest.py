@@ -0,0 +1,98 @@
+"""Tests for the streaming course catalog ingest."""
+import io
+import json
+import tracemalloc
+import unittest
+
+from app import create_app
+from app.course_ingest import course_row, ingest_courses, iter_odata_values
+from app.database import db
+from app.database.models import SimpleCourse
+
+app = create_app('testing')
+
+
+def odata(courses, **extra):
+    return json.dumps({'@odata.context': 'https://api.purdue.io/odata/$metadata#Courses', 'value': courses, **extra})
+
+
+def purdue_course(i, subject='CS'):
+    return {
+        'Id': f'id-{i}',
+        'Number': str(10000 + i),
+        'Subject': {'Abbreviation': subject, 'Name': 'Computer Science'},
+        'Title': f'Course {i}',
+        'CreditHours': 3.0,
+        'Description': 'Nested "quotes", [brackets] and {braces}',
+    }
+
+
+class StreamingParserTestCase(unittest.TestCase):
+    def test_matches_json_load_at_any_chunk_size(self):
+        """Test that values split across chunk boundaries decode correctly."""
+        document = odata([purdue_course(i) for i in range(20)] + [12345, None, 'text'], **{'@odata.count': 23})
+        expected = json.loads(document)['value']
+        for chunk_size in (1, 2, 7, 64, 100000):
+            self.assertEqual(list(iter_odata_values(io.StringIO(document), chunk_size=chunk_size)), expected)
+
+    def test_empty_and_missing_value(self):
+        self.assertEqual(list(iter_odata_values(io.StringIO('{"value": []}'))), [])
+        self.assertEqual(list(iter_odata_values(io.StringIO('{"other": [1, 2]}'))), [])
+        self.assertEqual(list(iter_odata_values(io.StringIO('{}'))), [])
+
+    def test_truncated_document_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_odata_values(io.StringIO('{"value": [{"Number": "1'), chunk_size=4))
+
+    def test_memory_stays_flat(self):
+        """Test that peak memory does not grow with the size of the catalog."""
+        def peak_for(count):
+            document = io.StringIO(odata([purdue_course(i) for i in range(count)]))
+            tracemalloc.start()
+            for _ in iter_odata_values(document):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small, large = peak_for(1000), peak_for(20000)
+        self.assertLess(large, small * 2)
+
+    def test_course_row(self):
+        row = course_row(purdue_course(1))
+        self.assertEqual((row['course_subject'], row['course_number'], row['credits']), ('CS', '10001', 3))
+        self.assertIsNone(course_row({'Title': 'No number'}))
+        self.assertIsNone(course_row('not a course'))
+
+
+class IngestTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_ingest_dedupes_on_subject_and_number(self):
+        """Test that duplicates in the file and in the database are skipped."""
+        db.session.add(SimpleCourse(course_number='10000', course_name='Existing', course_subject='CS'))
+        db.session.commit()
+        courses = [purdue_course(i) for i in range(2500)]
+        courses += [purdue_course(5), purdue_course(5, subject='MA'), {'Title': 'No number'}]
+
+        stats = ingest_courses(db, SimpleCourse, io.StringIO(odata(courses)), batch_size=500)
+        db.session.commit()
+
+        self.assertEqual(stats.read, 2503)
+        self.assertEqual(stats.inserted, 2500)
+        self.assertEqual(stats.skipped, 3)
+        self.assertGreater(stats.rows_per_second, 0)
+        self.assertEqual(SimpleCourse.query.count(), 2501)
+        self.assertEqual(SimpleCourse.query.filter_by(course_number='10005').count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the FTS5 course search."""
+import statistics
+import time
+import unittest
+
+from app import create_app
+from app.course_search import match_expression, search_terms
+from app.course_search import search_courses
+from app.courses import course_catalog
+from app.database import db
+from app.database.models import SimpleCourse
+
+app = create_app('testing')
+
+SUBJECTS = ['CS', 'MA', 'PHYS', 'CHM', 'ECE', 'ME', 'BIOL', 'ECON', 'PSY', 'ENGL']
+WORDS = ['Introduction', 'Programming', 'Calculus', 'Mechanics', 'Systems', 'Analysis', 'Theory', 'Design',
+         'Organic', 'Statistics', 'Networks', 'Literature', 'Circuits', 'Thermodynamics', 'Algorithms']
+
+
+class CourseSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        course_catalog.invalidate()
+        db.session.add_all([
+            SimpleCourse(course_number='18000', course_name='Problem Solving And Object-Oriented Programming', course_subject='CS'),
+            SimpleCourse(course_number='25100', course_name='Data Structures And Algorithms', course_subject='CS'),
+            SimpleCourse(course_number='16100', course_name='Plane Analytic Geometry And Calculus I', course_subject='MA'),
+            SimpleCourse(course_number='17200', course_name='Modern Mechanics', course_subject='PHYS',
+                         description='Calculus based introduction to mechanics'),
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def search(self, query, limit=20):
+        return [(subject, number) for _, number, _, subject, _ in search_courses(db, SimpleCourse, query, limit)]
+
+    def test_query_parsing(self):
+        self.assertEqual(search_terms('CS180'), ['cs', '180'])
+        self.assertEqual(search_terms('  "calc" OR * '), ['calc', 'or'])
+        self.assertEqual(match_expression(['cs', '180']), '("cs"* "180"* OR "cs180"*)')
+        self.assertEqual(match_expression(['calc', '2']), '("calc"* "2"* OR "calc2"*)')
+        self.assertEqual(match_expression(['180', 'cs']), '"180"* "cs"*')
+
+    def test_fallback_course_numbers(self):
+        """Test that numbers like 'CS180', indexed as one token, are found however they're typed."""
+        db.session.add(SimpleCourse(course_number='CS240', course_name='Programming in C', course_subject='CS'))
+        db.session.commit()
+        for query in ('CS240', 'cs 240', 'cs24'):
+            self.assertEqual(self.search(query), [('CS', 'CS240')], query)
+        self.assertEqual(self.search('CS180'), [('CS', '18000')])
+
+    def test_prefix_and_ranking(self):
+        self.assertEqual(self.search('CS 180'), [('CS', '18000')])
+        self.assertEqual(self.search('cs18'), [('CS', '18000')])
+        self.assertEqual(self.search('algor'), [('CS', '25100')])
+        # A title match outranks a description-only match
+        self.assertEqual(self.search('calc'), [('MA', '16100'), ('PHYS', '17200')])
+        self.assertEqual(self.search(''), [])
+        self.assertEqual(self.search('"'), [])
+        self.assertEqual(self.search('c'), [])
+
+    def test_index_follows_catalog_changes(self):
+        """Test that inserts, updates and deletes are visible to search."""
+        db.session.execute(db.insert(SimpleCourse), [
+            {'course_number': '35200', 'course_name': 'Compilers', 'course_subject': 'CS'},
+        ])
+        course = SimpleCourse.query.filter_by(course_number='17200').one()
+        course.course_name = 'Quantum Things'
+        db.session.delete(SimpleCourse.query.filter_by(course_number='16100').one())
+        db.session.commit()
+
+        self.assertEqual(self.search('compil'), [('CS', '35200')])
+        self.assertEqual(self.search('quantum'), [('PHYS', '17200')])
+        self.assertEqual(self.search('mechanics'), [('PHYS', '17200')])  # still in the description
+        self.assertEqual(self.search('geometry'), [])
+
+    def test_endpoint(self):
+        client = app.test_client()
+        self.assertFalse(client.get('/api/courses/search?q=cs').get_json()['success'])
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Test'}
+        data = client.get('/api/courses/search?q=data+struct').get_json()
+        self.assertTrue(data['success'])
+        self.assertEqual([c['course_number'] for c in data['courses']], ['25100'])
+
+    def test_course_details_load_the_description(self):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Test'}
+        course = SimpleCourse.query.filter_by(course_number='17200').one()
+        data = client.get(f'/api/courses/{course.id}').get_json()
+        self.assertEqual(data['course']['description'], 'Calculus based introduction to mechanics')
+        self.assertNotIn('description', course_catalog.get(course.id)._fields)
+        self.assertEqual(client.get('/api/courses/999').status_code, 404)
+
+    def test_large_catalog_latency(self):
+        """Test typeahead queries on a 50k-course catalog."""
+        db.session.execute(db.insert(SimpleCourse), [{
+            'course_number': f'{10000 + i % 50000}',
+            'course_name': f'{WORDS[i % len(WORDS)]} {WORDS[(i * 7) % len(WORDS)]} {i}',
+            'course_subject': SUBJECTS[i % len(SUBJECTS)],
+            'description': f'{WORDS[(i * 3) % len(WORDS)]} for students',
+        } for i in range(50000)])
+        db.session.commit()
+
+        timings = []
+        for query in ['cs 1', 'calc', 'programming des', 'ma 16', 'thermo', 'ECE 2', 'intro', 'alg']:
+            started = time.perf_counter()
+            self.assertTrue(search_courses(db, SimpleCourse, query))
+            timings.append(time.perf_counter() - started)
+        self.assertLess(statistics.median(timings), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
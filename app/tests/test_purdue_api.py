@@ -0,0 +1,93 @@
+"""Tests for the cached, paged Purdue.io client."""
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.purdue_api import PurdueAPIClient, ReplayMiss
+
+COURSES = [{'Id': str(i), 'Number': str(10000 + i), 'Title': f'Course {i}'} for i in range(23)]
+
+
+class ODataHandler(BaseHTTPRequestHandler):
+    """Serves COURSES in $skip/$top pages with an ETag per page"""
+    requests_seen = []
+    with_count = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        skip, top = int(query.get('$skip', 0)), int(query.get('$top', len(COURSES)))
+        body = {'value': COURSES[skip:skip + top]}
+        if self.with_count and query.get('$count') == 'true':
+            body['@odata.count'] = len(COURSES)
+        etag = f'"page-{skip}-{top}"'
+        self.requests_seen.append((url.path, skip, self.headers.get('If-None-Match')))
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class PurdueAPIClientTestCase(unittest.TestCase):
+    def setUp(self):
+        ODataHandler.requests_seen = []
+        ODataHandler.with_count = True
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ODataHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/odata'
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def client(self, **kwargs):
+        return PurdueAPIClient(self.base_url, cache_dir=self.cache_dir, page_size=5, **kwargs)
+
+    def test_pages_are_fetched_and_kept_in_order(self):
+        client = self.client()
+        self.assertEqual(client.get_collection('Courses'), COURSES)
+        self.assertEqual(sorted(skip for _, skip, _ in ODataHandler.requests_seen), [0, 5, 10, 15, 20])
+        self.assertEqual(client.stats['downloaded'], 5)
+
+    def test_paging_without_count(self):
+        ODataHandler.with_count = False
+        self.assertEqual(self.client().get_collection('Courses'), COURSES)
+
+    def test_unchanged_pages_are_revalidated(self):
+        """Test that a second sync sends the cached ETags and downloads nothing."""
+        self.client().get_collection('Courses')
+        client = self.client()
+        self.assertEqual(client.get_collection('Courses'), COURSES)
+        self.assertEqual(client.stats['downloaded'], 0)
+        self.assertEqual(client.stats['not_modified'], 5)
+        self.assertTrue(all(etag for _, _, etag in ODataHandler.requests_seen[5:]))
+
+    def test_replay_serves_fixtures_without_network(self):
+        self.client().get_collection('Courses')
+        self.server.shutdown()
+        client = self.client(replay=True)
+        self.assertEqual(client.get_collection('Courses'), COURSES)
+        self.assertEqual(client.stats['requests'], 0)
+        with self.assertRaises(ReplayMiss):
+            client.get('Subjects')
+
+
+if __name__ == '__main__':
+    unittest.main()
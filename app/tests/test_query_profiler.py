@@ -0,0 +1,75 @@
+"""Tests for per-request SQL instrumentation and query budgets."""
+import unittest
+
+from flask import Flask
+from sqlalchemy import create_engine, text
+
+from app.query_profiler import QueryBudgetExceeded, QueryProfiler, query_budget
+
+
+class QueryProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['QUERY_STATS_HEADERS'] = True
+        self.profiler = QueryProfiler(self.app)
+
+        def run_queries(count):
+            with self.engine.connect() as conn:
+                for _ in range(count):
+                    conn.execute(text('SELECT 1'))
+            return 'ok'
+
+        @self.app.route('/three')
+        @query_budget(3)
+        def three():
+            return run_queries(3)
+
+        @self.app.route('/too_many')
+        @query_budget(2)
+        def too_many():
+            return run_queries(5)
+
+        self.client = self.app.test_client()
+
+    def test_headers_and_endpoint_stats(self):
+        """Test that statements are counted per request and per endpoint."""
+        response = self.client.get('/three')
+        self.assertEqual(response.headers['X-DB-Query-Count'], '3')
+        self.assertIn('X-DB-Time-ms', response.headers)
+        self.client.get('/three')
+
+        stats = self.client.get('/metrics').get_json()['endpoints']['three']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['queries'], 6)
+        self.assertEqual(stats['max_queries'], 3)
+        self.assertEqual(stats['slowest'][0]['statement'], 'SELECT 1')
+
+    def test_budget_is_enforced_in_tests(self):
+        """Test that exceeding a declared budget fails the request under test."""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/too_many')
+
+    def test_budget_only_warns_when_not_enforced(self):
+        self.app.config['QUERY_BUDGET_ENFORCE'] = False
+        self.assertEqual(self.client.get('/too_many').status_code, 200)
+
+    def test_queries_outside_requests_are_ignored(self):
+        with self.engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        self.assertEqual(self.profiler.snapshot(), {})
+
+    def test_metrics_token(self):
+        self.app.config['METRICS_TOKEN'] = 'secret'
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', headers={'X-Metrics-Token': 'secret'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_metrics_need_a_token_in_production(self):
+        self.app.config['TESTING'] = False
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Tests for the server-side session stores and interface."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from flask import Flask, session
+
+from app.sessions import (
+    FileSessionStore, SQLiteSessionStore, ServerSideSessionInterface, load_secret_key
+)
+
+
+def make_worker(store, secret_key):
+    """A tiny app standing in for one worker process"""
+    worker = Flask(__name__)
+    worker.secret_key = secret_key
+    worker.session_interface = ServerSideSessionInterface(store)
+
+    @worker.route('/login/<name>')
+    def login(name):
+        session.regenerate()
+        session.permanent = True  # as the real login does
+        session['user'] = {'name': name, 'tags': ('a', 'b')}
+        return 'ok'
+
+    @worker.route('/whoami')
+    def whoami():
+        return session.get('user', {}).get('name', 'anonymous')
+
+    @worker.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return worker
+
+
+class SessionStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def check_store(self, store):
+        self.assertIsNone(store.get('session:missing'))
+        store.setex('session:a', 60, b'{"x": 1}')
+        self.assertEqual(store.get('session:a'), b'{"x": 1}')
+        store.setex('session:a', 60, b'{"x": 2}')
+        self.assertEqual(store.get('session:a'), b'{"x": 2}')
+        store.setex('session:b', -1, b'expired')
+        self.assertIsNone(store.get('session:b'))
+        store.delete('session:a')
+        self.assertIsNone(store.get('session:a'))
+
+    def test_sqlite_store(self):
+        self.check_store(SQLiteSessionStore(os.path.join(self.tmp, 'sessions.db')))
+
+    def test_file_store(self):
+        store = FileSessionStore(os.path.join(self.tmp, 'sessions'))
+        self.check_store(store)
+        store.purge()
+        self.assertEqual(os.listdir(store.directory), [])
+
+    def test_secret_key_is_shared(self):
+        path = os.path.join(self.tmp, 'instance', 'secret_key')
+        key = load_secret_key(path)
+        self.assertEqual(len(key), 64)
+        self.assertEqual(load_secret_key(path), key)
+
+    def test_session_survives_switching_workers(self):
+        """Test that a login on one worker is seen by another sharing the store."""
+        path = os.path.join(self.tmp, 'sessions.db')
+        first = make_worker(SQLiteSessionStore(path), 'shared-secret').test_client()
+        second_app = make_worker(SQLiteSessionStore(path), 'shared-secret')
+        second = second_app.test_client()
+
+        first.get('/login/alex')
+        cookie = first.get_cookie('session')
+        self.assertNotIn('alex', cookie.value)  # the cookie only carries the id
+        second.set_cookie('session', cookie.value)
+        self.assertEqual(second.get('/whoami').text, 'alex')
+
+        # Logging in again moves the data to a new id and drops the old one
+        first.get('/login/sam')
+        self.assertNotEqual(first.get_cookie('session').value, cookie.value)
+        self.assertEqual(second.get('/whoami').text, 'anonymous')
+
+        second.set_cookie('session', first.get_cookie('session').value)
+        second.get('/logout')
+        self.assertEqual(first.get('/whoami').text, 'anonymous')
+
+    def test_unchanged_session_is_rewritten_once_per_interval(self):
+        store = SQLiteSessionStore(os.path.join(self.tmp, 'sessions.db'))
+        writes = []
+        setex = store.setex
+        store.setex = lambda *args: writes.append(args) or setex(*args)
+        worker = make_worker(store, 'secret')
+        worker.config['SESSION_REFRESH_INTERVAL'] = 60
+        client = worker.test_client()
+        client.get('/login/alex')
+        for _ in range(3):
+            self.assertEqual(client.get('/whoami').text, 'alex')
+        self.assertEqual(len(writes), 1)
+        worker.config['SESSION_REFRESH_INTERVAL'] = 0  # as if the interval had passed
+        client.get('/whoami')
+        self.assertEqual(len(writes), 2)
+
+    def test_tampered_cookie_is_ignored(self):
+        client = make_worker(SQLiteSessionStore(os.path.join(self.tmp, 'sessions.db')), 'secret').test_client()
+        client.get('/login/alex')
+        client.set_cookie('session', client.get_cookie('session').value[:-2] + 'xx')
+        self.assertEqual(client.get('/whoami').text, 'anonymous')
+
+
+class CurrentUserCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        from app import create_app
+        from app.database import db
+        from app.database.models import SimpleUser
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.app = app = create_app('testing', {
+            'SESSION_BACKEND': 'sqlite', 'SESSION_STORE_URL': os.path.join(self.tmp, 'sessions.db'),
+            'QUERY_STATS_HEADERS': True,
+        })
+        self.db = db
+        self.ctx = app.app_context()
+        self.ctx.push()
+        db.create_all()
+        db.session.add(SimpleUser(id=1, name='Alex Chen', email='alex@purdue.edu', major='Computer Science',
+                                  preferences='quiet', profile_completed=True))
+        db.session.commit()
+
+    def tearDown(self):
+        self.db.session.remove()
+        self.db.drop_all()
+        self.ctx.pop()
+
+    def test_profile_is_cached_between_requests(self):
+        client = self.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Alex Chen'}
+        first = client.get('/dashboard')
+        second = client.get('/dashboard')
+        self.assertEqual(second.status_code, 200)
+        self.assertIn(b'Alex Chen', second.data)
+        self.assertLess(int(second.headers['X-DB-Query-Count']), int(first.headers['X-DB-Query-Count']))
+        with client.session_transaction() as sess:
+            self.assertEqual(sess['profile']['major'], 'Computer Science')
+
+    def test_edits_from_another_device_show_after_the_ttl(self):
+        from flask import g
+        from app.database.models import SimpleUser
+        client = self.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': 1, 'name': 'Alex Chen'}
+
+        def dashboard():
+            g.pop('current_user', None)  # requests share the test's app context
+            return client.get('/dashboard').data
+
+        dashboard()
+        self.db.session.get(SimpleUser, 1).name = 'Alex Chen-Park'
+        self.db.session.commit()
+        self.assertNotIn(b'Alex Chen-Park', dashboard())
+        with client.session_transaction() as sess:
+            sess['profile_loaded_at'] -= self.app.config['PROFILE_CACHE_TTL'] + 1
+        self.assertIn(b'Alex Chen-Park', dashboard())
+
+
+if __name__ == '__main__':
+    unittest.main()
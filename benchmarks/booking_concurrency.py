@@ -0,0 +1,140 @@
+""" Concurrency benchmark for /book_room
+
+Many threads (optionally in several processes) try to book random slots in
+the same room on the same day. Afterwards we check that no two active
+bookings overlap and report latency percentiles.
+
+    python -m benchmarks.booking_concurrency --threads 16 --requests 50 --processes 2
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+LOCATION = 'Hicks Undergraduate Library'
+ROOM = 'Room 001'
+BOOKING_DATE = '2030-01-15'
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def run_threads(threads, requests_per_thread, seed, results):
+    from main import app
+
+    def hammer(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': worker_id + 1}
+        for _ in range(requests_per_thread):
+            start = rng.randrange(8 * 60, 20 * 60, 15)
+            length = rng.choice([30, 60, 90, 120])
+            payload = {
+                'location_name': LOCATION,
+                'room_number': ROOM,
+                'booking_date': BOOKING_DATE,
+                'start_time': f'{start // 60:02d}:{start % 60:02d}',
+                'end_time': f'{(start + length) // 60:02d}:{(start + length) % 60:02d}',
+                'group_size': 2,
+            }
+            began = time.perf_counter()
+            body = client.post('/book_room', json=payload).get_json()
+            elapsed = time.perf_counter() - began
+            results.append((elapsed, body.get('success', False), body.get('error')))
+
+    workers = [threading.Thread(target=hammer, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def run_process(threads, requests_per_thread, seed, queue):
+    from app.database import db
+    from app.database.sqlite import dispose_engines
+    from main import app
+    dispose_engines(app, db)  # never share pooled connections across fork
+    results = []
+    run_threads(threads, requests_per_thread, seed, results)
+    queue.put(results)
+
+
+def count_overlaps():
+    from app.database import db
+    from main import app
+    with app.app_context():
+        return db.session.execute(db.text(
+            "SELECT COUNT(*) FROM room_booking a JOIN room_booking b "
+            "ON a.id < b.id AND a.location_name = b.location_name AND a.room_number = b.room_number "
+            "AND a.booking_date = b.booking_date AND a.status = 'active' AND b.status = 'active' "
+            "AND a.start_time < b.end_time AND a.end_time > b.start_time"
+        )).scalar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50, help='requests per thread')
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--p99-budget-ms', type=float, default=500.0)
+    args = parser.parse_args(argv)
+
+    db_dir = tempfile.mkdtemp(prefix='campusconnect-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"
+    os.environ['EMAIL_USER'] = ''
+
+    from app.bootstrap import seed_locations
+    from app.database import db
+    from main import app
+    with app.app_context():
+        db.create_all()
+        seed_locations()
+
+    results = []
+    began = time.perf_counter()
+    if args.processes > 1:
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        procs = [ctx.Process(target=run_process, args=(args.threads, args.requests, i, queue))
+                 for i in range(args.processes)]
+        for proc in procs:
+            proc.start()
+        for _ in procs:
+            results.extend(queue.get())
+        for proc in procs:
+            proc.join()
+    else:
+        run_threads(args.threads, args.requests, 0, results)
+    wall = time.perf_counter() - began
+
+    latencies_ms = [elapsed * 1000 for elapsed, _, _ in results]
+    booked = sum(1 for _, ok, _ in results if ok)
+    unexpected = [error for _, ok, error in results if not ok and error != 'Room is already booked for this time slot']
+    overlaps = count_overlaps()
+    p99 = percentile(latencies_ms, 99)
+
+    print(f"requests:   {len(results)} in {wall:.2f}s ({len(results) / wall:.0f} req/s)")
+    print(f"booked:     {booked}, conflicts: {len(results) - booked - len(unexpected)}, errors: {len(unexpected)}")
+    print(f"latency ms: p50={statistics.median(latencies_ms):.1f} p95={percentile(latencies_ms, 95):.1f} "
+          f"p99={p99:.1f} max={max(latencies_ms):.1f}")
+    print(f"overlaps:   {overlaps}")
+    for error in sorted(set(unexpected))[:5]:
+        print(f"  error: {error}")
+
+    shutil.rmtree(db_dir, ignore_errors=True)
+    failed = overlaps > 0 or unexpected or p99 > args.p99_budget_ms
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
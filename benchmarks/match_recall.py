@@ -0,0 +1,90 @@
+""" Recall and latency of MinHash/LSH candidate generation against exact matching
+
+Builds an in-memory population spread over several campuses (one catalog per
+campus from dummy_data.CAMPUS_DATA, Zipf enrollment as in the synthetic
+population generator) and compares the top-k matches found through LSH
+candidates with the exact top-k for a sample of users.
+
+    python -m benchmarks.match_recall --users 50000 --configs 16x2,32x2,32x3
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from app.dashboard.match_engine import MatchIndex
+from app.dashboard.minhash import MinHashLSH
+from app.dummy_data.dummy_data import CAMPUS_DATA
+from app.dummy_data.population import COURSE_LOADS, PREFERENCES, CourseSampler
+
+
+def build_population(users, campuses, courses_per_campus, seed):
+    rng = random.Random(seed)
+    majors = ['Computer Science', 'Mathematics', 'Physics', 'Economics', 'Biology', 'Psychology']
+    samplers = []
+    for campus in range(campuses):
+        offset = campus * courses_per_campus
+        samplers.append(CourseSampler([(offset + i + 1, f'S{i % 12}', f'{i + 100}') for i in range(courses_per_campus)]))
+
+    profiles, enrollments = [], []
+    for user_id in range(1, users + 1):
+        campus = rng.randrange(campuses)
+        profiles.append((user_id, rng.choice(PREFERENCES), rng.choice(majors), f'Library {campus}-{rng.randrange(4)}'))
+        for course_id in samplers[campus].sample(rng, rng.choices(*COURSE_LOADS)[0], [f'S{rng.randrange(12)}']):
+            enrollments.append((user_id, course_id))
+    return profiles, enrollments
+
+
+def timed_top_matches(index, user_ids, k):
+    results, latencies = {}, []
+    for user_id in user_ids:
+        began = time.perf_counter()
+        results[user_id] = [m['user_id'] for m in index.top_matches(user_id, k)]
+        latencies.append((time.perf_counter() - began) * 1000)
+    return results, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--campuses', type=int, default=len(CAMPUS_DATA))
+    parser.add_argument('--courses-per-campus', type=int, default=400)
+    parser.add_argument('--sample', type=int, default=300, help='users whose matches are compared')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--configs', default='16x2,32x2,32x3', help='comma separated BANDSxROWS')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    profiles, enrollments = build_population(args.users, args.campuses, args.courses_per_campus, args.seed)
+    sample = random.Random(args.seed).sample(range(1, args.users + 1), min(args.sample, args.users))
+    print(f"{args.users} users on {args.campuses} campuses, {len(enrollments)} enrollments, k={args.k}")
+
+    began = time.perf_counter()
+    exact_index = MatchIndex(profiles, enrollments)
+    print(f"exact index built in {time.perf_counter() - began:.2f}s")
+    exact, exact_latencies = timed_top_matches(exact_index, sample, args.k)
+    exact_ms = statistics.mean(exact_latencies)
+    print(f"{'exact':<8} recall=1.000 mean={exact_ms:7.2f}ms "
+          f"p95={sorted(exact_latencies)[int(len(exact_latencies) * 0.95)]:7.2f}ms")
+
+    for config in args.configs.split(','):
+        bands, rows = (int(part) for part in config.lower().split('x'))
+        began = time.perf_counter()
+        index = MatchIndex(profiles, enrollments, lsh=MinHashLSH(bands=bands, rows=rows))
+        build_s = time.perf_counter() - began
+        approx, latencies = timed_top_matches(index, sample, args.k)
+        candidates = statistics.mean(len(index.lsh.candidates(u, index.courses_for(u))) for u in sample)
+        found = sum(len(set(approx[u]) & set(exact[u])) for u in sample)
+        wanted = sum(len(exact[u]) for u in sample)
+        recall = found / wanted if wanted else 1.0
+        print(f"{config:<8} recall={recall:.3f} mean={statistics.mean(latencies):7.2f}ms "
+              f"p95={sorted(latencies)[int(len(latencies) * 0.95)]:7.2f}ms "
+              f"speedup={exact_ms / statistics.mean(latencies):5.1f}x candidates={candidates:7.0f} "
+              f"build={build_s:.2f}s buckets={len(index.lsh.buckets)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+""" Write contention on SQLite under each engine profile
+
+Threads (optionally in several forked processes) act as different students
+and mix the writing endpoints (book_room, send_message, log_study_hours)
+with page reads, all against one database file. Every profile of
+app/database/sqlite.py gets a fresh copy of the same seeded database; we
+report throughput, latency percentiles and failed writes such as
+"database is locked".
+
+    python -m benchmarks.sqlite_contention --threads 16 --requests 50 --processes 2
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+READ_PATHS = ['/study_planner', '/my_bookings', '/messages']
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def make_app(db_path, profile):
+    from app import create_app
+    return create_app(None, {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQLITE_PROFILE': profile,
+        'SESSION_BACKEND': 'cookie',
+        'EMAIL_USER': None,
+        'EMAIL_WORKER_AUTOSTART': False,
+    })
+
+
+def seed(db_path, users, workers):
+    """Seed the population once; each worker user gets a study plan to log hours to"""
+    from app.bootstrap import generate_users, seed_locations
+    from app.database import db
+    from app.database.models import SimpleCourse, StudyPlan, StudyRoom
+    from app.database.sqlite import dispose_engines
+
+    app = make_app(db_path, 'off')
+    with app.app_context():
+        db.create_all()
+        seed_locations()
+        db.session.execute(db.insert(SimpleCourse), [
+            {'course_number': f'{10000 + i}', 'course_name': f'Course {i}', 'course_subject': 'CS'} for i in range(50)
+        ])
+        db.session.commit()
+        generate_users(users, seed=1)
+        plans = [StudyPlan(user_id=user_id, course_id=1, exam_name='Final', exam_date=date(2030, 5, 1))
+                 for user_id in range(1, workers + 1)]
+        db.session.add_all(plans)
+        db.session.commit()
+        plan_ids = {plan.user_id: plan.id for plan in plans}
+        rooms = db.session.query(StudyRoom.location_name, StudyRoom.room_number).all()
+    dispose_engines(app, db)
+    return plan_ids, rooms
+
+
+def run_threads(app, threads, requests_per_thread, read_ratio, users, plan_ids, rooms, first_user, seed, results):
+    def hammer(worker_id):
+        user_id = first_user + worker_id
+        rng = random.Random(seed * 1000 + worker_id)
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': user_id, 'name': f'User {user_id}'}
+        for _ in range(requests_per_thread):
+            if rng.random() < read_ratio:
+                kind, call = 'read', lambda: client.get(rng.choice(READ_PATHS))
+            else:
+                kind = rng.choice(['book_room', 'send_message', 'log_study_hours'])
+                if kind == 'book_room':
+                    start = rng.randrange(8 * 60, 20 * 60, 30)
+                    location_name, room_number = rng.choice(rooms)
+                    payload = {
+                        'location_name': location_name,
+                        'room_number': room_number,
+                        'booking_date': f'2030-02-{rng.randrange(1, 28):02d}',
+                        'start_time': f'{start // 60:02d}:{start % 60:02d}',
+                        'end_time': f'{start // 60 + 1:02d}:{start % 60:02d}',
+                        'group_size': 2,
+                    }
+                elif kind == 'send_message':
+                    payload = {'recipient_id': rng.randrange(1, users + 1), 'content': 'Study together?'}
+                else:
+                    payload = {'plan_id': plan_ids[user_id], 'hours': 1}
+                call = lambda: client.post(f'/{kind}', json=payload)
+            began = time.perf_counter()
+            response = call()
+            elapsed = time.perf_counter() - began
+            error = None
+            if response.status_code != 200:
+                error = f'HTTP {response.status_code}'
+            elif kind != 'read':
+                body = response.get_json()
+                if not body.get('success') and body.get('error') != 'Room is already booked for this time slot':
+                    error = body.get('error')
+            results.append((kind, elapsed, error))
+
+    workers = [threading.Thread(target=hammer, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def run_process(app, args, plan_ids, rooms, index, queue):
+    results = []
+    run_threads(app, args.threads, args.requests, args.read_ratio, args.users, plan_ids, rooms,
+                1 + index * args.threads, index, results)
+    queue.put(results)
+
+
+def run_profile(db_path, profile, args, plan_ids, rooms):
+    from app.database import db
+    from app.database.sqlite import dispose_engines
+
+    app = make_app(db_path, profile)
+    results = []
+    began = time.perf_counter()
+    if args.processes > 1:
+        dispose_engines(app, db)  # never share pooled connections across fork
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        procs = [ctx.Process(target=run_process, args=(app, args, plan_ids, rooms, i, queue))
+                 for i in range(args.processes)]
+        for proc in procs:
+            proc.start()
+        for _ in procs:
+            results.extend(queue.get())
+        for proc in procs:
+            proc.join()
+    else:
+        run_threads(app, args.threads, args.requests, args.read_ratio, args.users, plan_ids, rooms, 1, 0, results)
+    wall = time.perf_counter() - began
+    dispose_engines(app, db)
+
+    writes = [(elapsed, error) for kind, elapsed, error in results if kind != 'read']
+    reads = [elapsed for kind, elapsed, _ in results if kind == 'read']
+    write_ms = [elapsed * 1000 for elapsed, _ in writes]
+    errors = [error for _, error in writes if error]
+    return {
+        'requests': len(results),
+        'wall_s': round(wall, 2),
+        'requests_per_s': round(len(results) / wall, 1),
+        'writes_per_s': round((len(writes) - len(errors)) / wall, 1),
+        'write_errors': len(errors),
+        'error_kinds': sorted(set(errors))[:5],
+        'write_p50_ms': round(statistics.median(write_ms), 1) if write_ms else 0,
+        'write_p99_ms': round(percentile(write_ms, 99), 1) if write_ms else 0,
+        'read_p50_ms': round(statistics.median(reads) * 1000, 1) if reads else 0,
+    }
+
+
+def main(argv=None):
+    from app.database.sqlite import SQLITE_PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16, help='threads per process')
+    parser.add_argument('--requests', type=int, default=50, help='requests per thread')
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--read-ratio', type=float, default=0.5, help='share of requests that are page reads')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--profiles', default=','.join(SQLITE_PROFILES))
+    args = parser.parse_args(argv)
+    workers = args.threads * args.processes
+    if workers > args.users:
+        parser.error('--users must be at least threads x processes')
+
+    db_dir = tempfile.mkdtemp(prefix='campusconnect-bench-')
+    os.environ['EMAIL_USER'] = ''
+    try:
+        seeded = os.path.join(db_dir, 'seed.db')
+        plan_ids, rooms = seed(seeded, args.users, workers)
+        print(f"{args.processes} process(es) x {args.threads} threads x {args.requests} requests, "
+              f"{args.read_ratio:.0%} reads, {args.users} users")
+        results = {}
+        for profile in args.profiles.split(','):
+            db_path = os.path.join(db_dir, f'{profile}.db')
+            shutil.copyfile(seeded, db_path)
+            stats = results[profile] = run_profile(db_path, profile, args, plan_ids, rooms)
+            print(f"{profile:<6} {stats['requests_per_s']:>7.1f} req/s  {stats['writes_per_s']:>7.1f} writes/s  "
+                  f"write p50={stats['write_p50_ms']:.1f}ms p99={stats['write_p99_ms']:.1f}ms  "
+                  f"read p50={stats['read_p50_ms']:.1f}ms  failed writes={stats['write_errors']}")
+            for error in stats['error_kinds']:
+                print(f"       error: {error}")
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+    return 1 if any(stats['write_errors'] for profile, stats in results.items() if profile != 'off') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+""" Worker cold-start and import time of the app
+
+Every measurement runs in a fresh interpreter, as a newly spawned worker
+would. A cold worker imports the app, runs create_app and serves its first
+request; a preloaded worker is forked from a master that already ran
+create_app and warm_up (gunicorn --preload) and only serves its first
+request. The database is seeded once with a synthetic population.
+
+    python -m benchmarks.startup --runs 5 --users 5000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ['authlib', 'requests', 'smtplib', 'app.dummy_data.population']
+
+
+def login(app, user_id=1):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user'] = {'id': user_id, 'name': f'User {user_id}'}
+    return client
+
+
+def timed_get(client, path):
+    began = time.perf_counter()
+    response = client.get(path)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return (time.perf_counter() - began) * 1000
+
+
+def child_cold(path):
+    """Import, create the app and serve two requests; prints timings as JSON"""
+    began = time.perf_counter()
+    from app import create_app
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    modules = len(sys.modules)
+    client = login(app)
+    first = timed_get(client, path)
+    second = timed_get(client, path)
+    print(json.dumps({
+        'import_ms': (imported - began) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'first_request_ms': first,
+        'second_request_ms': second,
+        'modules': modules,
+        'heavy_modules': loaded,
+    }))
+
+
+def child_preload(path, workers):
+    """create_app and warm_up once, then fork workers that each serve one request"""
+    began = time.perf_counter()
+    from app import create_app, warm_up
+    app = create_app()
+    warm_up(app)
+    preloaded = (time.perf_counter() - began) * 1000
+
+    timings = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        forked = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            first = timed_get(login(app), path)
+            os.write(write_fd, json.dumps({
+                'fork_ms': (time.perf_counter() - forked) * 1000 - first,
+                'first_request_ms': first,
+            }).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            timings.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+    print(json.dumps({'preload_ms': preloaded, 'workers': timings}))
+
+
+def run_child(*args):
+    began = time.perf_counter()
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child', *args],
+                            check=True, capture_output=True, text=True).stdout
+    wall_ms = (time.perf_counter() - began) * 1000
+    return json.loads(output.strip().splitlines()[-1]), wall_ms
+
+
+def interpreter_ms():
+    began = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return (time.perf_counter() - began) * 1000
+
+
+def seed(users):
+    from app import create_app
+    from app.bootstrap import generate_users, init_db
+    from app.dashboard.matching import rebuild_all_matches
+
+    app = create_app()
+    with app.app_context():
+        init_db()
+        if users:
+            generate_users(users, seed=1)
+            rebuild_all_matches()
+
+
+def median(values):
+    return round(statistics.median(values), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='cold workers to start')
+    parser.add_argument('--workers', type=int, default=4, help='workers forked from the preloaded master')
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--path', default='/dashboard', help='first request of every worker')
+    parser.add_argument('--output', help='also write results to this JSON file')
+    parser.add_argument('--child', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        mode, path = args.child[0], args.child[1]
+        if mode == 'cold':
+            child_cold(path)
+        else:
+            child_preload(path, int(args.child[2]))
+        return 0
+
+    db_dir = tempfile.mkdtemp(prefix='campusconnect-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"
+    os.environ['EMAIL_USER'] = ''
+    os.environ['EMAIL_WORKER_AUTOSTART'] = 'false'
+    os.environ['SESSION_BACKEND'] = 'cookie'
+    try:
+        seed(args.users)
+        python_ms = [interpreter_ms() for _ in range(args.runs)]
+        cold = [run_child('cold', args.path) for _ in range(args.runs)]
+        preload, preload_wall = run_child('preload', args.path, str(args.workers))
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    stats = [timings for timings, _ in cold]
+    results = {
+        'users': args.users,
+        'path': args.path,
+        'interpreter_ms': median(python_ms),
+        'cold': {
+            'import_ms': median([s['import_ms'] for s in stats]),
+            'create_app_ms': median([s['create_app_ms'] for s in stats]),
+            'first_request_ms': median([s['first_request_ms'] for s in stats]),
+            'second_request_ms': median([s['second_request_ms'] for s in stats]),
+            'ready_ms': median([s['import_ms'] + s['create_app_ms'] + s['first_request_ms'] for s in stats]),
+            'process_wall_ms': median([wall for _, wall in cold]),
+            'modules': stats[0]['modules'],
+            'heavy_modules': stats[0]['heavy_modules'],
+        },
+        'preload': {
+            'master_ms': round(preload['preload_ms'], 1),
+            'fork_ms': median([w['fork_ms'] for w in preload['workers']]),
+            'first_request_ms': median([w['first_request_ms'] for w in preload['workers']]),
+            'ready_ms': median([w['fork_ms'] + w['first_request_ms'] for w in preload['workers']]),
+        },
+    }
+
+    cold_results, preload_results = results['cold'], results['preload']
+    print(f"{args.users} users, first request GET {args.path}, median of {args.runs} runs")
+    print(f"interpreter startup     {results['interpreter_ms']:8.1f}ms")
+    print(f"cold worker  import     {cold_results['import_ms']:8.1f}ms "
+          f"({cold_results['modules']} modules, heavy: {', '.join(cold_results['heavy_modules']) or 'none'})")
+    print(f"             create_app {cold_results['create_app_ms']:8.1f}ms")
+    print(f"             1st request{cold_results['first_request_ms']:8.1f}ms")
+    print(f"             2nd request{cold_results['second_request_ms']:8.1f}ms")
+    print(f"             ready      {cold_results['ready_ms']:8.1f}ms (process wall {cold_results['process_wall_ms']:.1f}ms)")
+    print(f"preloaded    master     {preload_results['master_ms']:8.1f}ms once")
+    print(f"             fork       {preload_results['fork_ms']:8.1f}ms")
+    print(f"             1st request{preload_results['first_request_ms']:8.1f}ms")
+    print(f"             ready      {preload_results['ready_ms']:8.1f}ms per worker")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+""" Benchmark suite for the hot paths of the app
+
+Seeds a synthetic population of each requested size (see
+app/dummy_data/population.py) and times matching, room booking, messaging,
+room availability, free-room search, the dashboard, exam-prep scheduling
+and profile setup through the Flask test client. For every scenario it
+records latency percentiles, SQL statements per call and peak Python memory.
+
+Every request is checked for its expected status and payload; a scenario
+with failed calls is reported and makes the run exit with status 1, since
+its timings are not those of the real work.
+
+Results can be saved as a JSON baseline (benchmarks/baselines/suite.json by
+default) and later runs compared against it; the exit status is 1 when any
+scenario regressed. No baseline is committed: timings depend on the machine,
+so record one first on the machine you compare on.
+
+    python -m benchmarks.suite --sizes small,medium --save-baseline
+    python -m benchmarks.suite --sizes small,medium
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+SIZES = {'small': 1000, 'medium': 10000, 'large': 50000}
+USERS_PER_COURSE = 20  # catalog grows with the population
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baselines' / 'suite.json'
+LATENCY_TOLERANCE = 0.25  # allowed p95 slowdown before flagging
+LATENCY_SLACK_MS = 1.0    # ignore tiny absolute changes on very fast scenarios
+MEMORY_TOLERANCE = 0.5
+BOOKING_CONFLICTS = {'Room is already booked for this time slot', 'Room is already booked on every date'}
+
+
+class ScenarioFailed(Exception):
+    """A benchmarked request did not get its expected response"""
+
+
+def expect(response, status=200, allowed_errors=()):
+    """Raise ScenarioFailed unless response has status and no unexpected error payload"""
+    request = f"{response.request.method} {response.request.path}"
+    if response.status_code != status:
+        raise ScenarioFailed(f"{request} returned {response.status_code}, expected {status}")
+    body = response.get_json(silent=True)
+    if isinstance(body, dict) and body.get('success') is False and body.get('error') not in allowed_errors:
+        raise ScenarioFailed(f"{request} failed: {body.get('error')}")
+    return response
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+class QueryCounter:
+    """Counts SQL statements run by the benchmark process"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def seed(size, rng_seed):
+    from app.bootstrap import generate_users, seed_locations
+    from app.courses import course_catalog
+    from app.dashboard.matching import invalidate_match_index, rebuild_all_matches
+    from app.database import db
+    from app.database.models import SimpleCourse
+    from app.dummy_data.population import MAJOR_SUBJECTS
+    from app.rooms.routes import invalidate_room_availability
+    from main import app
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed_locations()
+        subjects = sorted({subject for values in MAJOR_SUBJECTS.values() for subject in values})
+        course_count = max(size // USERS_PER_COURSE, len(subjects))
+        db.session.execute(db.insert(SimpleCourse), [{
+            'course_number': f'{(i // len(subjects)) % 5 + 1}{i:04d}',
+            'course_name': f'Course {i}',
+            'course_subject': subjects[i % len(subjects)],
+            'credits': 3,
+        } for i in range(course_count)])
+        db.session.commit()
+
+        started = time.perf_counter()
+        generate_users(size, seed=rng_seed)
+        generated = time.perf_counter() - started
+        started = time.perf_counter()
+        rebuild_all_matches()
+        rebuilt = time.perf_counter() - started
+
+        course_catalog.invalidate()
+        invalidate_match_index()
+        invalidate_room_availability()
+        return {'generate_s': round(generated, 2), 'rebuild_matches_s': round(rebuilt, 2),
+                'courses': course_count}
+
+
+def scenarios(size, rng):
+    """(name, setup(), call(state)) for each benchmarked operation"""
+    from app.dashboard.matching import find_study_matches
+    from app.database import db
+    from app.database.models import SimpleCourse, StudyRoom
+    from app.planner.hours import plans_with_progress
+    from app.planner.scheduler import schedule_for_user
+    from main import app
+
+    with app.app_context():
+        course_ids = [course_id for (course_id,) in db.session.query(SimpleCourse.id)]
+        library_name = StudyRoom.query.order_by(StudyRoom.id).first().location_name
+        rooms = [room for (room,) in db.session.query(StudyRoom.room_number).filter_by(location_name=library_name)]
+
+    def client_for(user_id):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = {'id': user_id, 'name': f'User {user_id}'}
+        return client
+
+    def random_user():
+        return rng.randint(1, size)
+
+    def matches():
+        with app.app_context():
+            find_study_matches(random_user())
+
+    def book_room():
+        start = rng.randrange(8 * 60, 20 * 60, 30)
+        length = rng.choice([30, 60, 90])
+        day = 1 + rng.randrange(28)
+        response = client_for(random_user()).post('/book_room', json={
+            'location_name': library_name,
+            'room_number': rng.choice(rooms),
+            'booking_date': f'2031-02-{day:02d}',
+            'start_time': f'{start // 60:02d}:{start % 60:02d}',
+            'end_time': f'{(start + length) // 60:02d}:{(start + length) % 60:02d}',
+            'group_size': 2,
+        })
+        expect(response, allowed_errors=BOOKING_CONFLICTS)  # random slots are sometimes taken
+
+    def book_room_weekly():
+        start = rng.randrange(8 * 60, 20 * 60, 30)
+        response = client_for(random_user()).post('/book_room/recurring', json={
+            'location_name': library_name,
+            'room_number': rng.choice(rooms),
+            'booking_date': f'2031-03-{1 + rng.randrange(28):02d}',
+            'repeat': 'weekly',
+            'count': 8,
+            'start_time': f'{start // 60:02d}:{start % 60:02d}',
+            'end_time': f'{start // 60 + 1:02d}:{start % 60:02d}',
+            'group_size': 2,
+        })
+        expect(response, allowed_errors=BOOKING_CONFLICTS)
+
+    def study_schedule():
+        # As of the population's default day, so its exams are still ahead
+        with app.app_context():
+            user_id = random_user()
+            schedule_for_user(user_id, plans_with_progress(user_id), today=date(2025, 1, 15))
+
+    def get(path):
+        return lambda: expect(client_for(random_user()).get(path))
+
+    def setup_profile():
+        response = client_for(random_user()).post('/setup_profile', data={
+            'major': 'Computer Science',
+            'year': 'Junior',
+            'preferences': rng.choice(['quiet', 'collaborative', 'discussion']),
+            'preferred_location': library_name,
+            'gpa': '3.5',
+            'bio': 'Benchmark user',
+            'courses': [str(course_id) for course_id in rng.sample(course_ids, 4)],
+        })
+        expect(response, status=302)
+        if not response.location.endswith('/dashboard'):
+            raise ScenarioFailed(f"POST /setup_profile redirected to {response.location}")
+
+    return [
+        ('find_study_matches', matches),
+        ('book_room', book_room),
+        ('book_room_weekly', book_room_weekly),
+        ('messages', get('/messages')),
+        ('find_study_rooms', get('/find_study_rooms')),
+        ('free_rooms', get('/api/rooms/free?date=2025-01-16&start=14:00&end=16:00&group_size=6')),
+        ('dashboard', get('/dashboard')),
+        ('dashboard_api', get('/api/dashboard')),
+        ('study_schedule', study_schedule),
+        ('setup_profile', setup_profile),
+    ]
+
+
+def measure(scenario, iterations, counter):
+    failures = []
+
+    def call():
+        try:
+            scenario()
+        except ScenarioFailed as e:
+            failures.append(str(e))
+
+    call()  # warm caches and lazy imports
+    latencies = []
+    queries_before = counter.count
+    for _ in range(iterations):
+        began = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - began) * 1000)
+    queries = (counter.count - queries_before) / iterations
+
+    # Memory is measured in a separate short pass; tracemalloc slows every call
+    tracemalloc.start()
+    for _ in range(min(iterations, 5)):
+        call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies), 3),
+        'queries': round(queries, 2),
+        'peak_kb': round(peak / 1024, 1),
+        'failures': len(failures),
+    }, failures[:1]
+
+
+def compare(results, baseline):
+    """Human readable regressions of results against baseline"""
+    regressions = []
+    for size, size_results in results.items():
+        for name, current in size_results['scenarios'].items():
+            previous = baseline.get(size, {}).get('scenarios', {}).get(name)
+            if previous is None:
+                continue
+            allowed_ms = previous['p95_ms'] * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS
+            if current['p95_ms'] > allowed_ms:
+                regressions.append(f"{size}/{name}: p95 {current['p95_ms']:.1f}ms, baseline {previous['p95_ms']:.1f}ms")
+            if current['queries'] > previous['queries']:
+                regressions.append(f"{size}/{name}: {current['queries']} queries, baseline {previous['queries']}")
+            if current['peak_kb'] > previous['peak_kb'] * (1 + MEMORY_TOLERANCE) + 64:
+                regressions.append(f"{size}/{name}: peak {current['peak_kb']:.0f}KB, baseline {previous['peak_kb']:.0f}KB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='small', help=f"comma separated, from {', '.join(SIZES)}")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='write results to --baseline')
+    parser.add_argument('--output', type=Path, help='also write results to this JSON file')
+    args = parser.parse_args(argv)
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    db_dir = tempfile.mkdtemp(prefix='campusconnect-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(db_dir, 'bench.db')}"
+    os.environ['EMAIL_USER'] = ''
+    os.environ['EMAIL_WORKER_AUTOSTART'] = 'false'
+
+    from sqlalchemy import event
+    from app.database import db
+    from app.database.sqlite import READER_EXTENSION
+    from main import app
+
+    counter = QueryCounter()
+    with app.app_context():
+        event.listen(db.engine, 'after_cursor_execute', counter)
+    if READER_EXTENSION in app.extensions:
+        event.listen(app.extensions[READER_EXTENSION], 'after_cursor_execute', counter)
+
+    results = {}
+    failed = []
+    try:
+        for size in sizes:
+            users = SIZES[size]
+            print(f"== {size}: {users} users")
+            seeded = seed(users, args.seed)
+            print(f"   seeded in {seeded['generate_s']}s, matches rebuilt in {seeded['rebuild_matches_s']}s")
+            rng = random.Random(args.seed)
+            size_results = {'users': users, 'seed': seeded, 'scenarios': {}}
+            for name, call in scenarios(users, rng):
+                stats, first_failure = measure(call, args.iterations, counter)
+                size_results['scenarios'][name] = stats
+                print(f"   {name:<20} p50={stats['p50_ms']:>8.2f}ms p95={stats['p95_ms']:>8.2f}ms "
+                      f"p99={stats['p99_ms']:>8.2f}ms queries={stats['queries']:>6} peak={stats['peak_kb']:>8.0f}KB")
+                if first_failure:
+                    failed.append(f"{size}/{name}: {stats['failures']} failed calls, first: {first_failure[0]}")
+            results[size] = size_results
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    for failure in failed:
+        print(f"FAILED {failure}")
+    if failed:
+        print("Timings of failed calls are not comparable; no baseline comparison or update")
+        return 1
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text()))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
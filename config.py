@@ -1,30 +1,66 @@
 import os
 from datetime import timedelta
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables
-load_dotenv()
+load_dotenv(Path(__file__).resolve().parent / '.env')
 
 class Config:
     # Flask settings
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    
+    # Every worker must sign cookies with the same key: when SECRET_KEY is not
+    # set, create_app reads it from a key file created once in the instance folder
+    SECRET_KEY = os.environ.get('SECRET_KEY')
+
     # Database settings
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///campus_connect.db'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///purdue_campus_connect.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
+    # Pragmas and reader/writer pools for SQLite, see app/database/sqlite.py
+    SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'tuned')  # tuned or off
+    SQLITE_WRITER_POOL_SIZE = int(os.environ.get('SQLITE_WRITER_POOL_SIZE', 1))
+    SQLITE_READER_POOL_SIZE = int(os.environ.get('SQLITE_READER_POOL_SIZE', 8))
+
     # Google OAuth settings - loaded from environment
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
-    
+
     # Session settings
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
-    
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'sqlite')  # sqlite, filesystem, redis or cookie
+    SESSION_STORE_URL = os.environ.get('SESSION_STORE_URL')  # file path, directory or redis:// URL
+    SESSION_REFRESH_INTERVAL = int(os.environ.get('SESSION_REFRESH_INTERVAL', 600))  # seconds between expiry extensions of an unchanged session
+    PROFILE_CACHE_TTL = int(os.environ.get('PROFILE_CACHE_TTL', 60))  # seconds a session keeps the user's profile
+
     # Security settings
     SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
 
+    # Email notifications
+    EMAIL_USER = os.environ.get('EMAIL_USER')
+    EMAIL_PASSWORD = os.environ.get('EMAIL_PASSWORD')
+    EMAIL_SMTP_HOST = os.environ.get('EMAIL_SMTP_HOST', 'smtp.gmail.com')
+    EMAIL_SMTP_PORT = int(os.environ.get('EMAIL_SMTP_PORT', 587))
+    EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'true').lower() == 'true'
+    EMAIL_WORKER_THREADS = int(os.environ.get('EMAIL_WORKER_THREADS', 2))
+    EMAIL_WORKER_AUTOSTART = os.environ.get('EMAIL_WORKER_AUTOSTART', 'true').lower() == 'true'
+
+    # Purdue.io course catalog; the cache defaults to instance/purdue_api_cache
+    PURDUE_API_CACHE_DIR = os.environ.get('PURDUE_API_CACHE_DIR')
+    PURDUE_API_REPLAY = os.environ.get('PURDUE_API_REPLAY', 'false').lower() == 'true'
+
+    # Study partner matching
+    MATCH_LSH_MIN_USERS = int(os.environ.get('MATCH_LSH_MIN_USERS', 100000))
+    MATCH_LSH_BANDS = int(os.environ.get('MATCH_LSH_BANDS', 32))
+    MATCH_LSH_ROWS = int(os.environ.get('MATCH_LSH_ROWS', 2))
+
+    # /metrics needs this token in X-Metrics-Token; without one it is only
+    # served in debug and testing
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Threads per worker loading the sections of /api/dashboard at the same time
+    DASHBOARD_WORKERS = int(os.environ.get('DASHBOARD_WORKERS', 4))
+
 class DevelopmentConfig(Config):
     DEBUG = True
     DEVELOPMENT = True
@@ -34,9 +70,18 @@ class ProductionConfig(Config):
     DEVELOPMENT = False
     SESSION_COOKIE_SECURE = True
 
+class TestingConfig(Config):
+    TESTING = True
+    SECRET_KEY = 'testing'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SESSION_BACKEND = 'cookie'
+    EMAIL_USER = None
+    EMAIL_WORKER_AUTOSTART = False
+
 # Configuration dictionary
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
-    'default': DevelopmentConfig
+    'testing': TestingConfig,
+    'default': Config  # the settings main.py has always run with
 }
@@ -0,0 +1,15 @@
+""" WSGI entry point for pre-fork servers
+
+    gunicorn --preload -w 4 wsgi:app
+
+With --preload the master imports this module once, warm_up loads what
+workers would otherwise build on their first requests, and every forked
+worker starts with it already in memory.
+
+Like main.py it runs with the base settings unless FLASK_CONFIG says
+otherwise; set FLASK_CONFIG=production behind HTTPS for secure cookies.
+"""
+from app import create_app, warm_up
+
+app = create_app()
+warm_up(app)